@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк локального парсера чеков.
+
+Прогоняет LocalReceiptParser.parse по образцам всех известных форматов
+чеков и печатает стоимость разбора одного чека. Разрешение оператора по
+словарю можно отключить флагом --no-dictionary, чтобы измерять только
+извлечение полей.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.services.ai_parser import LocalReceiptParser
+
+SAMPLE_RECEIPTS = {
+    'humo': (
+        "💸 Оплата\n➖ 6.000.000,00 UZS\n📍 NBU P2P HUMO UZCARD>\n"
+        "💳 HUMOCARD *6714\n🕓 18:46 04.04.2025\n💰 935.000,40 UZS"
+    ),
+    'bank_text': (
+        'Pokupka: OOO "AGAT SYSTEM", tashkent, g tashkent Ul Gavhar 151 02.04.25 08:37 '
+        'karta ***0907. summa:44000.00 UZS, balans:2607792.14 UZS'
+    ),
+    'cardxabar': (
+        '🔴 Pokupka\n➖ 44 000.00 UZS\n💳 ***0907\n'
+        '📍 OOO "AGAT SYSTEM", tashkent, g tashkent  Ul  Gavhar 151 \n'
+        '🕓 02.04.25 08:37\n💵 2 607 792.14 UZS'
+    ),
+    'nbu_conversion': "💸 Конверсия\n➖ 37.00 USD\n💳 479091**6905\n🕓 14.04.25 10:29\n💵 0.00 USD",
+    'labelled': (
+        "UPAY P2P, UZ\nОплата\nДата: 04.04.2025 18:46\nСумма: 120 000 UZS\n"
+        "Карта: *6714\nБаланс: 45 000 UZS"
+    ),
+}
+
+
+class _FieldsOnlyParser(LocalReceiptParser):
+    def _resolve_operator_with_dictionary(self, operator_value, lines):
+        return {}
+
+
+def _measure(parser: LocalReceiptParser, text: str, iterations: int, repeats: int) -> float:
+    """Лучшее из ``repeats`` средних времён разбора, в микросекундах."""
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            parser.parse(text)
+        timings.append((time.perf_counter() - started) / iterations)
+    return min(timings) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure LocalReceiptParser per-receipt cost')
+    parser.add_argument('--iterations', type=int, default=2000, help='Parses per timing sample')
+    parser.add_argument('--repeats', type=int, default=5, help='Timing samples per receipt format')
+    parser.add_argument(
+        '--no-dictionary',
+        action='store_true',
+        help='Skip operator dictionary resolution and time field extraction only',
+    )
+    args = parser.parse_args()
+
+    local_parser = _FieldsOnlyParser() if args.no_dictionary else LocalReceiptParser()
+    if not args.no_dictionary:
+        # Словарь загружается лениво; не включаем загрузку в замер.
+        local_parser.parse(SAMPLE_RECEIPTS['labelled'])
+
+    results = {
+        name: _measure(local_parser, text, args.iterations, args.repeats)
+        for name, text in SAMPLE_RECEIPTS.items()
+    }
+
+    width = max(len(name) for name in results)
+    for name, micros in results.items():
+        print(f"{name:<{width}}  {micros:8.1f} µs/чек  {1_000_000 / micros:10.0f} чеков/с")
+    print(f"✅ Среднее: {statistics.mean(results.values()):.1f} µs на чек")
+
+
+if __name__ == "__main__":
+    main()
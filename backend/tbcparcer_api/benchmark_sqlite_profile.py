@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк смешанной нагрузки чтения и записи на SQLite.
+
+Для каждого профиля (по умолчанию off и tuned) создаёт свежую базу во
+временном каталоге, запускает потоки-писатели, сохраняющие транзакции по
+одной, и потоки-читатели, листающие первую страницу транзакций, как это
+делают бот и веб-интерфейс. Печатает число операций в секунду и количество
+ошибок "database is locked" для каждого профиля.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.exc import OperationalError
+
+from src.app_factory import create_app
+from src.models.sqlite_profile import SQLITE_PROFILES
+from src.models.transaction import Transaction
+from src.models.user import User, db
+
+TELEGRAM_ID = 880088
+
+
+def _writer(app, user_id, stop, counters, lock, offset):
+    index = 0
+    with app.app_context():
+        while not stop.is_set():
+            index += 1
+            db.session.add(
+                Transaction(
+                    user_id=user_id,
+                    date_time=datetime(2025, 1, 1) + timedelta(seconds=index),
+                    operation_type='payment',
+                    amount=1000 + index,
+                    currency='UZS',
+                    raw_text=f'Оплата {offset}-{index}',
+                )
+            )
+            try:
+                db.session.commit()
+                key = 'writes'
+            except OperationalError:
+                db.session.rollback()
+                key = 'locked'
+            with lock:
+                counters[key] += 1
+
+
+def _reader(app, user_id, stop, counters, lock):
+    with app.app_context():
+        while not stop.is_set():
+            try:
+                rows = (
+                    Transaction.query_with_operator()
+                    .filter_by(user_id=user_id, is_deleted=False)
+                    .order_by(Transaction.date_time.desc(), Transaction.id.desc())
+                    .limit(50)
+                    .all()
+                )
+                [row.to_dict() for row in rows]
+                db.session.commit()
+                key = 'reads'
+            except OperationalError:
+                db.session.rollback()
+                key = 'locked'
+            with lock:
+                counters[key] += 1
+
+
+def _run(profile, writers, readers, duration, workdir):
+    database_path = os.path.join(workdir, f'{profile}.db')
+    app = create_app(
+        {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database_path}',
+            'SQLITE_PROFILE': profile,
+            'PARSE_JOB_WORKERS': 0,
+            'DICTIONARY_WATCH_INTERVAL': 0,
+        }
+    )
+    with app.app_context():
+        user_id = User.get_or_create_user(TELEGRAM_ID, 'bench').id
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    counters = {'reads': 0, 'writes': 0, 'locked': 0}
+    threads = [
+        threading.Thread(target=_writer, args=(app, user_id, stop, counters, lock, number))
+        for number in range(writers)
+    ] + [threading.Thread(target=_reader, args=(app, user_id, stop, counters, lock)) for _ in range(readers)]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        db.engine.dispose()
+    return {key: value / elapsed for key, value in counters.items()}, counters['locked']
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare SQLite profiles under mixed read/write load')
+    parser.add_argument('--profiles', default='off,tuned', help=f'Comma-separated profiles from {sorted(SQLITE_PROFILES)}')
+    parser.add_argument('--writers', type=int, default=2, help='Writer threads')
+    parser.add_argument('--readers', type=int, default=4, help='Reader threads')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for profile in args.profiles.split(','):
+            rates, locked = _run(profile, args.writers, args.readers, args.duration, workdir)
+            print(
+                f"{profile:<6} запись {rates['writes']:8.0f}/с  чтение {rates['reads']:8.0f}/с  "
+                f"всего {rates['writes'] + rates['reads']:8.0f}/с  блокировок {locked}"
+            )
+    print("✅ Готово")
+
+
+if __name__ == "__main__":
+    main()
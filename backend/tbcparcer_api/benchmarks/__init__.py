@@ -0,0 +1 @@
+"""Synthetic receipt corpus and parser/dictionary benchmark suite."""
@@ -0,0 +1,148 @@
+"""Synthetic receipts and operator dictionaries for benchmarks.
+
+Receipts follow every layout from ``docs/requirements_analysis.md`` plus the
+labelled layout the generic parser handles, and take their merchant from
+the dictionary aliases in turn, so a corpus at least as long as the alias
+list mentions every alias. Generation is seeded and reproducible.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence
+
+RECEIPT_FORMATS = ('humo', 'bank_text', 'cardxabar', 'nbu_conversion', 'labelled')
+
+_HUMO_OPERATIONS = ('Оплата', 'Пополнение', 'Списание')
+_CARDXABAR_OPERATIONS = (('🔴', 'Pokupka'), ('🟢', 'Popolnenie'), ('🔴', 'Oplata'))
+_BANK_OPERATIONS = ('Pokupka', 'Popolnenie', 'Oplata')
+_LABELLED_OPERATIONS = ('Оплата', 'Пополнение', 'Отмена')
+
+
+def load_dictionary_payload(path: Path) -> Dict[str, Any]:
+    with Path(path).open(encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def build_dictionary_payload(base: Dict[str, Any], size: int, seed: int = 0) -> Dict[str, Any]:
+    """``base`` with synthetic aliases appended until it holds ``size`` aliases.
+
+    Synthetic aliases mimic real P2P descriptors and point at existing
+    operators, so metadata lookups stay realistic. Smaller sizes truncate.
+    """
+
+    payload = copy.deepcopy(base)
+    aliases: List[Dict[str, Any]] = payload.get('aliases', [])[:size]
+    operators = [entry for entry in base.get('aliases', []) if entry.get('operator')]
+    rng = random.Random(seed)
+    index = 0
+    while len(aliases) < size:
+        template = operators[index % len(operators)]
+        aliases.append(
+            {
+                'alias': f"{rng.choice(('PSP', 'UPAY', 'CLICK', 'APELSIN', 'PAYNET'))} P2P "
+                f"SYN{index:05d}{rng.choice(('>', ', UZ', ', 99', ' HUMO'))}",
+                'operator': template['operator'],
+                'application': template.get('application'),
+            }
+        )
+        index += 1
+    payload['aliases'] = aliases
+    return payload
+
+
+def write_dictionary(payload: Dict[str, Any], path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('w', encoding='utf-8') as handle:
+        json.dump(payload, handle, ensure_ascii=False)
+    return path
+
+
+def _format_amount(value: float, thousands: str, decimal: str) -> str:
+    whole, cents = f"{value:,.2f}".split('.')
+    return whole.replace(',', thousands) + decimal + cents
+
+
+def render_receipt(receipt_format: str, alias: str, rng: random.Random, moment: datetime) -> str:
+    amount = rng.randrange(1_000, 10_000_000) / 100 * 100
+    balance = rng.randrange(0, 50_000_000_00) / 100
+    card = f"{rng.randrange(10_000):04d}"
+
+    if receipt_format == 'humo':
+        return (
+            f"💸 {rng.choice(_HUMO_OPERATIONS)}\n"
+            f"➖ {_format_amount(amount, '.', ',')} UZS\n"
+            f"📍 {alias}\n"
+            f"💳 HUMOCARD *{card}\n"
+            f"🕓 {moment:%H:%M %d.%m.%Y}\n"
+            f"💰 {_format_amount(balance, '.', ',')} UZS"
+        )
+    if receipt_format == 'bank_text':
+        return (
+            f"{rng.choice(_BANK_OPERATIONS)}: {alias}, tashkent {moment:%d.%m.%y %H:%M} "
+            f"karta ***{card}. summa:{amount:.2f} UZS, balans:{balance:.2f} UZS"
+        )
+    if receipt_format == 'cardxabar':
+        marker, operation = rng.choice(_CARDXABAR_OPERATIONS)
+        return (
+            f"{marker} {operation}\n"
+            f"➖ {_format_amount(amount, ' ', '.')} UZS\n"
+            f"💳 ***{card}\n"
+            f"📍 {alias}\n"
+            f"🕓 {moment:%d.%m.%y %H:%M}\n"
+            f"💵 {_format_amount(balance, ' ', '.')} UZS"
+        )
+    if receipt_format == 'nbu_conversion':
+        usd = rng.randrange(100, 100_000) / 100
+        return (
+            f"💸 Конверсия\n"
+            f"➖ {usd:.2f} USD\n"
+            f"💳 {rng.randrange(400000, 499999)}**{card}\n"
+            f"🕓 {moment:%d.%m.%y %H:%M}\n"
+            f"💵 {balance / 12_500:.2f} USD"
+        )
+    if receipt_format == 'labelled':
+        return (
+            f"{alias}\n"
+            f"{rng.choice(_LABELLED_OPERATIONS)}\n"
+            f"Дата: {moment:%d.%m.%Y %H:%M}\n"
+            f"Сумма: {_format_amount(amount, ' ', '.')} UZS\n"
+            f"Карта: *{card}\n"
+            f"Баланс: {_format_amount(balance, ' ', '.')} UZS"
+        )
+    raise ValueError(f'Unknown receipt format: {receipt_format}')
+
+
+def generate_receipts(
+    aliases: Sequence[str],
+    count: int,
+    *,
+    formats: Sequence[str] = RECEIPT_FORMATS,
+    seed: int = 0,
+) -> Iterator[Dict[str, str]]:
+    """Yield ``count`` receipts as ``{'format', 'alias', 'text'}`` dicts.
+
+    Formats rotate per receipt and aliases advance on every receipt that
+    names a merchant, so all aliases appear once ``count`` is large enough.
+    """
+
+    rng = random.Random(seed)
+    moment = datetime(2025, 1, 1, 8, 0)
+    alias_index = 0
+    for index in range(count):
+        receipt_format = formats[index % len(formats)]
+        alias = ''
+        if receipt_format != 'nbu_conversion':
+            alias = aliases[alias_index % len(aliases)]
+            alias_index += 1
+        moment += timedelta(minutes=rng.randrange(1, 240))
+        yield {
+            'format': receipt_format,
+            'alias': alias,
+            'text': render_receipt(receipt_format, alias, rng, moment),
+        }
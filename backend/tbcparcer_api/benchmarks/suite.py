@@ -0,0 +1,217 @@
+"""Throughput, latency and allocation benchmarks for receipt processing.
+
+Three stages are measured against dictionaries padded to each requested
+size: ``parse`` (``LocalReceiptParser.parse`` including dictionary
+resolution), ``lookup`` (``OperatorDictionary.match`` over every alias plus
+near-misses that reach the fuzzy index) and ``enrich``
+(``enhance_with_operator_info`` against a prebuilt ``OperatorNameIndex``).
+
+Every operation is timed on its own, so results carry p50/p99 latency as
+well as throughput. Allocations are measured in a separate ``tracemalloc``
+pass over a sample of the inputs, because tracing inflates timings.
+Lookup memoization is disabled by default so that repeated inputs measure
+the dictionary rather than the LRU cache.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.receipt_corpus import build_dictionary_payload, generate_receipts, write_dictionary
+from src.services import operator_dictionary as dictionary_module
+from src.services.ai_parser import LocalReceiptParser, enhance_with_operator_info
+from src.services.operator_dictionary import OperatorDictionary
+from src.services.operator_matcher import OperatorNameIndex
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+DEFAULT_THRESHOLD = 0.25
+
+# Metric -> True when a larger value is worse.
+REGRESSION_METRICS = {'p50_us': True, 'ops_per_sec': False, 'alloc_kib_per_op': True}
+
+_ALLOCATION_SAMPLE = 200
+
+
+@dataclass
+class BenchmarkResult:
+    stage: str
+    dictionary_size: int
+    operations: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    alloc_kib_per_op: float
+
+    @property
+    def key(self) -> str:
+        return f'{self.stage}@{self.dictionary_size}'
+
+
+@dataclass
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else float('inf')
+
+
+def _percentile(sorted_values: Sequence[int], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(stage: str, dictionary_size: int, operation: Callable[[Any], Any], inputs: Sequence[Any],
+            rounds: int = 1) -> BenchmarkResult:
+    """Time ``operation`` on each input ``rounds`` times, then trace a sample."""
+
+    for item in inputs[:10]:  # warm lazy state outside the measurement
+        operation(item)
+
+    timings: List[int] = []
+    clock = time.perf_counter_ns
+    for _ in range(rounds):
+        for item in inputs:
+            started = clock()
+            operation(item)
+            timings.append(clock() - started)
+    timings.sort()
+    total_seconds = sum(timings) / 1e9
+
+    step = max(1, len(inputs) // _ALLOCATION_SAMPLE)
+    sample = inputs[::step][:_ALLOCATION_SAMPLE]
+    allocated = 0
+    tracemalloc.start()
+    try:
+        for item in sample:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            operation(item)
+            allocated += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        stage=stage,
+        dictionary_size=dictionary_size,
+        operations=len(timings),
+        ops_per_sec=len(timings) / total_seconds if total_seconds else 0.0,
+        p50_us=_percentile(timings, 0.50) / 1000,
+        p99_us=_percentile(timings, 0.99) / 1000,
+        alloc_kib_per_op=allocated / len(sample) / 1024,
+    )
+
+
+@contextmanager
+def installed_dictionary(path: Path, cache_size: int) -> Iterator[OperatorDictionary]:
+    """Make ``path`` the process-wide operator dictionary for the block."""
+
+    dictionary = OperatorDictionary(path, cache_size=cache_size)
+    with dictionary_module._DICTIONARY_LOCK:
+        previous = dictionary_module._DICTIONARY_INSTANCE
+        dictionary_module._DICTIONARY_INSTANCE = dictionary
+    try:
+        yield dictionary
+    finally:
+        with dictionary_module._DICTIONARY_LOCK:
+            dictionary_module._DICTIONARY_INSTANCE = previous
+
+
+def _near_miss(alias: str) -> str:
+    # Drop a character from the middle: no exact alias, still a fuzzy candidate.
+    middle = len(alias) // 2
+    return alias[:middle] + alias[middle + 1:]
+
+
+def run_suite(
+    base_payload: Dict[str, Any],
+    *,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    receipts: int = 2_000,
+    rounds: int = 1,
+    cache_size: int = 0,
+    seed: int = 0,
+    stages: Sequence[str] = ('parse', 'lookup', 'enrich'),
+) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    operator_rows = [
+        (index, metadata.get('display_name') or name, name)
+        for index, (name, metadata) in enumerate(base_payload.get('operators', {}).items(), start=1)
+    ]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            payload = build_dictionary_payload(base_payload, size, seed=seed)
+            path = write_dictionary(payload, Path(workdir) / f'operators_{size}.json')
+            aliases = [entry['alias'] for entry in payload['aliases']]
+            corpus = [item['text'] for item in generate_receipts(aliases, max(receipts, 1), seed=seed)]
+
+            with installed_dictionary(path, cache_size) as dictionary:
+                parser = LocalReceiptParser()
+                if 'parse' in stages:
+                    results.append(measure('parse', size, parser.parse, corpus, rounds))
+                if 'lookup' in stages:
+                    candidates = [candidate for alias in aliases for candidate in (alias, _near_miss(alias))]
+                    results.append(measure('lookup', size, dictionary.match, candidates, rounds))
+                if 'enrich' in stages:
+                    name_index = OperatorNameIndex(operator_rows, dictionary)
+                    parsed = [parser.parse(text) for text in corpus]
+                    results.append(
+                        measure(
+                            'enrich',
+                            size,
+                            lambda item: enhance_with_operator_info(dict(item), name_index),
+                            parsed,
+                            rounds,
+                        )
+                    )
+    return results
+
+
+def save_results(results: Sequence[BenchmarkResult], path: Path) -> None:
+    payload = {'results': [asdict(result) for result in results]}
+    Path(path).write_text(json.dumps(payload, indent=2), encoding='utf-8')
+
+
+def load_results(path: Path) -> Dict[str, BenchmarkResult]:
+    payload = json.loads(Path(path).read_text(encoding='utf-8'))
+    loaded = (BenchmarkResult(**item) for item in payload.get('results', []))
+    return {result.key: result for result in loaded}
+
+
+def find_regressions(
+    results: Sequence[BenchmarkResult],
+    baseline: Dict[str, BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+    metrics: Optional[Dict[str, bool]] = None,
+) -> List[Regression]:
+    """Metrics that got worse than ``baseline`` by more than ``threshold`` (a fraction).
+
+    Results without a baseline entry are skipped, so adding a dictionary
+    size does not fail the first run that measures it.
+    """
+
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.key)
+        if reference is None:
+            continue
+        for metric, higher_is_worse in (metrics or REGRESSION_METRICS).items():
+            current, previous = getattr(result, metric), getattr(reference, metric)
+            if higher_is_worse:
+                worse = current > previous * (1 + threshold)
+            else:
+                worse = current < previous / (1 + threshold)
+            if worse:
+                regressions.append(Regression(result.key, metric, previous, current))
+    return regressions
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Скрипт для сборки предкомпилированного снимка словаря операторов.
+
+Запускайте после каждого изменения operators_dict.json: воркеры загружают
+снимок вместо разбора JSON, пока он соответствует исходному файлу.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.services.operator_dictionary import (
+    _default_dictionary_path,
+    compile_operator_dictionary,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Build compiled operator dictionary snapshot')
+    parser.add_argument(
+        '--source',
+        default=os.getenv('OPERATORS_DICTIONARY_PATH', str(_default_dictionary_path())),
+        help='Path to operators_dict.json',
+    )
+    parser.add_argument(
+        '--output',
+        default=os.getenv('OPERATORS_DICTIONARY_COMPILED_PATH'),
+        help='Where to write the compiled snapshot (defaults to <source>.compiled.pickle)',
+    )
+    args = parser.parse_args()
+
+    output_path = compile_operator_dictionary(
+        Path(args.source),
+        Path(args.output) if args.output else None,
+    )
+    print(f"✅ Снимок словаря сохранён: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
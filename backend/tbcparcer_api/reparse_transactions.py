@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Скрипт для повторного разбора сохранённых транзакций.
+
+Запускайте после изменения словаря операторов или правил локального
+парсера: оператор, приложение и категория всех транзакций пересчитываются
+по raw_text. Прогресс сохраняется в контрольную точку, прерванный запуск
+продолжается с флагом --resume. С флагом --dry-run база не меняется, а
+изменения выводятся построчно в формате JSON; контрольная точка при этом
+не записывается.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.app_factory import create_app
+from src.services.bulk_reparse import BulkReparser
+
+
+def _default_checkpoint_path() -> Path:
+    return Path(__file__).resolve().parent / 'src' / 'database' / 'reparse_checkpoint.json'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Re-derive operator fields of stored transactions')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Transactions per chunk and UPDATE batch')
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes (default: CPU count, 0: in-process)')
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print changes as JSON lines instead of writing them; no checkpoint is saved',
+    )
+    parser.add_argument('--resume', action='store_true', help='Continue from the last checkpoint')
+    parser.add_argument('--checkpoint', default=str(_default_checkpoint_path()), help='Checkpoint file path')
+    parser.add_argument('--diff-output', help='Write dry-run changes to this file instead of stdout')
+    args = parser.parse_args()
+
+    diff_stream = open(args.diff_output, 'w', encoding='utf-8') if args.diff_output else sys.stdout
+
+    def _print_diff(diff):
+        diff_stream.write(json.dumps(diff, ensure_ascii=False, default=str) + '\n')
+
+    app = create_app({'PARSE_JOB_WORKERS': 0})
+    reparser = BulkReparser(
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        checkpoint_path=Path(args.checkpoint),
+        on_diff=_print_diff if args.dry_run else None,
+        logger=app.logger,
+    )
+
+    try:
+        with app.app_context():
+            report = reparser.run(resume=args.resume)
+    finally:
+        if diff_stream is not sys.stdout:
+            diff_stream.close()
+
+    mode = 'пробный запуск' if report.dry_run else 'изменения записаны'
+    print(
+        f"✅ Обработано: {report.processed}, изменено: {report.changed}, "
+        f"ошибок: {report.failed} ({mode})",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Набор бенчмарков разбора чеков, поиска по словарю и обогащения.
+
+Генерирует синтетические чеки всех известных форматов по всем алиасам
+словаря операторов, дополняет словарь до заданных размеров (по умолчанию
+10², 10³ и 10⁴ алиасов) и печатает пропускную способность, задержку p50/p99
+и объём выделенной памяти на операцию. С флагом --baseline сравнивает
+результаты с сохранёнными и завершается с кодом 1 при регрессии сверх
+порога --threshold.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.receipt_corpus import load_dictionary_payload
+from benchmarks.suite import (
+    DEFAULT_SIZES,
+    DEFAULT_THRESHOLD,
+    find_regressions,
+    load_results,
+    run_suite,
+    save_results,
+)
+from src.services.operator_dictionary import _default_dictionary_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark parsing, dictionary lookup and enrichment')
+    parser.add_argument('--dictionary', default=str(_default_dictionary_path()), help='Base operators dictionary JSON')
+    parser.add_argument(
+        '--sizes',
+        type=lambda value: [int(size) for size in value.split(',')],
+        default=list(DEFAULT_SIZES),
+        help='Comma-separated dictionary sizes in aliases',
+    )
+    parser.add_argument('--receipts', type=int, default=2000, help='Synthetic receipts per dictionary size')
+    parser.add_argument('--rounds', type=int, default=1, help='Passes over the inputs per benchmark')
+    parser.add_argument('--cache-size', type=int, default=0, help='Dictionary lookup memo size (0 disables it)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed')
+    parser.add_argument('--save', help='Write results as JSON to this path')
+    parser.add_argument('--baseline', help='Compare against results saved earlier with --save')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='Allowed relative slowdown before a metric counts as a regression',
+    )
+    args = parser.parse_args()
+
+    results = run_suite(
+        load_dictionary_payload(Path(args.dictionary)),
+        sizes=args.sizes,
+        receipts=args.receipts,
+        rounds=args.rounds,
+        cache_size=args.cache_size,
+        seed=args.seed,
+    )
+
+    print(f"{'benchmark':<14} {'ops/s':>10} {'p50 µs':>9} {'p99 µs':>9} {'KiB/op':>8}")
+    for result in results:
+        print(
+            f"{result.key:<14} {result.ops_per_sec:>10.0f} {result.p50_us:>9.1f} "
+            f"{result.p99_us:>9.1f} {result.alloc_kib_per_op:>8.2f}"
+        )
+
+    if args.save:
+        save_results(results, Path(args.save))
+        print(f"✅ Результаты сохранены в {args.save}")
+
+    if args.baseline:
+        regressions = find_regressions(results, load_results(Path(args.baseline)), args.threshold)
+        for regression in regressions:
+            print(
+                f"❌ {regression.key} {regression.metric}: {regression.baseline:.2f} → "
+                f"{regression.current:.2f} ({regression.change:+.0%})"
+            )
+        if regressions:
+            sys.exit(1)
+        print(f"✅ Регрессий сверх {args.threshold:.0%} нет")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,34 @@ from flask import Flask, jsonify, request, send_from_directory, g
 from flask_cors import CORS
 from werkzeug.exceptions import HTTPException
 
+from src.models.postgres_profile import (
+    DEFAULT_MAX_OVERFLOW,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_STATEMENT_TIMEOUT_MS,
+    is_postgres_uri,
+    normalize_database_uri,
+    postgres_engine_options,
+)
+from src.models.sqlite_profile import (
+    SQLITE_POOL_OPTIONS,
+    apply_sqlite_pragmas,
+    is_sqlite_file_uri,
+    resolve_sqlite_pragmas,
+)
 from src.models.user import db
-from src.services.operator_dictionary import get_operator_dictionary
+from src.services.operator_dictionary import (
+    get_operator_dictionary,
+    start_dictionary_watcher,
+)
 from src.utils.http import api_error, ensure_request_id
 
 
 def _default_database_uri() -> str:
-    """Return the default SQLite connection string used by the API."""
+    """Return ``DATABASE_URL`` or the default SQLite connection string used by the API."""
+
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        return normalize_database_uri(database_url)
 
     database_dir = os.path.join(os.path.dirname(__file__), 'database')
     os.makedirs(database_dir, exist_ok=True)
@@ -33,23 +54,82 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
     app.config.setdefault('SECRET_KEY', 'tbcparcer_secret_key_2025')
     app.config.setdefault('SQLALCHEMY_DATABASE_URI', _default_database_uri())
     app.config.setdefault('SQLALCHEMY_TRACK_MODIFICATIONS', False)
+    app.config.setdefault(
+        'DICTIONARY_WATCH_INTERVAL',
+        float(os.getenv('OPERATORS_DICTIONARY_WATCH_INTERVAL', '5')),
+    )
+    app.config.setdefault('PARSE_JOB_WORKERS', int(os.getenv('AI_JOB_WORKERS', '2')))
+    app.config.setdefault('PARSE_JOB_RETENTION_DAYS', float(os.getenv('AI_JOB_RETENTION_DAYS', '7')))
+    app.config.setdefault('SQLITE_PROFILE', os.getenv('SQLITE_PROFILE', 'tuned'))
+    app.config.setdefault('SQLITE_PRAGMAS', {})
+    app.config.setdefault('POSTGRES_POOL_SIZE', int(os.getenv('POSTGRES_POOL_SIZE', DEFAULT_POOL_SIZE)))
+    app.config.setdefault('POSTGRES_MAX_OVERFLOW', int(os.getenv('POSTGRES_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW)))
+    app.config.setdefault(
+        'POSTGRES_STATEMENT_TIMEOUT_MS',
+        int(os.getenv('POSTGRES_STATEMENT_TIMEOUT_MS', DEFAULT_STATEMENT_TIMEOUT_MS)),
+    )
 
     if config:
         app.config.update(config)
 
     CORS(app, origins="*")
 
+    _configure_postgres_engine(app)
+    sqlite_pragmas = _configure_sqlite_engine(app)
     db.init_app(app)
+    if sqlite_pragmas:
+        with app.app_context():
+            apply_sqlite_pragmas(db.engine, sqlite_pragmas)
 
     _register_request_hooks(app)
     _register_blueprints(app)
     _register_error_handlers(app)
     _initialise_database(app)
+    _register_dictionary_watcher(app)
+    _register_job_queue(app)
     _register_static_routes(app)
 
     return app
 
 
+def _configure_postgres_engine(app: Flask) -> None:
+    """Pool, pre-ping and statement timeout for PostgreSQL databases."""
+
+    uri = normalize_database_uri(app.config.get('SQLALCHEMY_DATABASE_URI') or '')
+    if not is_postgres_uri(uri):
+        return
+
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    defaults = postgres_engine_options(
+        pool_size=app.config['POSTGRES_POOL_SIZE'],
+        max_overflow=app.config['POSTGRES_MAX_OVERFLOW'],
+        statement_timeout_ms=app.config['POSTGRES_STATEMENT_TIMEOUT_MS'],
+    )
+    for name, value in defaults.items():
+        engine_options.setdefault(name, value)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+
+
+def _configure_sqlite_engine(app: Flask) -> Dict[str, Any]:
+    """Pool options and connection pragmas of the configured SQLite profile.
+
+    Returns the pragmas to apply once the engine exists; empty for other
+    databases, in-memory SQLite and ``SQLITE_PROFILE=off``.
+    """
+
+    if not is_sqlite_file_uri(app.config.get('SQLALCHEMY_DATABASE_URI')):
+        return {}
+
+    pragmas = resolve_sqlite_pragmas(app.config['SQLITE_PROFILE'], app.config.get('SQLITE_PRAGMAS'))
+    if pragmas:
+        engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        for name, value in SQLITE_POOL_OPTIONS.items():
+            engine_options.setdefault(name, value)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+    return pragmas
+
+
 def _register_request_hooks(app: Flask) -> None:
     """Configure standard request/response lifecycle helpers."""
 
@@ -180,11 +260,14 @@ def _initialise_database(app: Flask) -> None:
     """Create database schema and populate reference data."""
 
     from src.models.formatting import CellColor, FormattingSetting  # noqa: F401
+    from src.models.migrations import run_startup_migrations
     from src.models.operator import Operator
+    from src.models.parse_job import ParseJob  # noqa: F401
     from src.models.transaction import Transaction  # noqa: F401
 
     with app.app_context():
         db.create_all()
+        run_startup_migrations(app.logger)
 
         try:
             dictionary = get_operator_dictionary()
@@ -276,6 +359,43 @@ def _initialise_database(app: Flask) -> None:
             app.logger.info('Seeded %d operators', len(operators_data))
 
 
+def _register_dictionary_watcher(app: Flask) -> None:
+    """Hot-reload the operator dictionary when its file changes on disk."""
+
+    interval = float(app.config.get('DICTIONARY_WATCH_INTERVAL') or 0)
+    if interval <= 0 or app.testing:
+        return
+
+    try:
+        watcher = start_dictionary_watcher(interval, logger=app.logger)
+    except Exception as watch_error:  # pragma: no cover - diagnostic guard
+        app.logger.warning('Failed to start operator dictionary watcher: %s', watch_error)
+        return
+
+    @app.before_request
+    def _ensure_dictionary_watcher() -> None:  # pragma: no cover - simple wiring
+        # Threads do not survive fork, so pre-forked workers start their own.
+        watcher.ensure_running()
+
+
+def _register_job_queue(app: Flask) -> None:
+    """Create the parse job queue and start its background workers."""
+
+    from src.services.job_queue import init_parse_job_queue
+
+    workers = int(app.config.get('PARSE_JOB_WORKERS') or 0)
+    queue = init_parse_job_queue(app, workers, retention_days=app.config['PARSE_JOB_RETENTION_DAYS'])
+    # Tests drain the queue explicitly with run_pending().
+    if workers <= 0 or app.testing:
+        return
+
+    queue.ensure_running()
+
+    @app.before_request
+    def _ensure_job_workers() -> None:  # pragma: no cover - simple wiring
+        queue.ensure_running()
+
+
 def _register_static_routes(app: Flask) -> None:
     """Serve compiled frontend files while protecting API routes."""
 
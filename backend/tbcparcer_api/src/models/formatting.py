@@ -34,13 +34,16 @@ class CellColor(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    transaction_id = db.Column(db.Integer, db.ForeignKey('transactions.id'), nullable=False)
+    transaction_id = db.Column(db.Integer, db.ForeignKey('transactions.id', ondelete='CASCADE'), nullable=False)
     column_name = db.Column(db.String(50), nullable=False)
     background_color = db.Column(db.String(7), default='#FFFFFF')  # HEX цвет
     
     # Relationships
     user = db.relationship('User', backref=db.backref('cell_colors', lazy=True))
-    transaction = db.relationship('Transaction', backref=db.backref('cell_colors', lazy=True))
+    # Цвета ячеек удаляются вместе с транзакцией
+    transaction = db.relationship(
+        'Transaction', backref=db.backref('cell_colors', lazy=True, cascade='all, delete-orphan')
+    )
     
     __table_args__ = (db.UniqueConstraint('user_id', 'transaction_id', 'column_name'),)
 
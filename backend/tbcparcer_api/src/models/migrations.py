@@ -0,0 +1,192 @@
+"""Idempotent schema upgrades applied at startup on top of ``db.create_all``.
+
+``create_all`` only creates missing tables, so columns and indexes added to
+existing tables are brought up to date here.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy import inspect, text
+
+from src.models.parse_job import ParseJob
+from src.models.transaction import RAW_TEXT_DIGEST_INDEX, compute_raw_text_digest
+from src.models.user import db
+
+_BACKFILL_BATCH_SIZE = 500
+# Digest given to historical duplicates, e.g. ``dup:42``; never a valid SHA-256 hex.
+DUPLICATE_DIGEST_PREFIX = 'dup:'
+
+
+def run_startup_migrations(logger: Optional[logging.Logger] = None) -> None:
+    """Apply pending schema upgrades to the bound database."""
+
+    logger = logger or logging.getLogger(__name__)
+    _migrate_transaction_raw_text_digest(logger)
+    _migrate_transaction_operator_fields()
+    _migrate_parse_job_transaction_fk(logger)
+    _create_missing_indexes(logger)
+
+
+def _migrate_transaction_raw_text_digest(logger: logging.Logger) -> None:
+    """Add, backfill and uniquely index ``transactions.raw_text_digest``."""
+
+    inspector = inspect(db.engine)
+    columns = {column['name'] for column in inspector.get_columns('transactions')}
+    indexes = {index['name'] for index in inspector.get_indexes('transactions')}
+
+    if 'raw_text_digest' not in columns:
+        db.session.execute(text('ALTER TABLE transactions ADD COLUMN raw_text_digest VARCHAR(64)'))
+        db.session.commit()
+
+    backfilled, duplicates = _backfill_raw_text_digests()
+    if backfilled:
+        logger.info(
+            'Backfilled raw_text_digest for %d transactions (%d duplicates marked %s<id>)',
+            backfilled,
+            duplicates,
+            DUPLICATE_DIGEST_PREFIX,
+        )
+
+    if RAW_TEXT_DIGEST_INDEX not in indexes:
+        db.session.execute(
+            text(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS {RAW_TEXT_DIGEST_INDEX} '
+                'ON transactions (user_id, raw_text_digest)'
+            )
+        )
+        db.session.commit()
+
+
+def _migrate_transaction_operator_fields() -> None:
+    """Add ``transactions.application`` and ``transactions.category``.
+
+    Existing rows are filled by ``reparse_transactions.py``, not here.
+    """
+
+    columns = {column['name'] for column in inspect(db.engine).get_columns('transactions')}
+    for name, column_type in (('application', 'VARCHAR(100)'), ('category', 'VARCHAR(50)')):
+        if name not in columns:
+            db.session.execute(text(f'ALTER TABLE transactions ADD COLUMN {name} {column_type}'))
+    db.session.commit()
+
+
+def _migrate_parse_job_transaction_fk(logger: logging.Logger) -> None:
+    """Recreate ``parse_jobs.transaction_id`` with ``ON DELETE SET NULL``.
+
+    With foreign keys enforced, the old constraint made permanently
+    deleting a transaction that a finished job points at fail. SQLite
+    cannot alter a constraint, so there the queue table is rebuilt.
+    """
+
+    inspector = inspect(db.engine)
+    for foreign_key in inspector.get_foreign_keys('parse_jobs'):
+        if foreign_key['constrained_columns'] == ['transaction_id']:
+            break
+    else:
+        return
+    if (foreign_key.get('options') or {}).get('ondelete', '').upper() == 'SET NULL':
+        return
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        existing_columns = {column['name'] for column in inspector.get_columns('parse_jobs')}
+        columns = ', '.join(column.name for column in ParseJob.__table__.columns if column.name in existing_columns)
+        connection = db.session.connection()
+        for index in inspector.get_indexes('parse_jobs'):
+            connection.execute(text(f'DROP INDEX IF EXISTS {index["name"]}'))
+        connection.execute(text('ALTER TABLE parse_jobs RENAME TO parse_jobs_legacy'))
+        ParseJob.__table__.create(bind=connection)
+        connection.execute(text(f'INSERT INTO parse_jobs ({columns}) SELECT {columns} FROM parse_jobs_legacy'))
+        connection.execute(text('DROP TABLE parse_jobs_legacy'))
+    elif dialect == 'postgresql':
+        name = foreign_key['name']
+        db.session.execute(text(f'ALTER TABLE parse_jobs DROP CONSTRAINT {name}'))
+        db.session.execute(
+            text(
+                f'ALTER TABLE parse_jobs ADD CONSTRAINT {name} FOREIGN KEY (transaction_id) '
+                'REFERENCES transactions (id) ON DELETE SET NULL'
+            )
+        )
+    else:
+        return
+    db.session.commit()
+    logger.info('Recreated parse_jobs.transaction_id foreign key with ON DELETE SET NULL')
+
+
+def _create_missing_indexes(logger: logging.Logger) -> None:
+    """Create indexes declared on the models but absent from existing tables.
+
+    Runs after the column migrations above, since indexes may cover the
+    columns they add.
+    """
+
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(db.engine, checkfirst=True)
+                logger.info('Created index %s on %s', index.name, table.name)
+
+
+def _backfill_raw_text_digests() -> Tuple[int, int]:
+    """Fill missing digests in id order.
+
+    Rows that duplicate an earlier receipt of the same user get the unique
+    placeholder ``dup:<id>``: historical duplicates stay readable, new
+    inserts still conflict with the first copy, and no row is left NULL to
+    be rescanned on the next start. Once every row has a digest this is a
+    single ``EXISTS`` probe.
+    """
+
+    pending = db.session.execute(
+        text('SELECT EXISTS (SELECT 1 FROM transactions WHERE raw_text_digest IS NULL)')
+    ).scalar()
+    if not pending:
+        return 0, 0
+
+    seen = {
+        (row.user_id, row.raw_text_digest)
+        for row in db.session.execute(
+            text('SELECT user_id, raw_text_digest FROM transactions WHERE raw_text_digest IS NOT NULL')
+        )
+    }
+
+    backfilled = duplicates = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            text(
+                'SELECT id, user_id, raw_text FROM transactions '
+                'WHERE raw_text_digest IS NULL AND id > :last_id ORDER BY id LIMIT :limit'
+            ),
+            {'last_id': last_id, 'limit': _BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            key = (row.user_id, compute_raw_text_digest(row.raw_text))
+            if key in seen:
+                duplicates += 1
+                updates.append({'id': row.id, 'digest': f'{DUPLICATE_DIGEST_PREFIX}{row.id}'})
+                continue
+            seen.add(key)
+            backfilled += 1
+            updates.append({'id': row.id, 'digest': key[1]})
+
+        db.session.execute(
+            text('UPDATE transactions SET raw_text_digest = :digest WHERE id = :id'),
+            updates,
+        )
+        db.session.commit()
+        last_id = rows[-1].id
+
+    return backfilled, duplicates
@@ -2,8 +2,14 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from src.models.user import db
 
+# Операторы выбираются по user_id (NULL для глобальных) и по (user_id, name)
+USER_NAME_INDEX = 'ix_operators_user_id_name'
+
 class Operator(db.Model):
     __tablename__ = 'operators'
+    __table_args__ = (
+        db.Index(USER_NAME_INDEX, 'user_id', 'name'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
@@ -66,3 +72,27 @@ class Operator(db.Model):
         
         return None
 
+    @staticmethod
+    def get_matcher_rows(user_id):
+        """Операторы в порядке get_operators_for_user: (id, name, description)"""
+        global_rows = Operator.get_owned_matcher_rows(None)
+        if not user_id:
+            return global_rows
+
+        personal_rows = Operator.get_owned_matcher_rows(user_id)
+        personal_names = {row.name for row in personal_rows}
+        return personal_rows + [row for row in global_rows if row.name not in personal_names]
+
+    @staticmethod
+    def get_owned_matcher_rows(user_id):
+        """Только операторы пользователя (глобальные при user_id=None) по id: (id, name, description).
+
+        Строки для кэшированных матчеров из src.services.operator_matcher.
+        """
+        owner = Operator.user_id == user_id if user_id else Operator.user_id.is_(None)
+        return (
+            db.session.query(Operator.id, Operator.name, Operator.description)
+            .filter(owner)
+            .order_by(Operator.id)
+            .all()
+        )
@@ -0,0 +1,59 @@
+import json
+import uuid
+from datetime import datetime
+from src.models.user import db
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_DUPLICATE = 'duplicate'
+JOB_FAILED = 'failed'
+FINISHED_JOB_STATUSES = (JOB_SUCCEEDED, JOB_DUPLICATE, JOB_FAILED)
+
+
+class ParseJob(db.Model):
+    """Отложенный разбор и сохранение чека (очередь parse-and-save)"""
+    __tablename__ = 'parse_jobs'
+    __table_args__ = (
+        db.Index('ix_parse_jobs_status_created_at', 'status', 'created_at'),
+    )
+
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    receipt_text = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=JOB_QUEUED)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # SET NULL: окончательное удаление транзакции из корзины не ломается о завершённые задачи
+    transaction_id = db.Column(db.Integer, db.ForeignKey('transactions.id', ondelete='SET NULL'))
+    result = db.Column(db.Text)  # JSON с распарсенными данными
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<ParseJob {self.id}: {self.status}>'
+
+    @property
+    def is_finished(self):
+        return self.status in FINISHED_JOB_STATUSES
+
+    def finish(self, status, *, transaction_id=None, result=None, error=None):
+        self.status = status
+        self.transaction_id = transaction_id
+        self.result = json.dumps(result, ensure_ascii=False, default=str) if result is not None else None
+        self.error = error
+        self.finished_at = datetime.utcnow()
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'transaction_id': self.transaction_id,
+            'parsed_data': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,55 @@
+"""Engine settings for running the API on PostgreSQL.
+
+Several API processes share one server, so each keeps a bounded pool that
+is checked with a cheap ping before use (connections die on failover and
+idle timeouts) and recycled well before server-side idle limits. Every
+statement carries a server-side timeout so a runaway export cannot hold
+a pooled connection forever.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy.engine import make_url
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_POOL_RECYCLE = 1800  # seconds
+DEFAULT_STATEMENT_TIMEOUT_MS = 30_000
+
+
+def normalize_database_uri(uri: str) -> str:
+    """Accept the ``postgres://`` scheme that hosting providers hand out."""
+
+    if uri.startswith('postgres://'):
+        return 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def is_postgres_uri(uri: Optional[str]) -> bool:
+    return bool(uri) and make_url(uri).get_backend_name() == 'postgresql'
+
+
+def postgres_engine_options(
+    *,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    pool_recycle: int = DEFAULT_POOL_RECYCLE,
+    statement_timeout_ms: int = DEFAULT_STATEMENT_TIMEOUT_MS,
+) -> Dict[str, Any]:
+    """``SQLALCHEMY_ENGINE_OPTIONS`` for a PostgreSQL engine.
+
+    ``statement_timeout_ms=0`` disables the timeout. It is passed as a
+    libpq startup option, understood by both psycopg2 and psycopg 3.
+    """
+
+    options: Dict[str, Any] = {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': True,
+    }
+    if statement_timeout_ms:
+        options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout_ms)}'}
+    return options
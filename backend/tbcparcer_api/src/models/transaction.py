@@ -1,9 +1,50 @@
+import hashlib
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import validates
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from src.models.operator import Operator
+from src.models.upsert import conflict_aware_insert
 from src.models.user import db
 
+RAW_TEXT_DIGEST_INDEX = 'ix_transactions_user_raw_text_digest'
+# Списки, экспорт и keyset-пагинация: WHERE user_id, is_deleted ORDER BY date_time, id
+ACTIVE_BY_DATE_INDEX = 'ix_transactions_user_deleted_date_id'
+# Корзина: WHERE is_deleted ORDER BY created_at; частичный, живые транзакции в него не попадают
+TRASH_BY_CREATED_INDEX = 'ix_transactions_trash_created_at'
+OPERATOR_INDEX = 'ix_transactions_operator_id'
+
+# Строк на одну выборку серверного курсора при экспорте
+EXPORT_FETCH_SIZE = 1000
+
+# Столбцы, которые to_dict отдаёт как есть или с преобразованием, в порядке _serialize
+SERIALIZED_COLUMNS = (
+    'id', 'user_id', 'date_time', 'operation_type', 'amount', 'currency', 'card_number',
+    'description', 'balance', 'operator_id', 'raw_text', 'is_deleted', 'created_at',
+    'application', 'category',
+)
+
+
+def compute_raw_text_digest(raw_text):
+    """SHA-256 текста чека без учёта различий в пробелах и переносах строк"""
+    normalized = ' '.join((raw_text or '').split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
 class Transaction(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        db.Index(RAW_TEXT_DIGEST_INDEX, 'user_id', 'raw_text_digest', unique=True),
+        db.Index(ACTIVE_BY_DATE_INDEX, 'user_id', 'is_deleted', 'date_time', 'id'),
+        db.Index(
+            TRASH_BY_CREATED_INDEX,
+            'created_at',
+            sqlite_where=db.text('is_deleted = 1'),
+            postgresql_where=db.text('is_deleted'),
+        ),
+        db.Index(OPERATOR_INDEX, 'operator_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -15,7 +56,10 @@ class Transaction(db.Model):
     description = db.Column(db.Text)
     balance = db.Column(db.Numeric(15, 2))
     operator_id = db.Column(db.Integer, db.ForeignKey('operators.id'))
+    application = db.Column(db.String(100))  # Приложение оператора из словаря
+    category = db.Column(db.String(50))  # Категория оператора из словаря
     raw_text = db.Column(db.Text, nullable=False)  # Оригинальный текст чека
+    raw_text_digest = db.Column(db.String(64))  # Ключ дедупликации, см. compute_raw_text_digest
     is_deleted = db.Column(db.Boolean, default=False, nullable=False)  # Soft delete flag
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -23,35 +67,147 @@ class Transaction(db.Model):
     user = db.relationship('User', backref=db.backref('transactions', lazy=True))
     operator = db.relationship('Operator', backref=db.backref('transactions', lazy=True))
 
+    @validates('raw_text')
+    def _sync_raw_text_digest(self, key, value):
+        self.raw_text_digest = compute_raw_text_digest(value)
+        return value
+
     def __repr__(self):
         return f'<Transaction {self.id}: {self.operation_type} {self.amount} {self.currency}>'
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'date_time': self.date_time.isoformat() if self.date_time else None,
-            'operation_type': self.operation_type,
-            'amount': float(self.amount) if self.amount else None,
-            'currency': self.currency,
-            'card_number': self.card_number,
-            'description': self.description,
-            'balance': float(self.balance) if self.balance else None,
-            'operator_id': self.operator_id,
-            'operator_name': self.operator.name if self.operator else None,
-            'operator_description': self.operator.description if self.operator else None,
-            'raw_text': self.raw_text,
-            'is_deleted': self.is_deleted,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'data_source': 'API',
-            'category': None
-        }
+        operator = self.operator
+        return _serialize(
+            [getattr(self, name) for name in SERIALIZED_COLUMNS],
+            operator.name if operator else None,
+            operator.description if operator else None,
+        )
+
+    @staticmethod
+    def query_with_operator():
+        """Запрос транзакций с оператором, загруженным тем же SELECT (без N+1 в to_dict)"""
+        return Transaction.query.options(joinedload(Transaction.operator))
+
+    @staticmethod
+    def get_user_transaction_dicts(user_id, limit=None):
+        """Генератор транзакций пользователя в формате to_dict, один запрос по столбцам
+
+        Для экспорта: ORM-объекты не создаются, оператор подтягивается
+        LEFT JOIN'ом. Строки читаются пачками по EXPORT_FETCH_SIZE (на
+        PostgreSQL через серверный курсор) и отдаются по одной, так что
+        потоковый экспорт не держит в памяти всю историю. Запрос выполняется
+        при первой итерации, в контексте приложения.
+        """
+        statement = (
+            db.select(*[getattr(Transaction, name) for name in SERIALIZED_COLUMNS], Operator.name, Operator.description)
+            .outerjoin(Operator, Transaction.operator_id == Operator.id)
+            .where(Transaction.user_id == user_id, Transaction.is_deleted.is_(False))
+            .order_by(Transaction.date_time.desc())
+        )
+        if limit:
+            statement = statement.limit(limit)
+        rows = db.session.execute(statement.execution_options(yield_per=EXPORT_FETCH_SIZE))
+        for row in rows:
+            yield _serialize(row[:-2], row[-2], row[-1])
 
     @staticmethod
     def get_user_transactions(user_id, limit=None):
         """Получить транзакции пользователя"""
-        query = Transaction.query.filter_by(user_id=user_id, is_deleted=False).order_by(Transaction.date_time.desc())
+        query = (
+            Transaction.query_with_operator()
+            .filter_by(user_id=user_id, is_deleted=False)
+            .order_by(Transaction.date_time.desc())
+        )
         if limit:
             query = query.limit(limit)
         return query.all()
 
+
+    @staticmethod
+    def find_duplicate(user_id, raw_text):
+        """Найти транзакцию пользователя с тем же текстом чека (по индексу digest)"""
+        return Transaction.query.filter_by(
+            user_id=user_id,
+            raw_text_digest=compute_raw_text_digest(raw_text),
+        ).first()
+
+    @staticmethod
+    def insert_unique(transaction):
+        """Сохранить транзакцию; при конфликте по (user_id, raw_text_digest)
+        вернуть уже существующую запись.
+
+        Возвращает None, если транзакция сохранена. Вставка идёт одним
+        INSERT ... ON CONFLICT DO NOTHING, так что параллельные запросы
+        не создают дубликатов и не обрывают транзакцию ошибкой.
+        """
+        statement = conflict_aware_insert(db.session, Transaction)
+        if statement is None:
+            return Transaction._insert_unique_or_rollback(transaction)
+
+        columns = Transaction.__table__.columns
+        values = {
+            column.key: getattr(transaction, column.key)
+            for column in columns
+            if getattr(transaction, column.key) is not None
+        }
+        row = db.session.execute(
+            statement.values(**values)
+            .on_conflict_do_nothing(index_elements=['user_id', 'raw_text_digest'])
+            .returning(*columns)
+        ).one_or_none()
+        db.session.commit()
+
+        if row is None:
+            existing = Transaction.find_duplicate(transaction.user_id, transaction.raw_text)
+            if existing is None:  # дубликат удалён между INSERT и SELECT
+                return Transaction.insert_unique(transaction)
+            return existing
+
+        for key, value in row._mapping.items():
+            setattr(transaction, key, value)
+        make_transient_to_detached(transaction)
+        db.session.add(transaction)
+        return None
+
+    @staticmethod
+    def _insert_unique_or_rollback(transaction):
+        """insert_unique для СУБД без ON CONFLICT: откат сессии при нарушении индекса"""
+        user_id, raw_text = transaction.user_id, transaction.raw_text
+        db.session.add(transaction)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            existing = Transaction.find_duplicate(user_id, raw_text)
+            if existing is None:
+                raise
+            return existing
+        return None
+
+
+def _serialize(values, operator_name, operator_description):
+    """Словарь транзакции из значений SERIALIZED_COLUMNS и полей оператора"""
+    (
+        transaction_id, user_id, date_time, operation_type, amount, currency, card_number, description,
+        balance, operator_id, raw_text, is_deleted, created_at, application, category,
+    ) = values
+    return {
+        'id': transaction_id,
+        'user_id': user_id,
+        'date_time': date_time.isoformat() if date_time else None,
+        'operation_type': operation_type,
+        'amount': float(amount) if amount else None,
+        'currency': currency,
+        'card_number': card_number,
+        'description': description,
+        'balance': float(balance) if balance else None,
+        'operator_id': operator_id,
+        'operator_name': operator_name,
+        'operator_description': operator_description,
+        'raw_text': raw_text,
+        'is_deleted': is_deleted,
+        'created_at': created_at.isoformat() if created_at else None,
+        'data_source': 'API',
+        'application': application,
+        'category': category
+    }
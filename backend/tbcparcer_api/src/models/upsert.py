@@ -0,0 +1,23 @@
+"""``INSERT ... ON CONFLICT`` for the dialects that support it.
+
+Insert-then-catch-``IntegrityError`` races under concurrent writers and, on
+PostgreSQL, aborts the whole transaction. SQLite (3.24+) and PostgreSQL
+both resolve the conflict inside the single ``INSERT`` instead.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+
+def conflict_aware_insert(session, model) -> Optional[Any]:
+    """Dialect ``insert(model)`` with ``on_conflict_*`` methods, or ``None`` if unsupported."""
+
+    dialect = session.get_bind(mapper=model).dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from src.models.upsert import conflict_aware_insert
 
 db = SQLAlchemy()
 
@@ -29,13 +30,27 @@ class User(db.Model):
     
     @staticmethod
     def get_or_create_user(telegram_id, username=None):
-        """Получить или создать пользователя по telegram_id"""
+        """Получить или создать пользователя по telegram_id
+
+        Создание идёт через INSERT ... ON CONFLICT DO NOTHING, поэтому
+        параллельные первые запросы одного пользователя не падают на
+        уникальном индексе.
+        """
         user = User.query.filter_by(telegram_id=telegram_id).first()
         if not user:
-            user = User(telegram_id=telegram_id, username=username)
-            db.session.add(user)
+            statement = conflict_aware_insert(db.session, User)
+            if statement is None:
+                user = User(telegram_id=telegram_id, username=username)
+                db.session.add(user)
+                db.session.commit()
+                return user
+            db.session.execute(
+                statement.values(telegram_id=telegram_id, username=username)
+                .on_conflict_do_nothing(index_elements=['telegram_id'])
+            )
             db.session.commit()
-        elif username and user.username != username:
+            user = User.query.filter_by(telegram_id=telegram_id).first()
+        if username and user.username != username:
             # Обновляем username если он изменился
             user.username = username
             db.session.commit()
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Optional, Sequence
+from typing import Optional
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request, url_for
 
+from src.models.parse_job import ParseJob
 from src.models.user import User, db
+from src.services.job_queue import get_parse_job_queue
 from src.services.receipt_pipeline import (
     DuplicateTransactionError,
     ReceiptPipeline,
@@ -17,6 +19,9 @@ from src.utils.errors import APIError
 ai_parsing_bp = Blueprint('ai_parsing', __name__)
 _pipeline: Optional[ReceiptPipeline] = None
 
+_MAX_JOBS_PER_REQUEST = 500
+_MAX_JOB_STATUS_IDS = 200
+
 
 def _get_pipeline() -> ReceiptPipeline:
     """Lazy pipeline initialisation so we reuse heavy resources."""
@@ -71,6 +76,11 @@ def parse_and_save_receipt():
     if telegram_id_int is None:
         raise APIError(400, 'Не указан telegram_id', error='Bad Request')
 
+    if data.get('async'):
+        user = User.get_or_create_user(telegram_id_int, data.get('username'))
+        job = get_parse_job_queue(current_app).submit(user, [receipt_text])[0]
+        return jsonify({'success': True, 'job': _job_payload(job, telegram_id_int)}), 202
+
     pipeline = _get_pipeline()
 
     try:
@@ -128,7 +138,7 @@ def batch_parse_receipts():
     if telegram_id_value is not None:
         user = User.query.filter_by(telegram_id=telegram_id_value).first()
 
-    operators: Sequence = pipeline.get_operators_for_user(user)
+    operator_index = pipeline.get_operator_index(user)
     ai_service = pipeline.parser
 
     results = ai_service.batch_parse_receipts(receipts_list)
@@ -138,7 +148,7 @@ def batch_parse_receipts():
             enhanced_results.append(result)
             continue
         enhanced_results.append(
-            ai_service.enhance_with_operator_info(result, operators)
+            ai_service.enhance_with_operator_info(result, operator_index)
         )
 
     return jsonify(
@@ -165,3 +175,83 @@ def validate_parsed_data():
 
     return jsonify({'success': True, 'validation_result': validation_result})
 
+
+
+def _job_payload(job: ParseJob, telegram_id: int) -> dict:
+    payload = job.to_dict()
+    payload['status_url'] = url_for('ai_parsing.get_job', job_id=job.id, telegram_id=telegram_id)
+    return payload
+
+
+def _job_owner_query():
+    """``(telegram_id, query)``: jobs visible to ``?telegram_id=`` of the request."""
+    telegram_id = _parse_optional_telegram_id(request.args.get('telegram_id'))
+    if telegram_id is None:
+        raise APIError(400, 'Не указан telegram_id', error='Bad Request')
+
+    user = User.get_by_telegram_id(telegram_id)
+    # Чужие и несуществующие задачи неотличимы: и те и другие «не найдены»
+    return telegram_id, ParseJob.query.filter(ParseJob.user_id == (user.id if user else None))
+
+
+@ai_parsing_bp.route('/jobs', methods=['POST'])
+def submit_jobs():
+    """Queue receipts for background parse-and-save; returns job ids at once."""
+    data = request.get_json() or {}
+    if 'receipts' not in data or 'telegram_id' not in data:
+        raise APIError(400, 'Отсутствует список чеков или telegram_id', error='Bad Request')
+
+    receipts_list = data['receipts']
+    if not isinstance(receipts_list, list):
+        raise APIError(400, 'Список чеков должен быть массивом', error='Bad Request')
+    if len(receipts_list) > _MAX_JOBS_PER_REQUEST:
+        raise APIError(400, f'Максимум {_MAX_JOBS_PER_REQUEST} чеков за раз', error='Bad Request')
+
+    receipt_texts = [str(receipt).strip() for receipt in receipts_list]
+    if not all(receipt_texts):
+        raise APIError(400, 'Пустой текст чека', error='Bad Request')
+
+    telegram_id_int = _parse_optional_telegram_id(data['telegram_id'])
+    if telegram_id_int is None:
+        raise APIError(400, 'Не указан telegram_id', error='Bad Request')
+
+    user = User.get_or_create_user(telegram_id_int, data.get('username'))
+    jobs = get_parse_job_queue(current_app).submit(user, receipt_texts)
+
+    return jsonify({'success': True, 'jobs': [_job_payload(job, telegram_id_int) for job in jobs]}), 202
+
+
+@ai_parsing_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """Return the status and outcome of a single parse job of ``?telegram_id=``."""
+    telegram_id, jobs = _job_owner_query()
+    job = jobs.filter(ParseJob.id == job_id).first()
+    if not job:
+        raise APIError(404, 'Задача не найдена', error='Not Found')
+    return jsonify({'success': True, 'job': _job_payload(job, telegram_id)})
+
+
+@ai_parsing_bp.route('/jobs', methods=['GET'])
+def get_jobs():
+    """Bulk status for ``?ids=a,b,c&telegram_id=`` so clients can poll a whole batch at once."""
+    telegram_id, owned_jobs = _job_owner_query()
+    job_ids = [job_id for job_id in request.args.get('ids', '').split(',') if job_id]
+    if not job_ids:
+        raise APIError(400, 'Не указаны ids задач', error='Bad Request')
+    if len(job_ids) > _MAX_JOB_STATUS_IDS:
+        raise APIError(400, f'Максимум {_MAX_JOB_STATUS_IDS} задач за раз', error='Bad Request')
+
+    jobs = {job.id: job for job in owned_jobs.filter(ParseJob.id.in_(job_ids)).all()}
+    summary: dict = {}
+    for job in jobs.values():
+        summary[job.status] = summary.get(job.status, 0) + 1
+
+    return jsonify(
+        {
+            'success': True,
+            'jobs': [_job_payload(jobs[job_id], telegram_id) for job_id in job_ids if job_id in jobs],
+            'missing': [job_id for job_id in job_ids if job_id not in jobs],
+            'summary': summary,
+            'finished': all(job.is_finished for job in jobs.values()),
+        }
+    )
@@ -1,4 +1,3 @@
-import json
 import os
 from datetime import datetime, timezone
 from http import HTTPStatus
@@ -37,22 +36,10 @@ def _collect_examples(dictionary):
 
 
 def _load_dictionary_metadata(dictionary) -> dict:
-    try:
-        with dictionary.path.open('r', encoding='utf-8') as stream:
-            data = json.load(stream)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-    operators = data.get('operators') if isinstance(data, dict) else {}
-    applications = data.get('applications') if isinstance(data, dict) else {}
-    if not isinstance(operators, dict):
-        operators = {}
-    if not isinstance(applications, dict):
-        applications = {}
-
+    snapshot = dictionary.snapshot()
     return {
-        'operators': len(operators),
-        'applications': len(applications),
+        'operators': len(snapshot.operators),
+        'applications': len(snapshot.applications),
     }
 
 
@@ -132,6 +119,7 @@ def reload_dictionary():
         'status': 'ok',
         'entries': reload_result['entries'],
         'changed': reload_result['changed'],
+        'reload_ms': reload_result.get('duration_ms'),
         'before_entries': before_entries,
         'after_entries': dictionary.size(),
         'path': str(dictionary.path),
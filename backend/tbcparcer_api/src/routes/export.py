@@ -7,9 +7,10 @@ import io
 import os
 import tempfile
 from datetime import datetime
-from typing import Iterable, Tuple
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, Tuple
 
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, Response, jsonify, request, send_file, stream_with_context
 
 from src.models.transaction import Transaction
 from src.models.user import User
@@ -20,6 +21,8 @@ from src.utils.errors import APIError
 export_bp = Blueprint('export', __name__)
 excel_service = ExcelExportService()
 
+_CSV_CHUNK_SIZE = 64 * 1024
+
 
 def _resolve_user(payload) -> Tuple[User, int]:
     if 'telegram_id' not in payload:
@@ -50,27 +53,35 @@ def _extract_limit(payload) -> Tuple[str, int | None]:
         raise APIError(400, 'limit должен быть целым числом', error='Bad Request')
 
 
-def _load_transactions(user_id: int, export_type: str, limit: int | None) -> Iterable[Transaction]:
+def _load_transactions(user_id: int, export_type: str, limit: int | None) -> Iterator[Dict[str, Any]]:
     if export_type == 'latest' and limit:
-        return Transaction.get_user_transactions(user_id, limit=limit)
-    return Transaction.get_user_transactions(user_id)
+        return Transaction.get_user_transaction_dicts(user_id, limit=limit)
+    return Transaction.get_user_transaction_dicts(user_id)
 
 
-def _ensure_transactions(transactions: Iterable[Transaction]):
+def _ensure_transactions(transactions: Iterable[Dict[str, Any]]):
     transactions_list = list(transactions)
     if not transactions_list:
         raise APIError(404, 'Нет данных для экспорта', error='Not Found')
     return transactions_list
 
 
+def _first_or_404(transactions: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Like _ensure_transactions, but keeps the rows lazy for streaming."""
+    iterator = iter(transactions)
+    first = next(iterator, None)
+    if first is None:
+        raise APIError(404, 'Нет данных для экспорта', error='Not Found')
+    return chain([first], iterator)
+
+
 @export_bp.route('/excel', methods=['POST'])
 def export_to_excel():
     payload = request.get_json() or {}
     user, telegram_id = _resolve_user(payload)
     export_type, limit = _extract_limit(payload)
 
-    transactions = _ensure_transactions(_load_transactions(user.id, export_type, limit))
-    transactions_data = [transaction.to_dict() for transaction in transactions]
+    transactions_data = _ensure_transactions(_load_transactions(user.id, export_type, limit))
     excel_buffer = excel_service.export_transactions(transactions_data)
 
     with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
@@ -103,8 +114,7 @@ def export_summary_to_excel():
     payload = request.get_json() or {}
     user, telegram_id = _resolve_user(payload)
 
-    transactions = _ensure_transactions(Transaction.get_user_transactions(user.id))
-    transactions_data = [transaction.to_dict() for transaction in transactions]
+    transactions_data = _ensure_transactions(Transaction.get_user_transaction_dicts(user.id))
     excel_buffer = excel_service.export_summary_report(transactions_data)
 
     with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
@@ -138,8 +148,7 @@ def export_to_json():
     user, telegram_id = _resolve_user(payload)
     export_type, limit = _extract_limit(payload)
 
-    transactions = _ensure_transactions(_load_transactions(user.id, export_type, limit))
-    transactions_data = [transaction.to_dict() for transaction in transactions]
+    transactions_data = _ensure_transactions(_load_transactions(user.id, export_type, limit))
 
     export_data = {
         'export_info': {
@@ -160,10 +169,7 @@ def export_to_csv():
     user, telegram_id = _resolve_user(payload)
     export_type, limit = _extract_limit(payload)
 
-    transactions = _ensure_transactions(_load_transactions(user.id, export_type, limit))
-
-    output = io.StringIO()
-    writer = csv.writer(output)
+    transactions = _first_or_404(_load_transactions(user.id, export_type, limit))
 
     headers = [
         'Дата и время',
@@ -176,59 +182,51 @@ def export_to_csv():
         'Оператор',
         'Приложение',
     ]
-    writer.writerow(headers)
-
-    for transaction in transactions:
-        transaction_dict = transaction.to_dict()
-        date_value = transaction_dict.get('date_time')
-        formatted_datetime = ''
-        if date_value:
-            try:
-                parsed = datetime.fromisoformat(str(date_value).replace('Z', '+00:00'))
-                formatted_datetime = parsed.strftime('%d.%m.%Y %H:%M')
-            except ValueError:
-                formatted_datetime = str(date_value)
-
-        writer.writerow(
-            [
-                formatted_datetime,
-                excel_service.operation_types.get(
-                    transaction_dict.get('operation_type'),
-                    transaction_dict.get('operation_type'),
-                ),
-                transaction_dict.get('amount'),
-                transaction_dict.get('currency'),
-                transaction_dict.get('card_number'),
-                transaction_dict.get('description'),
-                transaction_dict.get('balance'),
-                transaction_dict.get('operator_name'),
-                transaction_dict.get('operator_description'),
-            ]
-        )
-
-    with tempfile.NamedTemporaryFile(
-        mode='w', delete=False, suffix='.csv', encoding='utf-8'
-    ) as tmp_file:
-        tmp_file.write(output.getvalue())
-        tmp_file_path = tmp_file.name
+
+    def generate():
+        # Строки уходят клиенту по мере чтения из БД, без файла и списка в памяти
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(headers)
+
+        for transaction_dict in transactions:
+            date_value = transaction_dict.get('date_time')
+            formatted_datetime = ''
+            if date_value:
+                try:
+                    parsed = datetime.fromisoformat(str(date_value).replace('Z', '+00:00'))
+                    formatted_datetime = parsed.strftime('%d.%m.%Y %H:%M')
+                except ValueError:
+                    formatted_datetime = str(date_value)
+
+            writer.writerow(
+                [
+                    formatted_datetime,
+                    excel_service.operation_types.get(
+                        transaction_dict.get('operation_type'),
+                        transaction_dict.get('operation_type'),
+                    ),
+                    transaction_dict.get('amount'),
+                    transaction_dict.get('currency'),
+                    transaction_dict.get('card_number'),
+                    transaction_dict.get('description'),
+                    transaction_dict.get('balance'),
+                    transaction_dict.get('operator_name'),
+                    transaction_dict.get('operator_description'),
+                ]
+            )
+            if output.tell() >= _CSV_CHUNK_SIZE:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+
+        yield output.getvalue()
 
     timestamp = datetime.now().strftime('%Y%m%d_%H%M')
     filename = f"TBCparcer_transactions_{timestamp}.csv"
 
-    def cleanup(response):
-        try:
-            os.unlink(tmp_file_path)
-        except Exception:  # pragma: no cover
-            pass
-        return response
-
-    response = send_file(
-        tmp_file_path,
-        as_attachment=True,
-        download_name=filename,
+    return Response(
+        stream_with_context(generate()),
         mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'},
     )
-    response.call_on_close(lambda: cleanup(response))
-
-    return response
-
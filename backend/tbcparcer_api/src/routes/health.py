@@ -11,7 +11,14 @@ from flask import Blueprint, current_app, jsonify, g
 from sqlalchemy import text
 
 from src.models.user import db
-from src.services.operator_dictionary import get_operator_dictionary
+from src.services.operator_dictionary import (
+    get_dictionary_watcher,
+    get_operator_dictionary,
+)
+from src.services.ai_parser import parse_path_stats
+from src.services.circuit_breaker import CLOSED, get_openai_breaker
+from src.services.openai_backend import get_current_openai_backend
+from src.services.parse_cache import get_parse_cache
 
 
 health_bp = Blueprint('health', __name__)
@@ -41,14 +48,39 @@ def healthcheck():
     dictionary_status = {'status': 'ok'}
     try:
         dictionary = get_operator_dictionary()
-        dictionary_status['entries'] = dictionary.size()
+        snapshot = dictionary.snapshot()
+        dictionary_status['entries'] = len(snapshot.entries)
         dictionary_status['path'] = str(dictionary.path)
+        dictionary_status['checksum'] = snapshot.checksum
+        dictionary_status['version'] = snapshot.version
+        dictionary_status['reload_ms'] = snapshot.load_duration_ms
+        dictionary_status['compiled'] = snapshot.compiled
+        dictionary_status['cache'] = dictionary.cache_stats()
+        if snapshot.loaded_at:
+            dictionary_status['loaded_at'] = datetime.utcfromtimestamp(snapshot.loaded_at).isoformat() + 'Z'
+        watcher = get_dictionary_watcher()
+        if watcher is not None and watcher.dictionary is dictionary:
+            dictionary_status['watcher'] = watcher.status()
     except Exception as exc:  # pragma: no cover - diagnostic guard
         current_app.logger.warning('Healthcheck dictionary failure: %s', exc)
         dictionary_status = {'status': 'error', 'details': str(exc)}
         status_code = 503
         overall_status = 'degraded'
 
+    breaker_status = get_openai_breaker().status()
+    openai_status = {
+        'status': 'configured' if openai_configured else 'disabled',
+        'breaker': breaker_status,
+        'parse_cache': get_parse_cache().stats(),
+        'parse_paths': parse_path_stats(),
+    }
+    if openai_configured and breaker_status['state'] != CLOSED:
+        # Parsing still works through the local fallback, so the service stays up.
+        openai_status['status'] = 'degraded'
+    backend = get_current_openai_backend()
+    if backend is not None:
+        openai_status['backend'] = backend.stats()
+
     payload = {
         'status': overall_status,
         'timestamp': datetime.utcnow().isoformat() + 'Z',
@@ -61,9 +93,7 @@ def healthcheck():
             'platform': platform.platform(),
         },
         'database': database_status,
-        'openai': {
-            'status': 'configured' if openai_configured else 'disabled',
-        },
+        'openai': openai_status,
         'dictionary': dictionary_status,
     }
 
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 
 from src.models.operator import Operator
 from src.models.user import User, db
+from src.services.operator_matcher import invalidate_operator_matchers
 from src.utils.errors import APIError
 
 operator_bp = Blueprint('operator', __name__)
@@ -68,6 +69,8 @@ def create_operator():
         db.session.rollback()
         raise APIError(500, 'Failed to create operator', details={'reason': str(exc)})
 
+    invalidate_operator_matchers(user.id)
+
     return jsonify({'operator': operator.to_dict()}), 201
 
 @operator_bp.route('/operators/<int:operator_id>', methods=['PUT'])
@@ -98,6 +101,7 @@ def update_operator(operator_id):
         operator.description = data['description']
 
     db.session.commit()
+    invalidate_operator_matchers(user.id)
 
     return jsonify({'operator': operator.to_dict()})
 
@@ -123,6 +127,7 @@ def delete_operator(operator_id):
 
     db.session.delete(operator)
     db.session.commit()
+    invalidate_operator_matchers(user.id)
 
     return jsonify({'message': 'Operator deleted successfully'})
 
@@ -172,5 +177,7 @@ def copy_operator(operator_id):
         db.session.rollback()
         raise APIError(500, 'Failed to copy operator', details={'reason': str(exc)})
 
+    invalidate_operator_matchers(user.id)
+
     return jsonify({'operator': personal_operator.to_dict()}), 201
 
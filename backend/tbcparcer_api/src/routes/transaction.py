@@ -1,18 +1,22 @@
 from datetime import datetime
 
 from flask import Blueprint, jsonify, request
+from sqlalchemy import and_, or_
 
-from src.models.operator import Operator
 from src.models.transaction import Transaction
 from src.models.user import User, db
 from src.services.manual_transaction import (
     ManualTransactionError,
     create_manual_transaction,
 )
+from src.services.operator_matcher import find_operator_id
 from src.utils.errors import APIError
+from src.utils.pagination import decode_cursor, encode_cursor
 
 transaction_bp = Blueprint('transaction', __name__)
 
+MAX_CURSOR_PAGE_SIZE = 500
+
 @transaction_bp.route('/transactions', methods=['GET'])
 def get_transactions():
     """Получить все транзакции пользователя"""
@@ -29,13 +33,15 @@ def get_transactions():
     if not user:
         raise APIError(404, 'User not found', error='Not Found')
 
-    page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 50, type=int)
+    base_query = Transaction.query_with_operator().filter_by(user_id=user.id, is_deleted=False)
 
-    transactions = (
-        Transaction.query.filter_by(user_id=user.id, is_deleted=False)
-        .order_by(Transaction.date_time.desc())
-        .paginate(page=page, per_page=per_page, error_out=False)
+    if 'cursor' in request.args:
+        return _get_transactions_page_after(base_query, request.args['cursor'], per_page)
+
+    page = request.args.get('page', 1, type=int)
+    transactions = base_query.order_by(Transaction.date_time.desc(), Transaction.id.desc()).paginate(
+        page=page, per_page=per_page, error_out=False
     )
 
     return jsonify(
@@ -47,6 +53,41 @@ def get_transactions():
         }
     )
 
+def _get_transactions_page_after(base_query, cursor, per_page):
+    """Keyset-страница транзакций после курсора, без OFFSET и COUNT(*)
+
+    Пустой ``cursor`` означает первую страницу. ``next_cursor`` равен None
+    на последней странице. Общее количество считается только по запросу
+    ``include_total=1``.
+    """
+    per_page = max(1, min(per_page, MAX_CURSOR_PAGE_SIZE))
+    query = base_query
+    if cursor:
+        try:
+            after_date_time, after_id = decode_cursor(cursor)
+        except ValueError:
+            raise APIError(400, 'cursor is malformed', error='Bad Request')
+        query = query.filter(
+            or_(
+                Transaction.date_time < after_date_time,
+                and_(Transaction.date_time == after_date_time, Transaction.id < after_id),
+            )
+        )
+
+    rows = query.order_by(Transaction.date_time.desc(), Transaction.id.desc()).limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    payload = {
+        'transactions': [t.to_dict() for t in rows],
+        'next_cursor': encode_cursor(rows[-1].date_time, rows[-1].id) if has_more else None,
+        'has_more': has_more,
+        'per_page': per_page,
+    }
+    if request.args.get('include_total', '').lower() in ('1', 'true', 'yes'):
+        payload['total'] = base_query.order_by(None).count()
+    return jsonify(payload)
+
 @transaction_bp.route('/transactions', methods=['POST'])
 def create_transaction():
     """Создать новую транзакцию"""
@@ -104,8 +145,7 @@ def update_transaction(transaction_id):
             transaction.card_number = data['card_number']
         if 'description' in data:
             transaction.description = data['description']
-            operator = Operator.find_operator_by_description(data['description'], user.id)
-            transaction.operator_id = operator.id if operator else None
+            transaction.operator_id = find_operator_id(data['description'], user.id)
         if 'balance' in data:
             transaction.balance = float(data['balance']) if data['balance'] else None
 
@@ -158,7 +198,8 @@ def export_transactions():
         raise APIError(404, 'User not found', error='Not Found')
 
     transactions = (
-        Transaction.query.filter_by(user_id=user.id, is_deleted=False)
+        Transaction.query_with_operator()
+        .filter_by(user_id=user.id, is_deleted=False)
         .order_by(Transaction.date_time.desc())
         .all()
     )
@@ -75,7 +75,8 @@ def get_trash_transactions():
     per_page = request.args.get('per_page', 50, type=int)
 
     deleted_transactions = (
-        Transaction.query.filter_by(is_deleted=True)
+        Transaction.query_with_operator()
+        .filter_by(is_deleted=True)
         .order_by(Transaction.created_at.desc())
         .paginate(page=page, per_page=per_page, error_out=False)
     )
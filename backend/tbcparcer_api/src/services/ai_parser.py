@@ -1,15 +1,51 @@
+import hashlib
 import json
+import logging
 import os
 import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Sequence
+from functools import partial
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import openai
 
-from src.services.operator_dictionary import (
-    get_operator_dictionary,
-    normalize_operator_value,
-)
+from src.services.operator_dictionary import get_operator_dictionary
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError, get_openai_breaker
+from src.services.openai_backend import backoff_delay, get_openai_backend
+from src.services.operator_matcher import OperatorNameIndex
+from src.services.parse_cache import ParseResultCache, get_parse_cache, parse_cache_key
+from src.services.receipt_formats import ExtractedReceipt, classify_receipt
+
+logger = logging.getLogger(__name__)
+
+
+_DEFAULT_BATCH_CONCURRENCY = 8
+_DEFAULT_BATCH_ITEM_TIMEOUT = 30.0
+_DEFAULT_BATCH_PACK_SIZE = 10
+_DEFAULT_LOCAL_CONFIDENCE_THRESHOLD = 0.8
+
+# Marks results where OpenAI could not be reached, so the caller falls back.
+_AI_UNAVAILABLE = '_ai_unavailable'
+
+_PARSE_PATH_COUNTS: Counter = Counter()
+_PARSE_PATH_LOCK = threading.Lock()
+
+
+def _record_parse_path(path: str) -> None:
+    with _PARSE_PATH_LOCK:
+        _PARSE_PATH_COUNTS[path] += 1
+
+
+def parse_path_stats() -> Dict[str, int]:
+    """How many parses were served from cache, locally, by OpenAI, by the
+    local fallback while OpenAI was unavailable, or failed."""
+    with _PARSE_PATH_LOCK:
+        return {path: _PARSE_PATH_COUNTS[path] for path in ('cache', 'local', 'openai', 'local_fallback', 'error')}
 
 
 def _sanitize_string_list(value) -> List[str]:
@@ -25,21 +61,124 @@ def _sanitize_string_list(value) -> List[str]:
     return sanitized
 
 
+# The local parser runs on every receipt and in bulk re-parse jobs, so its
+# patterns are compiled once here. Lines are lowercased before matching,
+# which is why none of them needs ``re.IGNORECASE``.
+_CURRENCY_GROUP = r"(uzs|usd|eur|rub|сум|sum|доллар|руб|₽|\$|€)"
+
+_DATE_PATTERNS = (
+    (re.compile(r"(\d{4})[./-](\d{2})[./-](\d{2})[t\s,]*(\d{2}):(\d{2})(?::(\d{2}))?"), "ymd"),
+    (re.compile(r"(\d{2})[./-](\d{2})[./-](\d{4})[t\s,]*(\d{2}):(\d{2})(?::(\d{2}))?"), "dmy"),
+    (re.compile(r"(\d{2})[./-](\d{2})[./-](\d{2})[t\s,]*(\d{2}):(\d{2})(?::(\d{2}))?"), "dmy_short"),
+)
+_LABELLED_AMOUNT_PATTERN = re.compile(
+    r"(?:сумма|amount|на сумму|итого)\D*([\d\s.,']+)(?:\s*" + _CURRENCY_GROUP + r")?"
+)
+_AMOUNT_PATTERN = re.compile(r"([\d\s.,']+)\s*" + _CURRENCY_GROUP)
+_BALANCE_PATTERN = re.compile(r"(?:баланс|остаток|balance)\D*([\d\s.,']+)")
+_CARD_PATTERN = re.compile(r"(?:card|карта|pc|pan|пк)\D*(\*+\d{4}|\d{4})")
+_MASKED_CARD_PATTERN = re.compile(r"\*(\d{4})")
+_DIGIT_PATTERN = re.compile(r"\d")
+
+_OPERATION_KEYWORDS = {
+    "payment": ("payment", "оплата", "списание", "покупка"),
+    "refill": ("refill", "пополнение", "зачисление", "поступление"),
+    "conversion": ("conversion", "конверсия", "exchange", "обмен"),
+    "cancel": ("cancel", "отмена", "refund", "возврат"),
+}
+
+# Line classes signalled by keywords. A line is "meta" when it is a labelled
+# field rather than merchant or description text; the ``*_label`` classes
+# tell the tokenizer which value patterns are worth trying on a line.
+_LINE_KEYWORDS = {
+    **_OPERATION_KEYWORDS,
+    "meta": ("дата", "тип", "сум", "баланс", "карта", "operator", "оператор", "описание", "description"),
+    "operator_label": ("оператор", "operator", "отправитель", "sender"),
+    "amount_label": ("сумма", "amount", "на сумму", "итого"),
+    "balance_label": ("баланс", "остаток", "balance"),
+    "card_label": ("card", "карта", "pc", "pan", "пк"),
+    "currency": ("uzs", "usd", "eur", "rub", "сум", "sum", "доллар", "руб", "₽", "$", "€"),
+}
+
+
+def _build_keyword_kinds() -> Dict[str, frozenset]:
+    kinds: Dict[str, set] = {}
+    for kind, keywords in _LINE_KEYWORDS.items():
+        for keyword in keywords:
+            kinds.setdefault(keyword, set()).add(kind)
+    # The scan reports only the longest keyword starting at each position,
+    # so a keyword also carries the classes of the keywords it starts with.
+    return {
+        keyword: frozenset().union(*(other_kinds for other, other_kinds in kinds.items() if keyword.startswith(other)))
+        for keyword in kinds
+    }
+
+
+def _trie_pattern(words) -> str:
+    """Regex matching any of ``words``, longest first, laid out as a trie.
+
+    A flat ``a|b|c`` alternation tries every keyword at every position; the
+    trie only follows branches whose first characters match.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+_KEYWORD_KINDS = _build_keyword_kinds()
+# A lookahead match at every position finds overlapping and nested keywords.
+_KEYWORD_PATTERN = re.compile("(?=(" + _trie_pattern(_KEYWORD_KINDS) + "))")
+_DESCRIPTION_LABELS = ("описание", "description")
+
+
+@dataclass
+class _ReceiptTokens:
+    """Everything ``LocalReceiptParser`` needs, collected in one pass over the lines."""
+
+    lines: List[str] = field(default_factory=list)
+    operations: set = field(default_factory=set)
+    dates: Dict[str, re.Match] = field(default_factory=dict)
+    labelled_amount: Optional[re.Match] = None
+    amount: Optional[re.Match] = None
+    balance: Optional[float] = None
+    card: Optional[re.Match] = None
+    masked_card: Optional[re.Match] = None
+    first_line_is_meta: bool = False
+    labelled_operator: Optional[str] = None
+    labelled_description: Optional[str] = None
+    description_lines: List[str] = field(default_factory=list)
+
+
 class LocalReceiptParser:
     """Rule-based parser that extracts receipt data without external APIs."""
 
-    _DATE_PATTERNS = (
-        (re.compile(r"(\d{4})[./-](\d{2})[./-](\d{2})[T\s,]*(\d{2}):(\d{2})(?::(\d{2}))?"), "ymd"),
-        (re.compile(r"(\d{2})[./-](\d{2})[./-](\d{4})[T\s,]*(\d{2}):(\d{2})(?::(\d{2}))?"), "dmy"),
-        (re.compile(r"(\d{2})[./-](\d{2})[./-](\d{2})[T\s,]*(\d{2}):(\d{2})(?::(\d{2}))?"), "dmy_short"),
-    )
-
-    _OPERATION_KEYWORDS = {
-        "payment": {"payment", "оплата", "списание", "покупка"},
-        "refill": {"refill", "пополнение", "зачисление", "поступление"},
-        "conversion": {"conversion", "конверсия", "exchange", "обмен"},
-        "cancel": {"cancel", "отмена", "refund", "возврат"},
-    }
+    # Part of the parse cache key; bump whenever extraction rules change.
+    VERSION = "4"
+
+    # ``confidence`` of a parse is the lowest score among these fields.
+    REQUIRED_FIELDS = ("date_time", "operation_type", "amount")
+
+    # Per-field confidence: labelled values beat values guessed from shape,
+    # ambiguous keywords score low so that the LLM gets a look at them.
+    _FOUND_CONFIDENCE = 0.95
+    _SHORT_YEAR_CONFIDENCE = 0.9
+    _AMBIGUOUS_OPERATION_CONFIDENCE = 0.5
+    _UNLABELLED_AMOUNT_CONFIDENCE = 0.7
+    _AMOUNT_WITHOUT_CURRENCY_CONFIDENCE = 0.85
+    _MASKED_CARD_CONFIDENCE = 0.8
+    _UNRESOLVED_OPERATOR_CONFIDENCE = 0.4
 
     _CURRENCY_ALIASES = {
         "uzs": "UZS",
@@ -55,61 +194,139 @@ class LocalReceiptParser:
         "₽": "RUB",
     }
 
-    _META_KEYWORDS = (
-        "дата",
-        "тип",
-        "сум",
-        "баланс",
-        "карта",
-        "operator",
-        "оператор",
-        "описание",
-        "description",
-    )
-
     def parse(self, receipt_text: str) -> Dict:
-        """Parse receipt text using simple heuristics."""
-        normalized_text = receipt_text.replace("\r\n", "\n").replace("\r", "\n")
-        lines = [line.strip() for line in normalized_text.split("\n") if line.strip()]
-        lower_text = normalized_text.lower()
-
-        parsed: Dict[str, Optional[str]] = {
-            "date_time": self._extract_datetime(normalized_text),
-            "operation_type": self._detect_operation_type(lower_text),
-        }
+        """Parse receipt text with the extractor for its layout or, failing
+        that, with generic heuristics."""
+        lines = [line.strip() for line in receipt_text.splitlines() if line.strip()]
+
+        extracted = None
+        receipt_format = classify_receipt(lines)
+        if receipt_format is not None:
+            extracted = receipt_format.extract(lines)
+            if any(field not in extracted.fields for field in self.REQUIRED_FIELDS):
+                extracted = None
+        if extracted is None:
+            extracted = self._extract_generic(lines)
+
+        parsed: Dict[str, Any] = dict(extracted.fields)
+        confidence = dict(extracted.confidence)
+
+        dictionary_fields = self._resolve_operator_with_dictionary(extracted.operator, extracted.lines)
+        if dictionary_fields:
+            parsed.update(dictionary_fields)
+            confidence["operator"] = dictionary_fields["operator_match_score"]
+        elif extracted.operator:
+            parsed["operator"] = extracted.operator
+            confidence["operator"] = self._UNRESOLVED_OPERATOR_CONFIDENCE
+
+        parsed["receipt_format"] = extracted.receipt_format
+        parsed["field_confidence"] = confidence
+        parsed["confidence"] = min(confidence.get(field, 0.0) for field in self.REQUIRED_FIELDS)
 
-        amount_value, currency = self._extract_amount(lower_text)
+        return parsed
+
+    def _extract_generic(self, lines: Sequence[str]) -> ExtractedReceipt:
+        tokens = self._tokenize(lines)
+        extracted = ExtractedReceipt(lines=tokens.lines, operator=self._extract_operator(tokens))
+        fields, confidence = extracted.fields, extracted.confidence
+
+        fields["date_time"], confidence["date_time"] = self._extract_datetime(tokens)
+        fields["operation_type"], confidence["operation_type"] = self._detect_operation_type(tokens)
+
+        amount_value, currency, confidence["amount"] = self._extract_amount(tokens)
         if amount_value is not None:
-            parsed["amount"] = amount_value
+            fields["amount"] = amount_value
         if currency:
-            parsed["currency"] = currency
+            extracted.put("currency", currency, self._FOUND_CONFIDENCE)
 
-        balance_value = self._extract_balance(lower_text)
-        if balance_value is not None:
-            parsed["balance"] = balance_value
+        if tokens.balance is not None:
+            extracted.put("balance", tokens.balance, self._FOUND_CONFIDENCE)
 
-        card_number = self._extract_card_number(normalized_text)
+        card_number, card_confidence = self._extract_card_number(tokens)
         if card_number:
-            parsed["card_number"] = card_number
+            extracted.put("card_number", card_number, card_confidence)
 
-        operator = self._extract_operator(lines)
-        dictionary_fields = self._resolve_operator_with_dictionary(operator, lines)
-        if dictionary_fields:
-            parsed.update(dictionary_fields)
-        elif operator:
-            parsed["operator"] = operator
-
-        description = self._extract_description(lines)
+        description = self._extract_description(tokens)
         if description:
-            parsed["description"] = description
+            fields["description"] = description
 
-        return parsed
+        return extracted
+
+    def _tokenize(self, lines: Sequence[str]) -> _ReceiptTokens:
+        """Classify every line of the receipt in a single pass.
+
+        Each line is lowercased once and only the patterns still missing a
+        value are tried on it. Labelled values may sit on the line after
+        their label ("Сумма:\\n100 UZS"), so those patterns see the previous
+        line as well; unlabelled amounts and masked cards never span lines.
+        """
+        tokens = _ReceiptTokens()
+        previous: Optional[str] = None
+        previous_kinds: frozenset = frozenset()
+
+        for line in lines:
+            lower = line.lower()
+            index = len(tokens.lines)
+            tokens.lines.append(line)
+
+            kinds = frozenset().union(*(_KEYWORD_KINDS[keyword] for keyword in _KEYWORD_PATTERN.findall(lower)))
+            tokens.operations.update(kinds.intersection(_OPERATION_KEYWORDS))
+
+            if tokens.labelled_operator is None and "operator_label" in kinds:
+                label_value = line.partition(":")[2].strip()
+                if label_value:
+                    tokens.labelled_operator = label_value
+
+            if index == 0:
+                tokens.first_line_is_meta = "meta" in kinds
+            elif "meta" not in kinds:
+                tokens.description_lines.append(line)
+            elif tokens.labelled_description is None and lower.startswith(_DESCRIPTION_LABELS):
+                label_value = line.partition(":")[2].strip()
+                if label_value:
+                    tokens.labelled_description = label_value
+
+            if _DIGIT_PATTERN.search(lower) is None:
+                previous, previous_kinds = lower, kinds
+                continue
+
+            window = f"{previous}\n{lower}" if previous else lower
+            window_kinds = kinds | previous_kinds
+            previous, previous_kinds = lower, kinds
+
+            # Every date pattern ends with a time, so it needs a colon on this line.
+            if ":" in lower and len(tokens.dates) < len(_DATE_PATTERNS):
+                for pattern, ordering in _DATE_PATTERNS:
+                    if ordering not in tokens.dates:
+                        match = pattern.search(window)
+                        if match:
+                            tokens.dates[ordering] = match
+
+            if tokens.labelled_amount is None and "amount_label" in window_kinds:
+                match = _LABELLED_AMOUNT_PATTERN.search(window)
+                if match and self._normalize_number(match.group(1)) is not None:
+                    tokens.labelled_amount = match
+            if tokens.amount is None and "currency" in kinds:
+                tokens.amount = _AMOUNT_PATTERN.search(lower)
+
+            if tokens.balance is None and "balance_label" in window_kinds:
+                match = _BALANCE_PATTERN.search(window)
+                if match:
+                    tokens.balance = self._normalize_number(match.group(1))
+
+            if tokens.card is None and "card_label" in window_kinds:
+                tokens.card = _CARD_PATTERN.search(window)
+            if tokens.masked_card is None and "*" in lower:
+                tokens.masked_card = _MASKED_CARD_PATTERN.search(lower)
+
+        return tokens
 
     def _resolve_operator_with_dictionary(self, operator_value: Optional[str], lines: Sequence[str]) -> Dict[str, str]:
         dictionary = get_operator_dictionary()
         source_value = operator_value.strip() if operator_value else None
 
         dictionary_entry = None
+        match_score = 1.0
         if operator_value:
             dictionary_entry = dictionary.lookup(operator_value)
 
@@ -121,6 +338,13 @@ class LocalReceiptParser:
                         source_value = line
                     break
 
+        if not dictionary_entry and operator_value:
+            # Truncated or misspelled descriptors: fall back to trigram
+            # similarity on the operator line only, never on arbitrary lines.
+            fuzzy_match = dictionary.match(operator_value)
+            if fuzzy_match:
+                dictionary_entry, match_score = fuzzy_match
+
         if not dictionary_entry:
             return {}
 
@@ -133,6 +357,7 @@ class LocalReceiptParser:
             'operator': resolved_alias,
             'operator_normalized': normalized_alias,
             'operator_name': resolved_alias,
+            'operator_match_score': round(match_score, 3),
         }
 
         if source_value and source_value != resolved_alias:
@@ -174,23 +399,23 @@ class LocalReceiptParser:
         if application_name:
             enriched['operator_application'] = application_name
             application_metadata = dictionary.get_application_metadata(application_name)
-            brand_from_app = application_metadata.get('operator') if isinstance(application_metadata, dict) else None
+            brand_from_app = application_metadata.get('operator') if isinstance(application_metadata, Mapping) else None
             if isinstance(brand_from_app, str) and brand_from_app.strip():
                 enriched.setdefault('operator_brand', brand_from_app.strip())
 
-            app_tags = _sanitize_string_list(application_metadata.get('tags')) if isinstance(application_metadata, dict) else []
+            app_tags = _sanitize_string_list(application_metadata.get('tags')) if isinstance(application_metadata, Mapping) else []
             if app_tags:
                 enriched['operator_application_tags'] = app_tags
 
-            app_platforms = _sanitize_string_list(application_metadata.get('platforms')) if isinstance(application_metadata, dict) else []
+            app_platforms = _sanitize_string_list(application_metadata.get('platforms')) if isinstance(application_metadata, Mapping) else []
             if app_platforms:
                 enriched['operator_application_platforms'] = app_platforms
 
         return enriched
 
-    def _extract_datetime(self, text: str) -> Optional[str]:
-        for pattern, ordering in self._DATE_PATTERNS:
-            match = pattern.search(text)
+    def _extract_datetime(self, tokens: _ReceiptTokens) -> Tuple[Optional[str], float]:
+        for _, ordering in _DATE_PATTERNS:
+            match = tokens.dates.get(ordering)
             if not match:
                 continue
 
@@ -207,11 +432,14 @@ class LocalReceiptParser:
                 hour, minute, second = int(groups[3]), int(groups[4]), int(groups[5] or 0)
 
             try:
-                return datetime(year, month, day, hour, minute, second).isoformat()
+                value = datetime(year, month, day, hour, minute, second).isoformat()
             except ValueError:
                 continue
+            if ordering == "dmy_short":
+                return value, self._SHORT_YEAR_CONFIDENCE
+            return value, self._FOUND_CONFIDENCE
 
-        return None
+        return None, 0.0
 
     def _normalize_number(self, value: str) -> Optional[float]:
         cleaned = value.replace("\u00a0", " ").replace(" ", "").replace(",", ".")
@@ -223,51 +451,33 @@ class LocalReceiptParser:
         except ValueError:
             return None
 
-    def _extract_amount(self, text: str) -> tuple[Optional[float], Optional[str]]:
-        amount_patterns = (
-            re.compile(
-                r"(?:сумма|amount|на сумму|итого)\D*([\d\s.,']+)(?:\s*(uzs|usd|eur|rub|сум|sum|доллар|руб|₽|\$|€))?",
-                re.IGNORECASE,
-            ),
-            re.compile(r"([\d\s.,']+)\s*(uzs|usd|eur|rub|сум|sum|доллар|руб|₽|\$|€)", re.IGNORECASE),
-        )
-
-        for pattern in amount_patterns:
-            match = pattern.search(text)
+    def _extract_amount(self, tokens: _ReceiptTokens) -> Tuple[Optional[float], Optional[str], float]:
+        for labelled, match in ((True, tokens.labelled_amount), (False, tokens.amount)):
             if not match:
                 continue
 
-            amount_raw = match.group(1)
-            currency_raw = match.group(2) if len(match.groups()) > 1 else None
-            amount_value = self._normalize_number(amount_raw)
-            currency = self._normalize_currency(currency_raw)
+            amount_value = self._normalize_number(match.group(1))
+            currency = self._normalize_currency(match.group(2))
 
             if amount_value is not None:
-                return amount_value, currency
+                if not labelled:
+                    return amount_value, currency, self._UNLABELLED_AMOUNT_CONFIDENCE
+                if not currency:
+                    return amount_value, currency, self._AMOUNT_WITHOUT_CURRENCY_CONFIDENCE
+                return amount_value, currency, self._FOUND_CONFIDENCE
 
-        return None, None
+        return None, None, 0.0
 
-    def _extract_balance(self, text: str) -> Optional[float]:
-        balance_pattern = re.compile(r"(?:баланс|остаток|balance)\D*([\d\s.,']+)", re.IGNORECASE)
-        match = balance_pattern.search(text)
-        if not match:
-            return None
-        return self._normalize_number(match.group(1))
-
-    def _extract_card_number(self, text: str) -> Optional[str]:
-        card_pattern = re.compile(r"(?:card|карта|pc|pan|ПК)\D*(\*+\d{4}|\d{4})", re.IGNORECASE)
-        match = card_pattern.search(text)
-        if match:
-            card = match.group(1)
+    def _extract_card_number(self, tokens: _ReceiptTokens) -> Tuple[Optional[str], float]:
+        if tokens.card:
+            card = tokens.card.group(1)
             if not card.startswith("*"):
-                return f"*{card[-4:]}"
-            return card
+                return f"*{card[-4:]}", self._FOUND_CONFIDENCE
+            return card, self._FOUND_CONFIDENCE
 
-        masked_pattern = re.compile(r"\*(\d{4})")
-        match = masked_pattern.search(text)
-        if match:
-            return f"*{match.group(1)}"
-        return None
+        if tokens.masked_card:
+            return f"*{tokens.masked_card.group(1)}", self._MASKED_CARD_CONFIDENCE
+        return None, 0.0
 
     def _normalize_currency(self, currency: Optional[str]) -> Optional[str]:
         if not currency:
@@ -275,56 +485,179 @@ class LocalReceiptParser:
         normalized = currency.lower().strip().replace(".", "")
         return self._CURRENCY_ALIASES.get(normalized, normalized.upper())
 
-    def _detect_operation_type(self, text_lower: str) -> Optional[str]:
-        for op_type, keywords in self._OPERATION_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return op_type
+    def _detect_operation_type(self, tokens: _ReceiptTokens) -> Tuple[Optional[str], float]:
+        matched = [op_type for op_type in _OPERATION_KEYWORDS if op_type in tokens.operations]
+        if not matched:
+            return None, 0.0
+        if len(matched) > 1:
+            return matched[0], self._AMBIGUOUS_OPERATION_CONFIDENCE
+        return matched[0], self._FOUND_CONFIDENCE
+
+    def _extract_operator(self, tokens: _ReceiptTokens) -> Optional[str]:
+        if tokens.labelled_operator:
+            return tokens.labelled_operator
+        if tokens.lines and not tokens.first_line_is_meta:
+            return tokens.lines[0]
         return None
 
-    def _extract_operator(self, lines: Sequence[str]) -> Optional[str]:
-        for line in lines:
-            lowered = line.lower()
-            if any(keyword in lowered for keyword in ("оператор", "operator", "отправитель", "sender")):
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    candidate = parts[1].strip()
-                    if candidate:
-                        return candidate
-
-        if lines:
-            first_line = lines[0]
-            if not any(keyword in first_line.lower() for keyword in self._META_KEYWORDS):
-                return first_line
+    def _extract_description(self, tokens: _ReceiptTokens) -> Optional[str]:
+        if tokens.labelled_description:
+            return tokens.labelled_description
+        if tokens.description_lines:
+            return " ".join(tokens.description_lines)
         return None
 
-    def _extract_description(self, lines: Sequence[str]) -> Optional[str]:
-        description_lines = []
-        for line in lines[1:]:
-            lowered = line.lower()
-            if any(keyword in lowered for keyword in self._META_KEYWORDS):
-                if lowered.startswith("описание") or lowered.startswith("description"):
-                    parts = line.split(":", 1)
-                    if len(parts) == 2 and parts[1].strip():
-                        return parts[1].strip()
-                continue
-            description_lines.append(line)
 
-        if description_lines:
-            return " ".join(description_lines)
-        return None
+def enhance_with_operator_info(parsed_data: Dict, operators_list: Sequence) -> Dict:
+    """
+    Улучшение данных с информацией об операторе из базы данных
+
+    Args:
+        parsed_data: Распарсенные данные чека
+        operators_list: Список операторов из базы данных или готовый OperatorNameIndex
+
+    Returns:
+        Обогащенные данные с информацией об операторе
+    """
+    if 'operator' not in parsed_data or not parsed_data['operator']:
+        return parsed_data
+
+    dictionary = get_operator_dictionary()
+    original_operator = str(parsed_data['operator']).strip()
+    # Только точное/подстрочное совпадение: нечёткий поиск применяет локальный
+    # парсер к строке оператора, а здесь он сопоставил бы произвольный текст модели
+    dictionary_entry = dictionary.lookup(original_operator)
+
+    application_name: Optional[str] = None
+
+    if dictionary_entry:
+        # Оценку нечёткого совпадения из локального парсера не перезаписываем
+        parsed_data.setdefault('operator_match_score', 1.0)
+        resolved_alias = dictionary_entry['alias']
+        resolved_brand = dictionary_entry.get('operator')
+        application_name = dictionary_entry.get('application')
+        if resolved_alias != original_operator:
+            parsed_data['operator_raw'] = original_operator
+            parsed_data['operator'] = resolved_alias
+        parsed_data.setdefault('operator', resolved_alias)
+        if resolved_brand:
+            parsed_data.setdefault('operator_brand', resolved_brand)
+            parsed_data['operator_description'] = resolved_brand
+    else:
+        resolved_alias = original_operator
+        resolved_brand = None
+
+    normalized_alias = dictionary.normalize(resolved_alias)
+    if normalized_alias:
+        parsed_data['operator_normalized'] = normalized_alias
+
+    target_normalized = normalized_alias
+
+    operator_metadata = dictionary.get_operator_metadata(resolved_brand or resolved_alias)
+    if operator_metadata:
+        display_name = operator_metadata.get('display_name') or operator_metadata.get('name')
+        if isinstance(display_name, str) and display_name.strip():
+            parsed_data.setdefault('operator_name', display_name.strip())
+        else:
+            parsed_data.setdefault('operator_name', resolved_alias)
+
+        description = operator_metadata.get('description')
+        if isinstance(description, str) and description.strip():
+            parsed_data['operator_description'] = description.strip()
+
+        category = operator_metadata.get('category')
+        if isinstance(category, str) and category.strip():
+            parsed_data.setdefault('operator_category', category.strip())
+
+        country = operator_metadata.get('country')
+        if isinstance(country, str) and country.strip():
+            parsed_data.setdefault('operator_country', country.strip())
+
+        tags = _sanitize_string_list(operator_metadata.get('tags'))
+        if tags:
+            parsed_data.setdefault('operator_tags', tags)
+
+        if not application_name:
+            applications = operator_metadata.get('applications')
+            if isinstance(applications, list) and applications:
+                application_candidate = applications[0]
+                if isinstance(application_candidate, str) and application_candidate.strip():
+                    application_name = application_candidate.strip()
+    else:
+        parsed_data.setdefault('operator_name', resolved_alias)
+
+    if application_name:
+        parsed_data.setdefault('operator_application', application_name)
+        application_metadata = dictionary.get_application_metadata(application_name)
+        brand_from_app = application_metadata.get('operator') if isinstance(application_metadata, Mapping) else None
+        if isinstance(brand_from_app, str) and brand_from_app.strip():
+            parsed_data.setdefault('operator_brand', brand_from_app.strip())
+
+        if isinstance(application_metadata, Mapping):
+            app_tags = _sanitize_string_list(application_metadata.get('tags'))
+            if app_tags:
+                parsed_data.setdefault('operator_application_tags', app_tags)
+
+            app_platforms = _sanitize_string_list(application_metadata.get('platforms'))
+            if app_platforms:
+                parsed_data.setdefault('operator_application_platforms', app_platforms)
+
+    # Ищем оператора в базе данных
+    if isinstance(operators_list, OperatorNameIndex):
+        operator_index = operators_list
+    else:
+        operator_index = OperatorNameIndex(operators_list, dictionary)
+    matched_operator = operator_index.find(target_normalized)
+
+    if matched_operator:
+        parsed_data['operator_id'] = matched_operator.get('id')
+        parsed_data['operator_name'] = matched_operator.get('name')
+        description = matched_operator.get('description', '')
+        if description:
+            parsed_data['operator_description'] = description
+        elif resolved_brand:
+            parsed_data['operator_description'] = resolved_brand
+    else:
+        if resolved_alias:
+            parsed_data.setdefault('operator_name', resolved_alias)
+        if resolved_brand:
+            parsed_data.setdefault('operator_description', resolved_brand)
+
+    return parsed_data
 
 
 class AIParsingService:
     """Сервис для парсинга чеков с помощью OpenAI или локального пайплайна."""
 
-    def __init__(self, client: Optional[openai.OpenAI] = None):
+    model = "gpt-4o-mini"
+
+    def __init__(
+        self,
+        client: Optional[openai.OpenAI] = None,
+        cache: Optional[ParseResultCache] = None,
+        local_confidence_threshold: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         api_key = os.getenv('OPENAI_API_KEY')
         base_url = os.getenv('OPENAI_API_BASE')
         self.client = None
         self._local_parser = LocalReceiptParser()
+        self._cache = cache if cache is not None else get_parse_cache()
+        if local_confidence_threshold is None:
+            local_confidence_threshold = float(
+                os.getenv('AI_LOCAL_CONFIDENCE_THRESHOLD', _DEFAULT_LOCAL_CONFIDENCE_THRESHOLD)
+            )
+        # Receipts the local parser scores at or above this never reach OpenAI.
+        self.local_confidence_threshold = local_confidence_threshold
+        self._breaker = breaker if breaker is not None else get_openai_breaker()
 
         if api_key:
-            self.client = client or openai.OpenAI(api_key=api_key, base_url=base_url)
+            if client is not None:
+                self.client = client
+            elif os.getenv('OPENAI_BACKEND', 'async') == 'sync':
+                self.client = openai.OpenAI(api_key=api_key, base_url=base_url)
+            else:
+                self.client = get_openai_backend(api_key, base_url)
         
         self.parsing_prompt = """
 Ты - специализированный парсер финансовых чеков из Узбекистана. Твоя задача - извлечь структурированные данные из текста чека и вернуть их в формате JSON.
@@ -366,36 +699,117 @@ class AIParsingService:
   "error": "Не удалось распарсить чек"
 }
 """
-    
-    def parse_receipt(self, receipt_text: str, retry_count: int = 2) -> Dict:
+        self.packing_prompt = """
+Тебе передано несколько чеков, каждый начинается со строки "### <номер>".
+Распарси каждый чек по правилам выше и верни ОДИН JSON-объект вида:
+{"results": [{"index": 0, ...поля чека...}, {"index": 1, ...}]}
+где index - номер чека. Для чека, который не удалось распарсить, верни
+{"index": <номер>, "error": "..."}. Не пропускай чеки и не объединяй их.
+"""
+        prompt_text = self.parsing_prompt + self.packing_prompt
+        self.prompt_version = hashlib.sha256(prompt_text.encode('utf-8')).hexdigest()[:12]
+
+    @property
+    def cache(self) -> ParseResultCache:
+        return self._cache
+
+    def parse_receipt(
+        self,
+        receipt_text: str,
+        retry_count: int = 2,
+        timeout: Optional[float] = None,
+    ) -> Dict:
         """
         Парсинг чека с помощью OpenAI API или локального пайплайна
 
+        Успешные результаты кэшируются по тексту чека, модели и версии
+        промпта; повторный чек возвращается без обращения к API.
+
         Args:
             receipt_text: Текст чека для парсинга
             retry_count: Количество попыток (по умолчанию 2)
+            timeout: Общий лимит времени на все попытки, в секундах
 
         Returns:
             Dict с распарсенными данными или ошибкой
         """
 
-        if not self.client:
-            parsed_data = self._local_parser.parse(receipt_text)
-            validation_result = self.validate_receipt_data(parsed_data)
+        cached = self._get_cached(receipt_text)
+        if cached is not None:
+            _record_parse_path('cache')
+            return cached
+
+        if self.client:
+            local_result = self._parse_local_first(receipt_text)
+            if local_result is not None:
+                _record_parse_path('local')
+                return local_result
+            parsed_data = self._parse_with_openai(receipt_text, retry_count, timeout)
+            if parsed_data.pop(_AI_UNAVAILABLE, False):
+                fallback = self._parse_local(receipt_text)
+                if 'error' not in fallback:
+                    # Not cached: the API should get another look once it is back.
+                    fallback['parse_path'] = 'local_fallback'
+                    _record_parse_path('local_fallback')
+                    return fallback
+        else:
+            parsed_data = self._parse_local(receipt_text)
+
+        if 'error' in parsed_data:
+            _record_parse_path('error')
+        else:
+            _record_parse_path(parsed_data['parse_path'])
+            self._cache.set(self._cache_key(receipt_text), parsed_data)
+        return parsed_data
 
-            if 'error' in validation_result:
-                return validation_result
+    def _parse_local_first(self, receipt_text: str) -> Optional[Dict]:
+        """Local parse if it is confident enough to skip the paid API call."""
+        parsed_data = self._parse_local(receipt_text)
+        if 'error' in parsed_data or parsed_data['confidence'] < self.local_confidence_threshold:
+            return None
+        return parsed_data
 
-            parsed_data['raw_text'] = receipt_text
-            parsed_data['parsed_at'] = datetime.now().isoformat()
-            parsed_data['ai_model'] = 'local-rule-based'
+    def _get_cached(self, receipt_text: str) -> Optional[Dict]:
+        cached = self._cache.get(self._cache_key(receipt_text))
+        if cached is not None:
+            cached['raw_text'] = receipt_text
+            cached['cache_hit'] = True
+        return cached
 
-            return parsed_data
+    def _cache_key(self, receipt_text: str) -> str:
+        if self.client:
+            return parse_cache_key(receipt_text, self.model, self.prompt_version)
+        # Local results embed dictionary metadata, so a reload must miss.
+        version = f'{LocalReceiptParser.VERSION}:{get_operator_dictionary().checksum()}'
+        return parse_cache_key(receipt_text, 'local-rule-based', version)
+
+    def _parse_local(self, receipt_text: str) -> Dict:
+        parsed_data = self._local_parser.parse(receipt_text)
+        validation_result = self.validate_receipt_data(parsed_data)
+
+        if 'error' in validation_result:
+            return validation_result
+
+        parsed_data['raw_text'] = receipt_text
+        parsed_data['parsed_at'] = datetime.now().isoformat()
+        parsed_data['ai_model'] = 'local-rule-based'
+        parsed_data['parse_path'] = 'local'
+
+        return parsed_data
 
+    def _parse_with_openai(self, receipt_text: str, retry_count: int, timeout: Optional[float]) -> Dict:
+        deadline = time.monotonic() + timeout if timeout else None
         for attempt in range(retry_count + 1):
+            request_options = {}
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return {'error': 'Превышено время ожидания ответа AI API', _AI_UNAVAILABLE: True}
+                request_options['timeout'] = remaining
+
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
+                response = self._call_openai(
+                    model=self.model,
                     messages=[
                         {
                             "role": "system",
@@ -407,7 +821,8 @@ class AIParsingService:
                         }
                     ],
                     temperature=0.1,
-                    max_tokens=500
+                    max_tokens=500,
+                    **request_options
                 )
 
                 # Извлекаем ответ
@@ -429,7 +844,8 @@ class AIParsingService:
                     # Добавляем исходный текст и метаданные
                     parsed_data['raw_text'] = receipt_text
                     parsed_data['parsed_at'] = datetime.now().isoformat()
-                    parsed_data['ai_model'] = "gpt-4o-mini"
+                    parsed_data['ai_model'] = self.model
+                    parsed_data['parse_path'] = 'openai'
 
                     return parsed_data
 
@@ -438,12 +854,34 @@ class AIParsingService:
                         return {'error': 'Не удалось распарсить ответ AI как JSON'}
                     continue
 
+            except CircuitOpenError:
+                return {'error': 'AI API временно недоступен', _AI_UNAVAILABLE: True}
             except Exception as e:
-                if attempt == retry_count:
-                    return {'error': f'Ошибка при обращении к AI API: {str(e)}'}
+                failure = {'error': f'Ошибка при обращении к AI API: {str(e)}', _AI_UNAVAILABLE: True}
+                # The async backend has already retried transient failures.
+                if attempt == retry_count or getattr(self.client, 'retries_transient_errors', False):
+                    return failure
+                delay = backoff_delay(attempt)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    return failure
+                time.sleep(delay)
                 continue
 
         return {'error': 'Не удалось распарсить чек после всех попыток'}
+
+    def _call_openai(self, **kwargs) -> Any:
+        """chat.completions.create guarded by the circuit breaker."""
+        if not self._breaker.allow_request():
+            raise CircuitOpenError('OpenAI circuit breaker is open')
+
+        started = time.monotonic()
+        try:
+            response = self.client.chat.completions.create(**kwargs)
+        except Exception as error:
+            self._breaker.record_failure(time.monotonic() - started, error)
+            raise
+        self._breaker.record_success(time.monotonic() - started)
+        return response
     
     def validate_receipt_data(self, data: Dict) -> Dict:
         """Валидация данных чека"""
@@ -471,7 +909,7 @@ class AIParsingService:
         if 'date_time' in data:
             try:
                 datetime.fromisoformat(data['date_time'].replace('Z', '+00:00'))
-            except (ValueError, TypeError):
+            except (ValueError, TypeError, AttributeError):
                 errors.append('Неверный формат даты')
         
         if errors:
@@ -480,160 +918,184 @@ class AIParsingService:
         return {'valid': True}
     
     def enhance_with_operator_info(self, parsed_data: Dict, operators_list: Sequence) -> Dict:
+        """Улучшение данных с информацией об операторе, см. enhance_with_operator_info"""
+        return enhance_with_operator_info(parsed_data, operators_list)
+
+    def batch_parse_receipts(
+        self,
+        receipts_list: list,
+        max_concurrency: Optional[int] = None,
+        item_timeout: Optional[float] = None,
+        pack_size: Optional[int] = None,
+    ) -> list:
         """
-        Улучшение данных с информацией об операторе из базы данных
+        Пакетная обработка чеков
+
+        Чеки, которых нет в кэше, упаковываются по ``pack_size`` в один
+        запрос к OpenAI, так что системный промпт отправляется один раз на
+        пачку. Каждый элемент ответа проверяется validate_receipt_data;
+        неудачные чеки повторно разбираются по одному. Запросы выполняются
+        параллельно, не более ``max_concurrency`` одновременно. Локальный
+        парсер работает последовательно: он упирается в CPU, а не в сеть.
 
         Args:
-            parsed_data: Распарсенные данные чека
-            operators_list: Список операторов из базы данных
+            receipts_list: Список текстов чеков
+            max_concurrency: Лимит одновременных запросов (AI_BATCH_MAX_CONCURRENCY)
+            item_timeout: Лимит времени на один запрос в секундах (AI_BATCH_ITEM_TIMEOUT)
+            pack_size: Чеков в одном запросе, 1 отключает упаковку (AI_BATCH_PACK_SIZE)
 
         Returns:
-            Обогащенные данные с информацией об операторе
+            Список результатов парсинга в порядке batch_index
         """
-        if 'operator' not in parsed_data or not parsed_data['operator']:
-            return parsed_data
-
-        dictionary = get_operator_dictionary()
-        original_operator = str(parsed_data['operator']).strip()
-        dictionary_entry = dictionary.lookup(original_operator)
-
-        application_name: Optional[str] = None
-
-        if dictionary_entry:
-            resolved_alias = dictionary_entry['alias']
-            resolved_brand = dictionary_entry.get('operator')
-            application_name = dictionary_entry.get('application')
-            if resolved_alias != original_operator:
-                parsed_data['operator_raw'] = original_operator
-                parsed_data['operator'] = resolved_alias
-            parsed_data.setdefault('operator', resolved_alias)
-            if resolved_brand:
-                parsed_data.setdefault('operator_brand', resolved_brand)
-                parsed_data['operator_description'] = resolved_brand
-        else:
-            resolved_alias = original_operator
-            resolved_brand = None
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv('AI_BATCH_MAX_CONCURRENCY', _DEFAULT_BATCH_CONCURRENCY))
+        if item_timeout is None:
+            item_timeout = float(os.getenv('AI_BATCH_ITEM_TIMEOUT', _DEFAULT_BATCH_ITEM_TIMEOUT))
+        if pack_size is None:
+            pack_size = int(os.getenv('AI_BATCH_PACK_SIZE', _DEFAULT_BATCH_PACK_SIZE))
 
-        normalized_alias = dictionary.normalize(resolved_alias)
-        if normalized_alias:
-            parsed_data['operator_normalized'] = normalized_alias
-
-        target_normalized = normalized_alias
-
-        operator_metadata = dictionary.get_operator_metadata(resolved_brand or resolved_alias)
-        if operator_metadata:
-            display_name = operator_metadata.get('display_name') or operator_metadata.get('name')
-            if isinstance(display_name, str) and display_name.strip():
-                parsed_data.setdefault('operator_name', display_name.strip())
-            else:
-                parsed_data.setdefault('operator_name', resolved_alias)
-
-            description = operator_metadata.get('description')
-            if isinstance(description, str) and description.strip():
-                parsed_data['operator_description'] = description.strip()
-
-            category = operator_metadata.get('category')
-            if isinstance(category, str) and category.strip():
-                parsed_data.setdefault('operator_category', category.strip())
-
-            country = operator_metadata.get('country')
-            if isinstance(country, str) and country.strip():
-                parsed_data.setdefault('operator_country', country.strip())
-
-            tags = _sanitize_string_list(operator_metadata.get('tags'))
-            if tags:
-                parsed_data.setdefault('operator_tags', tags)
+        if not self.client:
+            return [
+                self._parse_batch_item(i, receipt_text, item_timeout)
+                for i, receipt_text in enumerate(receipts_list)
+            ]
 
-            if not application_name:
-                applications = operator_metadata.get('applications')
-                if isinstance(applications, list) and applications:
-                    application_candidate = applications[0]
-                    if isinstance(application_candidate, str) and application_candidate.strip():
-                        application_name = application_candidate.strip()
-        else:
-            parsed_data.setdefault('operator_name', resolved_alias)
+        results: List[Optional[Dict]] = [None] * len(receipts_list)
 
-        if application_name:
-            parsed_data.setdefault('operator_application', application_name)
-            application_metadata = dictionary.get_application_metadata(application_name)
-            brand_from_app = application_metadata.get('operator') if isinstance(application_metadata, dict) else None
-            if isinstance(brand_from_app, str) and brand_from_app.strip():
-                parsed_data.setdefault('operator_brand', brand_from_app.strip())
+        if pack_size > 1:
+            pending = []
+            for i, receipt_text in enumerate(receipts_list):
+                if not isinstance(receipt_text, str) or not receipt_text.strip():
+                    continue
+                resolved = self._get_cached(receipt_text)
+                if resolved is not None:
+                    _record_parse_path('cache')
+                else:
+                    resolved = self._parse_local_first(receipt_text)
+                    if resolved is not None:
+                        _record_parse_path('local')
+                if resolved is not None:
+                    resolved['batch_index'] = i
+                    results[i] = resolved
+                else:
+                    pending.append(i)
+
+            packs = [pending[start:start + pack_size] for start in range(0, len(pending), pack_size)]
+            outcomes = self._run_batch_tasks(
+                [
+                    partial(self._parse_pack, [(i, receipts_list[i]) for i in pack], item_timeout)
+                    for pack in packs
+                ],
+                max_concurrency,
+                item_timeout * max(map(len, packs), default=1) if item_timeout else item_timeout,
+            )
+            for outcome in outcomes:
+                for i, result in (outcome or {}).items():
+                    results[i] = result
+
+        # Anything not resolved by a pack is parsed on its own.
+        remaining = [i for i, result in enumerate(results) if result is None]
+        outcomes = self._run_batch_tasks(
+            [partial(self._parse_batch_item, i, receipts_list[i], item_timeout) for i in remaining],
+            max_concurrency,
+            item_timeout,
+        )
+        for i, outcome in zip(remaining, outcomes):
+            results[i] = outcome or {
+                'batch_index': i,
+                'error': f'Превышено время обработки чека {i}'
+            }
 
-            if isinstance(application_metadata, dict):
-                app_tags = _sanitize_string_list(application_metadata.get('tags'))
-                if app_tags:
-                    parsed_data.setdefault('operator_application_tags', app_tags)
+        return results
 
-                app_platforms = _sanitize_string_list(application_metadata.get('platforms'))
-                if app_platforms:
-                    parsed_data.setdefault('operator_application_platforms', app_platforms)
+    def _run_batch_tasks(
+        self,
+        tasks: List[Callable[[], Any]],
+        max_concurrency: int,
+        item_timeout: Optional[float],
+    ) -> List[Any]:
+        """Run tasks on a bounded pool; unfinished tasks yield None."""
+        workers = min(max(1, max_concurrency), len(tasks))
+        if workers <= 1:
+            return [task() for task in tasks]
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-parse')
+        try:
+            futures = [executor.submit(task) for task in tasks]
+            # Each request enforces item_timeout itself; this bounds the whole
+            # batch in case a worker ignores it.
+            waves = -(-len(futures) // workers)
+            wait(futures, timeout=item_timeout * waves + 1 if item_timeout else None)
+            return [future.result() if future.done() else None for future in futures]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _parse_pack(self, items: Sequence[Tuple[int, str]], item_timeout: Optional[float]) -> Dict[int, Dict]:
+        """Parse several receipts in one completion; returns only valid items."""
+        numbered = '\n\n'.join(
+            f'### {position}\n{receipt_text}' for position, (_, receipt_text) in enumerate(items)
+        )
+        # The answer grows with the pack, so the per-receipt limit is scaled too.
+        request_options = {'timeout': item_timeout * len(items)} if item_timeout else {}
 
-        normalized_operators = []
-        for operator in operators_list:
-            if isinstance(operator, dict):
-                normalized_operators.append(operator)
-            else:
-                normalized_operators.append(operator.to_dict())
-
-        # Ищем оператора в базе данных
-        matched_operator: Optional[Dict] = None
-        if target_normalized:
-            for operator in normalized_operators:
-                name = operator.get('name')
-                if not name:
-                    continue
+        try:
+            response = self._call_openai(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self.parsing_prompt + self.packing_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Распарси эти чеки ({len(items)} шт.):\n\n{numbered}"
+                    }
+                ],
+                temperature=0.1,
+                max_tokens=500 * len(items),
+                **request_options
+            )
+            payload = json.loads(response.choices[0].message.content.strip())
+        except Exception:
+            logger.warning('Pack of %d receipts failed, parsing them one by one', len(items), exc_info=True)
+            return {}
 
-                normalized_name = normalize_operator_value(name, dictionary)
-                if not normalized_name:
-                    continue
+        if isinstance(payload, dict):
+            payload = payload.get('results')
+        if not isinstance(payload, list):
+            return {}
 
-                if (
-                    normalized_name == target_normalized
-                    or normalized_name in target_normalized
-                    or target_normalized in normalized_name
-                ):
-                    matched_operator = operator
-                    break
+        parsed: Dict[int, Dict] = {}
+        for element in payload:
+            if not isinstance(element, dict):
+                continue
+            position = element.pop('index', None)
+            if not isinstance(position, int) or not 0 <= position < len(items):
+                continue
+            if 'error' in element or 'error' in self.validate_receipt_data(element):
+                continue
 
-        if matched_operator:
-            parsed_data['operator_id'] = matched_operator.get('id')
-            parsed_data['operator_name'] = matched_operator.get('name')
-            description = matched_operator.get('description', '')
-            if description:
-                parsed_data['operator_description'] = description
-            elif resolved_brand:
-                parsed_data['operator_description'] = resolved_brand
-        else:
-            if resolved_alias:
-                parsed_data.setdefault('operator_name', resolved_alias)
-            if resolved_brand:
-                parsed_data.setdefault('operator_description', resolved_brand)
+            batch_index, receipt_text = items[position]
+            if batch_index in parsed:
+                continue
+            element['raw_text'] = receipt_text
+            element['parsed_at'] = datetime.now().isoformat()
+            element['ai_model'] = self.model
+            element['parse_path'] = 'openai'
+            self._cache.set(self._cache_key(receipt_text), element)
+            _record_parse_path('openai')
+            element['batch_index'] = batch_index
+            parsed[batch_index] = element
 
-        return parsed_data
-    
-    def batch_parse_receipts(self, receipts_list: list) -> list:
-        """
-        Пакетная обработка чеков
-        
-        Args:
-            receipts_list: Список текстов чеков
-        
-        Returns:
-            Список результатов парсинга
-        """
-        results = []
-        
-        for i, receipt_text in enumerate(receipts_list):
-            try:
-                result = self.parse_receipt(receipt_text)
-                result['batch_index'] = i
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    'batch_index': i,
-                    'error': f'Ошибка при обработке чека {i}: {str(e)}'
-                })
-        
-        return results
+        return parsed
 
+    def _parse_batch_item(self, index: int, receipt_text, item_timeout: Optional[float]) -> Dict:
+        try:
+            result = self.parse_receipt(receipt_text, timeout=item_timeout or None)
+            result['batch_index'] = index
+            return result
+        except Exception as e:
+            return {
+                'batch_index': index,
+                'error': f'Ошибка при обработке чека {index}: {str(e)}'
+            }
@@ -0,0 +1,278 @@
+"""Compiled multi-pattern matcher used by the operator dictionary."""
+
+import math
+import sys
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+_NO_MATCH = -1
+
+
+class AliasMatcher:
+    """Find the highest priority pattern related to a text in a single pass.
+
+    Patterns are ranked by their position in the sequence passed to the
+    constructor (lower index wins). For a given text the matcher reproduces
+    the semantics of scanning the patterns in order and returning the first
+    one that either contains the text or is contained in it:
+
+    * an Aho-Corasick automaton finds every pattern occurring in the text;
+    * a generalized suffix automaton answers whether the text occurs inside
+      any pattern and which pattern has the best rank among those.
+
+    Both structures are walked once per lookup, so the cost depends on the
+    length of the text and not on the number of patterns. Pass
+    ``containing=False`` to skip the suffix automaton when only
+    :meth:`find_contained` is needed.
+    """
+
+    def __init__(self, patterns: Sequence[str], containing: bool = True):
+        self._size = 0
+        self._build_aho_corasick(patterns)
+        self._sam_transitions: List[Dict[str, int]] = [{}]
+        self._sam_best: List[int] = [_NO_MATCH]
+        if containing:
+            self._build_suffix_automaton(patterns)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def find(self, text: Optional[str]) -> Optional[int]:
+        """Return index of the best pattern for ``text`` or ``None``."""
+        if not text or not self._size:
+            return None
+
+        containing = self._find_containing(text)
+        if containing != _NO_MATCH:
+            # A pattern that contains the text is at least as long as any
+            # pattern contained in it, so it always takes precedence.
+            contained = self._find_contained(text)
+            if contained != _NO_MATCH and contained < containing:
+                return contained
+            return containing
+
+        contained = self._find_contained(text)
+        return contained if contained != _NO_MATCH else None
+
+    def find_contained(self, text: Optional[str]) -> Optional[int]:
+        """Return index of the best pattern occurring inside ``text``."""
+        if not text or not self._size:
+            return None
+        contained = self._find_contained(text)
+        return contained if contained != _NO_MATCH else None
+
+    # Aho-Corasick automaton: patterns contained in the text -----------------
+
+    def _build_aho_corasick(self, patterns: Sequence[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        best: List[int] = [_NO_MATCH]
+
+        for rank, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            self._size += 1
+            node = 0
+            for char in pattern:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    best.append(_NO_MATCH)
+                node = next_node
+            if best[node] == _NO_MATCH or rank < best[node]:
+                best[node] = rank
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            fail_best = best[fail[node]]
+            if fail_best != _NO_MATCH and (best[node] == _NO_MATCH or fail_best < best[node]):
+                best[node] = fail_best
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                queue.append(child)
+
+        self._ac_goto = goto
+        self._ac_fail = fail
+        self._ac_best = best
+
+    def _find_contained(self, text: str) -> int:
+        goto = self._ac_goto
+        fail = self._ac_fail
+        best = self._ac_best
+        result = _NO_MATCH
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            rank = best[node]
+            if rank != _NO_MATCH and (result == _NO_MATCH or rank < result):
+                result = rank
+                if result == 0:
+                    break
+        return result
+
+    # Generalized suffix automaton: patterns containing the text -------------
+
+    def _build_suffix_automaton(self, patterns: Sequence[str]) -> None:
+        transitions: List[Dict[str, int]] = [{}]
+        link: List[int] = [-1]
+        length: List[int] = [0]
+
+        def new_state(state_length: int, state_link: int, state_transitions: Dict[str, int]) -> int:
+            transitions.append(state_transitions)
+            link.append(state_link)
+            length.append(state_length)
+            return len(transitions) - 1
+
+        def clone_state(parent: int, target: int, char: str) -> int:
+            clone = new_state(length[parent] + 1, link[target], dict(transitions[target]))
+            while parent != -1 and transitions[parent].get(char) == target:
+                transitions[parent][char] = clone
+                parent = link[parent]
+            link[target] = clone
+            return clone
+
+        def extend(last: int, char: str) -> int:
+            existing = transitions[last].get(char)
+            if existing is not None:
+                if length[last] + 1 == length[existing]:
+                    return existing
+                return clone_state(last, existing, char)
+
+            current = new_state(length[last] + 1, 0, {})
+            parent = last
+            while parent != -1 and char not in transitions[parent]:
+                transitions[parent][char] = current
+                parent = link[parent]
+            if parent != -1:
+                target = transitions[parent][char]
+                if length[parent] + 1 == length[target]:
+                    link[current] = target
+                else:
+                    link[current] = clone_state(parent, target, char)
+            return current
+
+        for pattern in patterns:
+            last = 0
+            for char in pattern:
+                last = extend(last, char)
+
+        # Every prefix of a pattern ends in some state; the pattern contains
+        # all substrings represented by that state and its suffix-link
+        # ancestors, so the best rank is propagated up the suffix-link tree.
+        best = [_NO_MATCH] * len(transitions)
+        for rank, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                state = transitions[state][char]
+                if best[state] == _NO_MATCH or rank < best[state]:
+                    best[state] = rank
+
+        for state in sorted(range(1, len(transitions)), key=length.__getitem__, reverse=True):
+            rank = best[state]
+            parent = link[state]
+            if rank != _NO_MATCH and (best[parent] == _NO_MATCH or rank < best[parent]):
+                best[parent] = rank
+
+        self._sam_transitions = transitions
+        self._sam_best = best
+
+    def _find_containing(self, text: str) -> int:
+        transitions = self._sam_transitions
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, -1)
+            if state == -1:
+                return _NO_MATCH
+        return self._sam_best[state]
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f' {text} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted trigram index for approximate matching of normalized aliases.
+
+    Used when no alias matches exactly, e.g. for OCR typos or descriptors
+    truncated by the bank. Candidates are scored with the Dice coefficient
+    over padded character trigrams.
+
+    Posting lists are ordered by pattern trigram count. A pattern with ``p``
+    trigrams cannot reach threshold ``t`` against a text with ``q`` trigrams
+    unless ``q * t / (2 - t) <= p <= q * (2 - t) / t``, so each posting list
+    is sliced to that window with ``bisect`` before the shared trigrams are
+    counted in C via ``Counter.update``.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        sizes: List[int] = []
+        for rank, pattern in enumerate(patterns):
+            grams = _trigrams(pattern) if pattern else set()
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append((len(grams), rank))
+
+        self._postings: Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+        for gram, items in postings.items():
+            items.sort()
+            self._postings[gram] = (
+                tuple(size for size, _ in items),
+                tuple(rank for _, rank in items),
+            )
+        self._sizes = sizes
+
+    def search(self, text: Optional[str], threshold: float) -> Optional[Tuple[int, float]]:
+        """Return ``(index, score)`` of the best pattern scoring >= threshold."""
+        if not text:
+            return None
+
+        threshold = min(max(threshold, 0.0), 1.0)
+        grams = _trigrams(text)
+        query_size = len(grams)
+        if threshold > 0:
+            min_size = math.ceil(query_size * threshold / (2.0 - threshold) - 1e-9)
+            max_size = math.floor(query_size * (2.0 - threshold) / threshold + 1e-9)
+        else:
+            min_size, max_size = 0, sys.maxsize
+
+        postings = self._postings
+        counts: Counter = Counter()
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                continue
+            posting_sizes, posting_ranks = posting
+            low = bisect_left(posting_sizes, min_size)
+            high = bisect_right(posting_sizes, max_size, low)
+            if low < high:
+                counts.update(posting_ranks[low:high])
+        if not counts:
+            return None
+
+        sizes = self._sizes
+        best_rank = _NO_MATCH
+        best_score = threshold
+        for rank, shared in counts.most_common():
+            # A pattern has at least as many trigrams as it shares with the
+            # text, so no later (smaller) overlap can beat the current best.
+            if 2.0 * shared / (query_size + shared) < best_score:
+                break
+            score = 2.0 * shared / (query_size + sizes[rank])
+            if score > best_score or (score == best_score and (best_rank == _NO_MATCH or rank < best_rank)):
+                best_rank = rank
+                best_score = score
+
+        if best_rank == _NO_MATCH:
+            return None
+        return best_rank, best_score
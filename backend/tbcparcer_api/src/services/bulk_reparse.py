@@ -0,0 +1,322 @@
+"""Bulk re-derivation of operator fields for stored transactions.
+
+After a dictionary or parser rule change, historical transactions keep the
+operator, application and category they were saved with. ``BulkReparser``
+streams ``transactions`` in id order, re-parses ``raw_text`` with the local
+parser and dictionary enrichment across a process pool, and writes changed
+fields back with one batched ``UPDATE`` per chunk.
+
+Progress is checkpointed to a JSON file after every chunk, so an
+interrupted run over hundreds of thousands of rows resumes where it
+stopped. In dry-run mode nothing is written and every change is reported as
+a diff instead; dry runs do not checkpoint either, so they always start from
+the last real checkpoint and never advance it.
+
+Only values the re-parse actually derives are written: a receipt the local
+parser cannot attribute keeps its stored operator, which may have come from
+the LLM or from a manual edit.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, text
+
+from src.models.operator import Operator
+from src.models.user import db
+from src.services.ai_parser import LocalReceiptParser, enhance_with_operator_info
+from src.services.operator_dictionary import get_operator_dictionary
+from src.services.operator_matcher import CompiledOperatorMatcher, OperatorNameIndex
+
+DERIVED_FIELDS = ('operator_id', 'application', 'category')
+
+_DEFAULT_CHUNK_SIZE = 500
+_WORKER_MATCHER_CACHE_SIZE = 64
+
+# (id, user_id, raw_text, description)
+ReceiptRow = Tuple[int, int, str, Optional[str]]
+OperatorRow = Tuple[int, str, Optional[str]]
+OperatorRows = Dict[Optional[int], List[OperatorRow]]
+
+_WORKER_PARSER: Optional[LocalReceiptParser] = None
+# Global operators arrive once per worker through ``init_worker``; the index
+# and matcher built from them are shared by every user's personal layer.
+_WORKER_GLOBAL_ROWS: List[OperatorRow] = []
+_WORKER_SHARED: Optional[Tuple[Optional[str], OperatorNameIndex, CompiledOperatorMatcher]] = None
+# user_id -> (personal rows, name index, matcher), the most recent users of a worker
+_WORKER_MATCHERS: OrderedDict[int, Tuple[list, OperatorNameIndex, CompiledOperatorMatcher]] = OrderedDict()
+
+
+def derive_operator_fields(
+    parser: LocalReceiptParser,
+    raw_text: str,
+    stored_description: Optional[str],
+    name_index: OperatorNameIndex,
+    matcher: CompiledOperatorMatcher,
+) -> Dict[str, Any]:
+    """Operator id, application and category the current rules give a receipt.
+
+    Mirrors ``ReceiptPipeline``: the dictionary-normalized operator name is
+    looked up first, then operator names and keywords in the description.
+    """
+
+    enhanced = enhance_with_operator_info(parser.parse(raw_text), name_index)
+    operator_id = enhanced.get('operator_id')
+    if operator_id is None:
+        description = enhanced.get('description') or stored_description
+        if description:
+            operator_id = matcher.match(description)
+    return {
+        'operator_id': operator_id,
+        'application': enhanced.get('operator_application'),
+        'category': enhanced.get('operator_category'),
+    }
+
+
+def init_worker(global_rows: List[OperatorRow]) -> None:
+    """Process-pool initializer: keep the global operator rows for every chunk."""
+
+    global _WORKER_GLOBAL_ROWS, _WORKER_SHARED
+    _WORKER_GLOBAL_ROWS = global_rows
+    _WORKER_SHARED = None
+    _WORKER_MATCHERS.clear()
+
+
+def _worker_layers(user_id: Optional[int], user_rows: List[OperatorRow], dictionary):
+    global _WORKER_SHARED
+    checksum = dictionary.checksum()
+    if _WORKER_SHARED is None or _WORKER_SHARED[0] != checksum:
+        _WORKER_SHARED = (
+            checksum,
+            OperatorNameIndex(_WORKER_GLOBAL_ROWS, dictionary),
+            CompiledOperatorMatcher(_WORKER_GLOBAL_ROWS),
+        )
+        _WORKER_MATCHERS.clear()
+    _, shared_index, shared_matcher = _WORKER_SHARED
+    if not user_id:
+        return shared_index, shared_matcher
+
+    cached = _WORKER_MATCHERS.get(user_id)
+    if cached is None or cached[0] != user_rows:
+        cached = (
+            user_rows,
+            OperatorNameIndex(user_rows, dictionary, shared=shared_index),
+            CompiledOperatorMatcher(user_rows, shared=shared_matcher),
+        )
+    _WORKER_MATCHERS[user_id] = cached
+    _WORKER_MATCHERS.move_to_end(user_id)
+    while len(_WORKER_MATCHERS) > _WORKER_MATCHER_CACHE_SIZE:
+        _WORKER_MATCHERS.popitem(last=False)
+    return cached[1], cached[2]
+
+
+def reparse_chunk(rows: Sequence[ReceiptRow], operators: OperatorRows) -> List[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Process-pool task: ``(id, derived fields, error)`` for every row.
+
+    ``operators`` only holds the personal operators of the chunk's users;
+    global ones were handed to the worker by ``init_worker``.
+    """
+
+    global _WORKER_PARSER
+    if _WORKER_PARSER is None:
+        _WORKER_PARSER = LocalReceiptParser()
+
+    dictionary = get_operator_dictionary()
+    layers = {user_id: _worker_layers(user_id, user_rows, dictionary) for user_id, user_rows in operators.items()}
+
+    results = []
+    for transaction_id, user_id, raw_text, description in rows:
+        name_index, matcher = layers[user_id]
+        try:
+            derived = derive_operator_fields(_WORKER_PARSER, raw_text or '', description, name_index, matcher)
+        except Exception as error:  # a broken receipt must not stop the run
+            results.append((transaction_id, None, str(error)))
+        else:
+            results.append((transaction_id, derived, None))
+    return results
+
+
+@dataclass
+class ReparseReport:
+    processed: int = 0
+    changed: int = 0
+    failed: int = 0
+    last_id: int = 0
+    dry_run: bool = False
+    finished: bool = False
+
+
+class BulkReparser:
+    """Re-derive ``DERIVED_FIELDS`` for every transaction, chunk by chunk in id order.
+
+    ``workers=0`` parses on the calling thread. Up to ``2 * workers`` chunks
+    are in flight at once, so reading the next chunk overlaps with parsing;
+    results are applied in id order so the checkpoint only ever moves past
+    rows that are fully written.
+    """
+
+    def __init__(
+        self,
+        *,
+        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+        workers: Optional[int] = None,
+        dry_run: bool = False,
+        checkpoint_path: Optional[Path] = None,
+        on_diff: Optional[Callable[[Dict[str, Any]], None]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._chunk_size = max(1, chunk_size)
+        self._workers = (os.cpu_count() or 1) if workers is None else max(0, workers)
+        self._dry_run = dry_run
+        self._checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self._on_diff = on_diff
+        self._logger = logger or logging.getLogger(__name__)
+        self._operators: OperatorRows = {}
+
+    def load_checkpoint(self) -> Optional[ReparseReport]:
+        if self._checkpoint_path is None or not self._checkpoint_path.exists():
+            return None
+        with self._checkpoint_path.open(encoding='utf-8') as handle:
+            payload = json.load(handle)
+        return ReparseReport(**{key: payload[key] for key in asdict(ReparseReport()) if key in payload})
+
+    def run(self, *, resume: bool = False) -> ReparseReport:
+        report = ReparseReport(dry_run=self._dry_run)
+        if resume:
+            checkpoint = self.load_checkpoint()
+            if checkpoint is not None:
+                report = checkpoint
+                report.dry_run, report.finished = self._dry_run, False
+
+        global_rows = [tuple(row) for row in Operator.get_owned_matcher_rows(None)]
+        db.session.commit()
+        executor: Optional[Executor] = None
+        if self._workers:
+            # Callers have usually built the app already and its threads
+            # (dictionary watcher, job workers) must not be forked mid-flight.
+            executor = ProcessPoolExecutor(
+                self._workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+                initargs=(global_rows,),
+            )
+        else:
+            init_worker(global_rows)
+        pending: Deque[Tuple[List[ReceiptRow], Any]] = deque()
+        last_read = report.last_id
+        try:
+            while True:
+                while len(pending) < max(1, 2 * self._workers):
+                    chunk = self._read_chunk(last_read)
+                    if not chunk:
+                        break
+                    last_read = chunk[-1][0]
+                    operators = self._operators_for(chunk)
+                    if executor is None:
+                        pending.append((chunk, reparse_chunk(chunk, operators)))
+                    else:
+                        pending.append((chunk, executor.submit(reparse_chunk, chunk, operators)))
+                if not pending:
+                    break
+
+                chunk, outcome = pending.popleft()
+                results = outcome.result() if isinstance(outcome, Future) else outcome
+                self._apply(chunk, results, report)
+                self._save_checkpoint(report)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        report.finished = True
+        self._save_checkpoint(report)
+        return report
+
+    def _read_chunk(self, after_id: int) -> List[ReceiptRow]:
+        rows = db.session.execute(
+            text(
+                'SELECT id, user_id, raw_text, description FROM transactions '
+                'WHERE id > :after_id ORDER BY id LIMIT :limit'
+            ),
+            {'after_id': after_id, 'limit': self._chunk_size},
+        ).all()
+        db.session.commit()
+        return [tuple(row) for row in rows]
+
+    def _operators_for(self, chunk: Sequence[ReceiptRow]) -> OperatorRows:
+        # Personal operators are loaded once per user and run, matching what
+        # ReceiptPipeline would see for a new receipt of that user. They are
+        # usually a handful of rows, so shipping them with each chunk is cheap.
+        for _, user_id, _, _ in chunk:
+            if user_id not in self._operators:
+                self._operators[user_id] = (
+                    [tuple(row) for row in Operator.get_owned_matcher_rows(user_id)] if user_id else []
+                )
+        return {user_id: self._operators[user_id] for user_id in {row[1] for row in chunk}}
+
+    def _apply(self, chunk: Sequence[ReceiptRow], results, report: ReparseReport) -> None:
+        ids = [row[0] for row in chunk]
+        stored = {
+            row.id: row
+            for row in db.session.execute(
+                text('SELECT id, operator_id, application, category FROM transactions WHERE id IN :ids').bindparams(
+                    bindparam('ids', expanding=True)
+                ),
+                {'ids': ids},
+            )
+        }
+
+        updates = []
+        for transaction_id, derived, error in results:
+            report.processed += 1
+            if error is not None:
+                report.failed += 1
+                self._logger.warning('Re-parse of transaction %s failed: %s', transaction_id, error)
+                continue
+            current = stored.get(transaction_id)
+            if current is None:  # deleted while the run was in progress
+                continue
+
+            changes = {
+                field: (getattr(current, field), value)
+                for field, value in derived.items()
+                if value is not None and value != getattr(current, field)
+            }
+            if not changes:
+                continue
+            report.changed += 1
+            if self._on_diff is not None:
+                self._on_diff({'id': transaction_id, 'changes': changes})
+            values = {field: getattr(current, field) for field in DERIVED_FIELDS}
+            values.update({field: new for field, (_, new) in changes.items()})
+            updates.append({'id': transaction_id, **values})
+
+        if updates and not self._dry_run:
+            db.session.execute(
+                text(
+                    'UPDATE transactions SET operator_id = :operator_id, application = :application, '
+                    'category = :category WHERE id = :id'
+                ),
+                updates,
+            )
+        db.session.commit()
+        report.last_id = ids[-1]
+
+    def _save_checkpoint(self, report: ReparseReport) -> None:
+        if self._checkpoint_path is None or self._dry_run:
+            return
+        payload = dict(asdict(report), updated_at=datetime.utcnow().isoformat())
+        self._checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self._checkpoint_path.with_suffix(self._checkpoint_path.suffix + '.tmp')
+        with temporary.open('w', encoding='utf-8') as handle:
+            json.dump(payload, handle)
+        os.replace(temporary, self._checkpoint_path)
@@ -0,0 +1,182 @@
+"""Circuit breaker guarding calls to the OpenAI API.
+
+While OpenAI is down or very slow every parse used to spend all its retries
+before failing, tying up a worker thread each time. The breaker watches a
+sliding window of recent calls and opens when too many of them fail or are
+slow; callers then skip the API entirely (and fall back to the local
+parser) until a cool-down passes. After that a limited number of probe
+calls are let through in the half-open state: success closes the breaker,
+failure opens it again.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_DEFAULT_WINDOW_SIZE = 20
+_DEFAULT_MIN_CALLS = 5
+_DEFAULT_FAILURE_RATE = 0.5
+_DEFAULT_SLOW_CALL_SECONDS = 10.0
+_DEFAULT_SLOW_CALL_RATE = 0.5
+_DEFAULT_OPEN_SECONDS = 30.0
+_DEFAULT_HALF_OPEN_PROBES = 1
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency while its breaker is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe breaker driven by failure rate and slow-call rate."""
+
+    def __init__(
+        self,
+        *,
+        window_size: int = _DEFAULT_WINDOW_SIZE,
+        min_calls: int = _DEFAULT_MIN_CALLS,
+        failure_rate: float = _DEFAULT_FAILURE_RATE,
+        slow_call_seconds: float = _DEFAULT_SLOW_CALL_SECONDS,
+        slow_call_rate: float = _DEFAULT_SLOW_CALL_RATE,
+        open_seconds: float = _DEFAULT_OPEN_SECONDS,
+        half_open_probes: int = _DEFAULT_HALF_OPEN_PROBES,
+        clock=time.monotonic,
+    ) -> None:
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=max(1, window_size))
+        self._min_calls = max(1, min_calls)
+        self._failure_rate = failure_rate
+        self._slow_call_seconds = slow_call_seconds
+        self._slow_call_rate = slow_call_rate
+        self._open_seconds = open_seconds
+        self._half_open_probes = max(1, half_open_probes)
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at: Optional[float] = None
+        self._probes_in_flight = 0
+        self._rejected = 0
+        self._times_opened = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call may go out now; half-open admits a few probes."""
+
+        with self._lock:
+            self._advance()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_in_flight < self._half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self, duration: float) -> None:
+        self._record(failed=False, duration=duration)
+
+    def record_failure(self, duration: float, error: Optional[BaseException] = None) -> None:
+        self._record(failed=True, duration=duration, error=error)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            self._advance()
+            failures, slow, total = self._rates()
+            status: Dict[str, Any] = {
+                'state': self._state,
+                'calls': total,
+                'failure_rate': round(failures / total, 3) if total else 0.0,
+                'slow_call_rate': round(slow / total, 3) if total else 0.0,
+                'rejected': self._rejected,
+                'times_opened': self._times_opened,
+            }
+            if self._state != CLOSED and self._opened_at is not None:
+                status['retry_in_seconds'] = round(
+                    max(0.0, self._opened_at + self._open_seconds - self._clock()), 1
+                )
+            if self._last_error:
+                status['last_error'] = self._last_error
+            return status
+
+    def reset(self) -> None:
+        with self._lock:
+            self._window.clear()
+            self._state = CLOSED
+            self._opened_at = None
+            self._probes_in_flight = 0
+
+    def _record(self, *, failed: bool, duration: float, error: Optional[BaseException] = None) -> None:
+        slow = duration >= self._slow_call_seconds
+        with self._lock:
+            if error is not None:
+                self._last_error = str(error)[:200]
+
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or slow:
+                    self._trip()
+                else:
+                    self._state = CLOSED
+                    self._window.clear()
+                return
+            if self._state == OPEN:
+                # Late result of a call admitted before the breaker opened.
+                return
+
+            self._window.append((failed, slow))
+            failures, slow_calls, total = self._rates()
+            if total < self._min_calls:
+                return
+            if failures / total >= self._failure_rate or slow_calls / total >= self._slow_call_rate:
+                self._trip()
+
+    def _trip(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+        self._times_opened += 1
+        self._window.clear()
+
+    def _advance(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _rates(self) -> Tuple[int, int, int]:
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, slow in self._window if slow)
+        return failures, slow, len(self._window)
+
+
+_BREAKER_INSTANCE: Optional[CircuitBreaker] = None
+_BREAKER_LOCK = threading.Lock()
+
+
+def get_openai_breaker() -> CircuitBreaker:
+    """Process-wide breaker for OpenAI, configured from ``AI_BREAKER_*`` variables."""
+
+    global _BREAKER_INSTANCE
+    with _BREAKER_LOCK:
+        if _BREAKER_INSTANCE is None:
+            _BREAKER_INSTANCE = CircuitBreaker(
+                window_size=int(os.getenv('AI_BREAKER_WINDOW', _DEFAULT_WINDOW_SIZE)),
+                min_calls=int(os.getenv('AI_BREAKER_MIN_CALLS', _DEFAULT_MIN_CALLS)),
+                failure_rate=float(os.getenv('AI_BREAKER_FAILURE_RATE', _DEFAULT_FAILURE_RATE)),
+                slow_call_seconds=float(os.getenv('AI_BREAKER_SLOW_CALL_SECONDS', _DEFAULT_SLOW_CALL_SECONDS)),
+                slow_call_rate=float(os.getenv('AI_BREAKER_SLOW_CALL_RATE', _DEFAULT_SLOW_CALL_RATE)),
+                open_seconds=float(os.getenv('AI_BREAKER_OPEN_SECONDS', _DEFAULT_OPEN_SECONDS)),
+            )
+        return _BREAKER_INSTANCE
@@ -0,0 +1,286 @@
+"""Background workers for parse-and-save jobs.
+
+``POST /api/ai/parse-and-save`` used to hold the HTTP request open for the
+whole LLM round-trip and database write. In job mode the request only
+inserts a ``ParseJob`` row and returns its id; worker threads claim queued
+rows, run the regular ``ReceiptPipeline`` and store the outcome on the row
+for ``GET /api/ai/jobs/<id>`` to report.
+
+The queue is the ``parse_jobs`` table itself, so it needs no external
+services, survives restarts and can be shared by several worker processes:
+a job is claimed with a conditional ``UPDATE`` that only one worker can win,
+and jobs whose worker died are re-claimed once their lease expires.
+Finished jobs are purged by the workers once they are older than the
+retention period.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from flask import Flask
+from sqlalchemy import and_, or_
+
+from src.models.parse_job import (
+    FINISHED_JOB_STATUSES,
+    JOB_DUPLICATE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    ParseJob,
+)
+from src.models.user import User, db
+from src.services.receipt_pipeline import (
+    DuplicateTransactionError,
+    ReceiptPipeline,
+    ReceiptProcessingError,
+)
+
+_EXTENSION_KEY = 'parse_job_queue'
+_DEFAULT_POLL_INTERVAL = 1.0
+_DEFAULT_LEASE_SECONDS = 300
+_MAX_ATTEMPTS = 3
+_DEFAULT_RETENTION_DAYS = 7.0
+_PURGE_INTERVAL_SECONDS = 3600
+
+
+class ParseJobQueue:
+    """Database-backed job queue processed by a pool of worker threads."""
+
+    def __init__(
+        self,
+        app: Flask,
+        *,
+        workers: int = 2,
+        poll_interval: float = _DEFAULT_POLL_INTERVAL,
+        lease_seconds: float = _DEFAULT_LEASE_SECONDS,
+        retention_days: float = _DEFAULT_RETENTION_DAYS,
+        pipeline_factory: Callable[[], ReceiptPipeline] = ReceiptPipeline,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._app = app
+        self._workers = max(0, workers)
+        self._poll_interval = poll_interval
+        self._lease = timedelta(seconds=lease_seconds)
+        self._retention = timedelta(days=retention_days) if retention_days > 0 else None
+        self._next_purge = 0.0
+        self._pipeline_factory = pipeline_factory
+        self._pipeline: Optional[ReceiptPipeline] = None
+        self._logger = logger or logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._pid: Optional[int] = None
+        self._processed = 0
+
+    def submit(self, user: User, receipt_texts: Sequence[str]) -> List[ParseJob]:
+        """Queue receipts of ``user``; returns the persisted jobs in order."""
+
+        jobs = [ParseJob(user_id=user.id, receipt_text=text) for text in receipt_texts]
+        db.session.add_all(jobs)
+        db.session.commit()
+        self._wakeup.set()
+        return jobs
+
+    def run_pending(self, limit: Optional[int] = None) -> int:
+        """Process queued jobs on the calling thread; returns how many ran."""
+
+        processed = 0
+        while limit is None or processed < limit:
+            job_id = self._claim_next()
+            if job_id is None:
+                break
+            self._execute(job_id)
+            processed += 1
+        return processed
+
+    def purge_finished(self, now: Optional[datetime] = None) -> int:
+        """Delete jobs finished longer than the retention period ago; returns how many."""
+
+        if self._retention is None:
+            return 0
+        finished_before = (now or datetime.utcnow()) - self._retention
+        try:
+            purged = ParseJob.query.filter(
+                ParseJob.status.in_(FINISHED_JOB_STATUSES),
+                ParseJob.finished_at < finished_before,
+            ).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if purged:
+            self._logger.info('Purged %d finished parse jobs', purged)
+        return purged
+
+    def ensure_running(self) -> None:
+        """Start worker threads in this process if they are not running."""
+
+        if self._workers <= 0:
+            return
+        # Threads do not survive fork, so pre-forked workers start their own.
+        pid = os.getpid()
+        with self._lock:
+            if self._pid == pid and all(thread.is_alive() for thread in self._threads):
+                return
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._worker_loop, name=f'parse-job-{index}', daemon=True)
+                for index in range(self._workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._pid = pid
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._pid = None
+        for thread in threads:
+            thread.join(timeout)
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            running = sum(1 for thread in self._threads if thread.is_alive())
+            processed = self._processed
+        return {'workers': self._workers, 'running': running, 'processed': processed}
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self._app.app_context():
+                    processed = self.run_pending()
+                    if self._purge_due():
+                        self.purge_finished()
+            except Exception:  # pragma: no cover - keep the worker alive
+                self._logger.exception('Parse job worker failed')
+                processed = 0
+            if not processed:
+                self._wakeup.wait(self._poll_interval)
+                self._wakeup.clear()
+
+    def _purge_due(self) -> bool:
+        # One worker thread purges per interval.
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_purge:
+                return False
+            self._next_purge = now + _PURGE_INTERVAL_SECONDS
+            return True
+
+    def _claim_next(self) -> Optional[str]:
+        now = datetime.utcnow()
+        stale_before = now - self._lease
+        stale = and_(ParseJob.status == JOB_RUNNING, ParseJob.started_at < stale_before)
+
+        try:
+            # Jobs whose worker died too many times are not retried again.
+            ParseJob.query.filter(stale, ParseJob.attempts >= _MAX_ATTEMPTS).update(
+                {
+                    ParseJob.status: JOB_FAILED,
+                    ParseJob.error: 'Обработка прервана слишком много раз',
+                    ParseJob.finished_at: now,
+                },
+                synchronize_session=False,
+            )
+
+            claimable = or_(ParseJob.status == JOB_QUEUED, stale)
+            while True:
+                candidate = (
+                    db.session.query(ParseJob.id)
+                    .filter(claimable)
+                    .order_by(ParseJob.created_at)
+                    .limit(1)
+                    .scalar()
+                )
+                if candidate is None:
+                    db.session.commit()
+                    return None
+
+                claimed = ParseJob.query.filter(ParseJob.id == candidate, claimable).update(
+                    {
+                        ParseJob.status: JOB_RUNNING,
+                        ParseJob.started_at: now,
+                        ParseJob.attempts: ParseJob.attempts + 1,
+                    },
+                    synchronize_session=False,
+                )
+                db.session.commit()
+                if claimed:
+                    return candidate
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _execute(self, job_id: str) -> None:
+        job = db.session.get(ParseJob, job_id)
+        user = db.session.get(User, job.user_id)
+        receipt_text = job.receipt_text
+
+        outcome: Dict[str, object]
+        try:
+            transaction, enhanced_data = self._get_pipeline().parse_and_store_receipt(
+                receipt_text,
+                user.telegram_id,
+            )
+            outcome = {'status': JOB_SUCCEEDED, 'transaction_id': transaction.id, 'result': enhanced_data}
+        except DuplicateTransactionError as duplicate_error:
+            outcome = {
+                'status': JOB_DUPLICATE,
+                'transaction_id': duplicate_error.transaction.id,
+                'error': str(duplicate_error),
+            }
+        except ReceiptProcessingError as error:
+            outcome = {'status': JOB_FAILED, 'error': str(error)}
+        except Exception as error:
+            self._logger.exception('Parse job %s failed', job_id)
+            outcome = {'status': JOB_FAILED, 'error': f'Ошибка при парсинге и сохранении: {error}'}
+
+        db.session.rollback()
+        job = db.session.get(ParseJob, job_id)
+        job.finish(
+            outcome['status'],
+            transaction_id=outcome.get('transaction_id'),
+            result=outcome.get('result'),
+            error=outcome.get('error'),
+        )
+        db.session.commit()
+        with self._lock:
+            self._processed += 1
+
+    def _get_pipeline(self) -> ReceiptPipeline:
+        with self._lock:
+            if self._pipeline is None:
+                self._pipeline = self._pipeline_factory()
+            return self._pipeline
+
+
+def init_parse_job_queue(
+    app: Flask,
+    workers: int,
+    poll_interval: float = _DEFAULT_POLL_INTERVAL,
+    retention_days: float = _DEFAULT_RETENTION_DAYS,
+) -> ParseJobQueue:
+    queue = ParseJobQueue(
+        app,
+        workers=workers,
+        poll_interval=poll_interval,
+        retention_days=retention_days,
+        logger=app.logger,
+    )
+    app.extensions[_EXTENSION_KEY] = queue
+    return queue
+
+
+def get_parse_job_queue(app: Flask) -> ParseJobQueue:
+    return app.extensions[_EXTENSION_KEY]
@@ -5,7 +5,8 @@ from typing import Any, Dict, Optional, Tuple
 
 from src.models.operator import Operator
 from src.models.transaction import Transaction
-from src.models.user import User, db
+from src.models.user import User
+from src.services.operator_matcher import find_operator_id
 
 ALLOWED_OPERATION_TYPES = {'payment', 'refill', 'conversion', 'cancel'}
 ALLOWED_CURRENCIES = {'UZS', 'USD', 'EUR', 'RUB'}
@@ -111,10 +112,10 @@ def _parse_card_number(value: Any) -> Optional[str]:
     return card_number
 
 
-def _resolve_operator(value: Any, description: Optional[str], user: User) -> Optional[Operator]:
+def _resolve_operator_id(value: Any, description: Optional[str], user: User) -> Optional[int]:
     if value in (None, '', []):
         if description:
-            return Operator.find_operator_by_description(description, user.id)
+            return find_operator_id(description, user.id)
         return None
 
     try:
@@ -129,7 +130,7 @@ def _resolve_operator(value: Any, description: Optional[str], user: User) -> Opt
     if operator.user_id and operator.user_id != user.id:
         raise ManualTransactionError('Operator does not belong to user', status_code=403)
 
-    return operator
+    return operator.id
 
 
 def prepare_manual_transaction(data: Dict[str, Any]) -> ManualTransactionContext:
@@ -160,7 +161,7 @@ def prepare_manual_transaction(data: Dict[str, Any]) -> ManualTransactionContext
     currency = _parse_currency(data.get('currency'))
     balance = _parse_balance(data.get('balance'))
     card_number = _parse_card_number(data.get('card_number'))
-    operator = _resolve_operator(data.get('operator_id'), description, user)
+    operator_id = _resolve_operator_id(data.get('operator_id'), description, user)
 
     raw_text = raw_text_provided
     generated_raw_text = False
@@ -174,18 +175,6 @@ def prepare_manual_transaction(data: Dict[str, Any]) -> ManualTransactionContext
             raw_text_parts.append(description)
         raw_text = ' — '.join(raw_text_parts)
 
-    duplicate = Transaction.query.filter_by(
-        user_id=user.id,
-        raw_text=raw_text
-    ).first()
-
-    if duplicate:
-        raise ManualTransactionError(
-            'Duplicate transaction',
-            status_code=409,
-            extra={'transaction': duplicate.to_dict()}
-        )
-
     transaction_kwargs = {
         'user_id': user.id,
         'date_time': parsed_datetime,
@@ -195,7 +184,7 @@ def prepare_manual_transaction(data: Dict[str, Any]) -> ManualTransactionContext
         'card_number': card_number,
         'description': description,
         'balance': balance,
-        'operator_id': operator.id if operator else None,
+        'operator_id': operator_id,
         'raw_text': raw_text,
     }
 
@@ -210,8 +199,13 @@ def create_manual_transaction(data: Dict[str, Any]) -> Tuple[Transaction, Manual
     context = prepare_manual_transaction(data)
 
     transaction = Transaction(**context.transaction_kwargs)
-    db.session.add(transaction)
-    db.session.commit()
+    duplicate = Transaction.insert_unique(transaction)
+    if duplicate:
+        raise ManualTransactionError(
+            'Duplicate transaction',
+            status_code=409,
+            extra={'transaction': duplicate.to_dict()}
+        )
 
     return transaction, context
 
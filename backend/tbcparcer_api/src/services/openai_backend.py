@@ -0,0 +1,308 @@
+"""Asyncio OpenAI backend shared by all request threads.
+
+Flask handles every request on its own thread, and each synchronous
+``openai.OpenAI`` call used to hold that thread for the SDK default timeout
+with immediate, unjittered retries. This backend runs an ``AsyncOpenAI``
+client on one background event loop per process:
+
+* one ``httpx.AsyncClient`` pool is reused by every request (keep-alive);
+* connect and read timeouts are explicit, plus an overall per-call deadline;
+* transient failures (timeouts, connection errors, 429, 5xx) are retried
+  with full-jitter exponential backoff;
+* optional hedging (off by default) sends a second identical request when
+  the first has not answered within the observed p95 latency and keeps
+  whichever wins. Only single-receipt sized calls are hedged and timed, so
+  multi-receipt pack calls neither skew the p95 nor get duplicated.
+
+``chat.completions.create`` mirrors the synchronous SDK call, so the backend
+is a drop-in replacement for ``openai.OpenAI`` in ``AIParsingService``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+import openai
+
+_DEFAULT_CONNECT_TIMEOUT = 5.0
+_DEFAULT_READ_TIMEOUT = 30.0
+_DEFAULT_MAX_CONNECTIONS = 20
+_DEFAULT_MAX_RETRIES = 2
+_DEFAULT_BACKOFF_BASE = 0.5
+_DEFAULT_BACKOFF_CAP = 8.0
+_HEDGE_PERCENTILE = 0.95
+_HEDGE_MIN_SAMPLES = 20
+# Largest ``max_tokens`` that is hedged: the budget of one receipt parse.
+_HEDGE_MAX_TOKENS = 500
+_LATENCY_WINDOW = 200
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, base: float = _DEFAULT_BACKOFF_BASE, cap: float = _DEFAULT_BACKOFF_CAP) -> float:
+    """Full-jitter exponential backoff for the ``attempt``-th retry (0-based)."""
+
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether an OpenAI SDK error is worth retrying."""
+
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies."""
+
+    def __init__(self, window: int = _LATENCY_WINDOW) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float, min_samples: int = _HEDGE_MIN_SAMPLES) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        position = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+        return ordered[position]
+
+
+class AsyncOpenAIBackend:
+    """Pooled, hedged, backoff-retrying chat completions on a background loop."""
+
+    retries_transient_errors = True
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        *,
+        connect_timeout: float = _DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = _DEFAULT_READ_TIMEOUT,
+        max_connections: int = _DEFAULT_MAX_CONNECTIONS,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+        backoff_base: float = _DEFAULT_BACKOFF_BASE,
+        hedge: bool = False,
+        hedge_after: Optional[float] = None,
+        hedge_max_tokens: int = _HEDGE_MAX_TOKENS,
+    ) -> None:
+        self._api_key = api_key
+        self._base_url = base_url or None
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._max_connections = max(1, max_connections)
+        self._max_retries = max(0, max_retries)
+        self._backoff_base = backoff_base
+        self._hedge = hedge
+        self._hedge_after = hedge_after
+        self._hedge_max_tokens = hedge_max_tokens
+        self.latency = LatencyTracker()
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._pid: Optional[int] = None
+        self._stats = {'requests': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0, 'failures': 0}
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, *, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Blocking ``chat.completions.create`` bounded by ``timeout`` seconds overall."""
+
+        loop = self._ensure_loop()
+        budget = timeout or self._read_timeout * (self._max_retries + 1)
+        future = asyncio.run_coroutine_threadsafe(self._complete(kwargs, budget), loop)
+        try:
+            return future.result(timeout=budget + self._connect_timeout)
+        except FutureTimeoutError as error:
+            future.cancel()
+            raise openai.APITimeoutError(request=httpx.Request('POST', 'chat/completions')) from error
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['p95_ms'] = self._ms(self.latency.percentile(_HEDGE_PERCENTILE))
+        stats['hedge_after_ms'] = self._ms(self._hedge_delay())
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            loop, client = self._loop, self._client
+            self._loop = self._client = None
+            self._pid = None
+        if loop is None:
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+
+    async def _complete(self, kwargs: Dict[str, Any], budget: float) -> Any:
+        deadline = time.monotonic() + budget
+        for attempt in range(self._max_retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                return await asyncio.wait_for(self._hedged(kwargs), timeout=remaining)
+            except Exception as error:
+                if attempt == self._max_retries or not is_retryable_error(error):
+                    self._count('failures')
+                    raise
+                delay = backoff_delay(attempt, self._backoff_base)
+                if time.monotonic() + delay >= deadline:
+                    self._count('failures')
+                    raise
+                self._count('retries')
+                logger.info('OpenAI request failed (%s), retrying in %.2fs', error, delay)
+                await asyncio.sleep(delay)
+
+        self._count('failures')
+        raise openai.APITimeoutError(request=httpx.Request('POST', 'chat/completions'))
+
+    async def _hedged(self, kwargs: Dict[str, Any]) -> Any:
+        hedgeable = self._is_hedgeable(kwargs)
+        primary = asyncio.ensure_future(self._request(kwargs, record=hedgeable))
+        hedge_delay = self._hedge_delay() if hedgeable else None
+        if hedge_delay is None:
+            return await primary
+
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done:
+                return primary.result()
+
+            self._count('hedges')
+            secondary = asyncio.ensure_future(self._request(kwargs, record=True))
+            tasks.append(secondary)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary:
+                            self._count('hedge_wins')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _request(self, kwargs: Dict[str, Any], *, record: bool) -> Any:
+        self._count('requests')
+        started = time.monotonic()
+        response = await self._client.chat.completions.create(**kwargs)
+        if record:
+            self.latency.record(time.monotonic() - started)
+        return response
+
+    def _is_hedgeable(self, kwargs: Dict[str, Any]) -> bool:
+        # Latency grows with the completion budget; larger calls have their own shape.
+        max_tokens = kwargs.get('max_tokens')
+        return max_tokens is None or max_tokens <= self._hedge_max_tokens
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self._hedge:
+            return None
+        if self._hedge_after is not None:
+            return self._hedge_after
+        return self.latency.percentile(_HEDGE_PERCENTILE)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        # The loop thread does not survive fork; pre-forked workers start their own.
+        pid = os.getpid()
+        with self._lock:
+            if self._loop is not None and self._pid == pid:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='openai-backend', daemon=True)
+            thread.start()
+            self._client = asyncio.run_coroutine_threadsafe(self._build_client(), loop).result()
+            self._loop = loop
+            self._pid = pid
+            return loop
+
+    async def _build_client(self) -> openai.AsyncOpenAI:
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self._read_timeout, connect=self._connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self._max_connections,
+                max_keepalive_connections=self._max_connections,
+            ),
+        )
+        return openai.AsyncOpenAI(
+            api_key=self._api_key,
+            base_url=self._base_url,
+            max_retries=0,
+            http_client=http_client,
+        )
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    @staticmethod
+    def _ms(seconds: Optional[float]) -> Optional[float]:
+        return round(seconds * 1000, 1) if seconds is not None else None
+
+
+_BACKEND_INSTANCE: Optional[AsyncOpenAIBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_openai_backend(api_key: str, base_url: Optional[str] = None) -> AsyncOpenAIBackend:
+    """Process-wide backend configured from ``OPENAI_*`` variables.
+
+    Sharing one instance keeps a single connection pool and latency window
+    for every ``AIParsingService``.
+    """
+
+    global _BACKEND_INSTANCE
+    with _BACKEND_LOCK:
+        backend = _BACKEND_INSTANCE
+        if backend is None or backend._api_key != api_key or backend._base_url != (base_url or None):
+            hedge_after = os.getenv('OPENAI_HEDGE_AFTER')
+            backend = AsyncOpenAIBackend(
+                api_key,
+                base_url,
+                connect_timeout=float(os.getenv('OPENAI_CONNECT_TIMEOUT', _DEFAULT_CONNECT_TIMEOUT)),
+                read_timeout=float(os.getenv('OPENAI_READ_TIMEOUT', _DEFAULT_READ_TIMEOUT)),
+                max_connections=int(os.getenv('OPENAI_MAX_CONNECTIONS', _DEFAULT_MAX_CONNECTIONS)),
+                max_retries=int(os.getenv('OPENAI_MAX_RETRIES', _DEFAULT_MAX_RETRIES)),
+                hedge=os.getenv('OPENAI_HEDGING', '0') not in ('0', 'false', 'False', ''),
+                hedge_after=float(hedge_after) if hedge_after else None,
+                hedge_max_tokens=int(os.getenv('OPENAI_HEDGE_MAX_TOKENS', _HEDGE_MAX_TOKENS)),
+            )
+            if _BACKEND_INSTANCE is not None:
+                _BACKEND_INSTANCE.close()
+            _BACKEND_INSTANCE = backend
+        return backend
+
+
+def get_current_openai_backend() -> Optional[AsyncOpenAIBackend]:
+    """Backend created so far in this process, if any (for diagnostics)."""
+
+    return _BACKEND_INSTANCE
@@ -1,10 +1,18 @@
 import hashlib
 import json
+import logging
 import os
+import pickle
+import re
 import threading
+import time
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import re
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from src.services.alias_matcher import AliasMatcher, TrigramIndex
 
 _NORMALIZE_PATTERN = re.compile(r'[^A-Z0-9]+')
 
@@ -14,213 +22,425 @@ def _normalize(value: str) -> str:
     return ' '.join(normalized.split())
 
 
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+_COMPILED_FORMAT_VERSION = 2
+_COMPILED_SUFFIX = '.compiled.pickle'
+_DEFAULT_CACHE_SIZE = 4096
+_DEFAULT_FUZZY_THRESHOLD = 0.6
+
+logger = logging.getLogger(__name__)
+
+
+class LookupMemo:
+    """Bounded LRU memo of lookup and normalize results for one checksum.
+
+    Receipts repeat the same descriptors constantly, so results are cached
+    per raw candidate string. ``functools.lru_cache`` is thread-safe and
+    keeps its own hit/miss counters; a memo is discarded together with its
+    snapshot once a reload changes the dictionary checksum.
+    """
+
+    def __init__(
+        self,
+        snapshot: 'DictionarySnapshot',
+        maxsize: int,
+        fuzzy_threshold: float = _DEFAULT_FUZZY_THRESHOLD,
+    ):
+        self._entries = snapshot.entries
+        self._matcher = snapshot.matcher
+        self._fuzzy = snapshot.fuzzy
+        self._fuzzy_threshold = fuzzy_threshold
+        self.lookup = lru_cache(maxsize=maxsize)(self._lookup_uncached)
+        self.normalize = lru_cache(maxsize=maxsize)(self._normalize_uncached)
+        self.match = lru_cache(maxsize=maxsize)(self._match_uncached)
+
+    def _lookup_uncached(self, candidate: str) -> Optional[Mapping[str, str]]:
+        normalized_candidate = _normalize(candidate)
+        if not normalized_candidate:
+            return None
+        index = self._matcher.find(normalized_candidate)
+        if index is None:
+            return None
+        return self._entries[index]
+
+    def _normalize_uncached(self, candidate: str) -> str:
+        entry = self.lookup(candidate)
+        if entry:
+            return entry['normalized']
+        return _normalize(candidate)
+
+    def _match_uncached(self, candidate: str) -> Optional[Tuple[Mapping[str, str], float]]:
+        entry = self.lookup(candidate)
+        if entry:
+            return entry, 1.0
+        if self._fuzzy is None:
+            return None
+        result = self._fuzzy.search(_normalize(candidate), self._fuzzy_threshold)
+        if result is None:
+            return None
+        index, score = result
+        return self._entries[index], score
+
+    def stats(self) -> Dict[str, Dict[str, Optional[int]]]:
+        stats = {}
+        for name, cached in (('lookup', self.lookup), ('normalize', self.normalize), ('match', self.match)):
+            info = cached.cache_info()
+            stats[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'maxsize': info.maxsize,
+            }
+        return stats
+
+
+@dataclass(frozen=True)
+class DictionarySnapshot:
+    """Immutable view of a loaded dictionary published by ``reload()``.
+
+    Entries and metadata are read-only mappings shared by all readers, so
+    lookups neither lock nor copy.
+    """
+
+    entries: Tuple[Mapping[str, str], ...] = ()
+    matcher: AliasMatcher = field(default_factory=lambda: AliasMatcher([]))
+    fuzzy: Optional[TrigramIndex] = None
+    operators: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: _EMPTY_MAPPING)
+    applications: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: _EMPTY_MAPPING)
+    sources: Tuple[Mapping[str, str], ...] = ()
+    version: Optional[Any] = None
+    checksum: Optional[str] = None
+    signature: Optional[Tuple[int, int, int]] = None
+    loaded_at: Optional[float] = None
+    load_duration_ms: Optional[float] = None
+    compiled: bool = False
+    memo: Optional[LookupMemo] = None
+
+
 class OperatorDictionary:
     """Dictionary of operator aliases loaded from a JSON file."""
 
-    def __init__(self, dictionary_path: Path):
+    def __init__(
+        self,
+        dictionary_path: Path,
+        compiled_path: Optional[Path] = None,
+        cache_size: int = _DEFAULT_CACHE_SIZE,
+        fuzzy_threshold: float = _DEFAULT_FUZZY_THRESHOLD,
+    ):
         self._path = Path(dictionary_path)
-        self._lock = threading.Lock()
-        self._entries: List[Dict[str, str]] = []
-        self._operators: Dict[str, Dict[str, Any]] = {}
-        self._applications: Dict[str, Dict[str, Any]] = {}
-        self._sources: List[Dict[str, str]] = []
-        self._version: Optional[Any] = None
-        self._checksum: Optional[str] = None
+        self._compiled_path = Path(compiled_path) if compiled_path else compiled_path_for(self._path)
+        self._cache_size = cache_size
+        self._fuzzy_threshold = fuzzy_threshold
+        self._reload_lock = threading.Lock()
+        self._snapshot = DictionarySnapshot()
         self.reload()
 
-    def _load_file(self) -> Dict:
-        with self._path.open('r', encoding='utf-8') as stream:
-            return json.load(stream)
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self._path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
 
     def reload(self) -> int:
         """Reload dictionary from file and return number of entries."""
-        data = self._load_file()
-
-        raw_aliases = data.get('aliases', {})
-        raw_operator_map = data.get('operators', {})
-        raw_application_map = data.get('applications', {})
-        raw_sources = data.get('sources', [])
-
-        operator_map: Dict[str, Dict[str, Any]] = {}
-        if isinstance(raw_operator_map, dict):
-            for name, metadata in raw_operator_map.items():
-                if not isinstance(name, str):
-                    continue
-                cleaned_name = name.strip()
-                if not cleaned_name:
-                    continue
-                if isinstance(metadata, dict):
-                    operator_map[cleaned_name] = metadata.copy()
-                else:
-                    operator_map[cleaned_name] = {'display_name': str(metadata)}
-
-        application_map: Dict[str, Dict[str, Any]] = {}
-        if isinstance(raw_application_map, dict):
-            for name, metadata in raw_application_map.items():
-                if not isinstance(name, str):
-                    continue
-                cleaned_name = name.strip()
-                if not cleaned_name:
-                    continue
-                if isinstance(metadata, dict):
-                    application_map[cleaned_name] = metadata.copy()
-                else:
-                    application_map[cleaned_name] = {'name': str(metadata)}
-
-        if isinstance(raw_aliases, list):
-            items: List[Dict[str, Any]] = []
-            for item in raw_aliases:
-                if not isinstance(item, dict):
-                    continue
-                alias = item.get('alias') or item.get('pattern')
-                operator = item.get('operator') or item.get('value')
-                application = item.get('application') or item.get('app')
-                if alias and operator:
-                    entry: Dict[str, Any] = {
-                        'alias': str(alias),
-                        'operator': str(operator),
-                    }
-                    if application:
-                        entry['application'] = str(application)
-                    items.append(entry)
-        elif isinstance(raw_aliases, dict):
-            items = [
-                {
-                    'alias': str(alias),
-                    'operator': str(operator),
-                }
-                for alias, operator in raw_aliases.items()
-                if alias and operator
-            ]
-        else:
-            raise ValueError('Invalid dictionary format: "aliases" must be dict or list')
-
-        entries: List[Dict[str, str]] = []
-        for item in items:
-            cleaned_alias = item['alias'].strip()
-            cleaned_operator = item['operator'].strip()
-            if not cleaned_alias or not cleaned_operator:
-                continue
-
-            entry: Dict[str, str] = {
-                'alias': cleaned_alias,
-                'operator': cleaned_operator,
-                'normalized': _normalize(cleaned_alias),
-            }
+        with self._reload_lock:
+            started = time.perf_counter()
+            signature = self._stat_signature()
+            raw_content = self._path.read_bytes()
+            source_digest = hashlib.sha256(raw_content).hexdigest()
+
+            # The precompiled snapshot is used only while it was built from
+            # exactly these bytes; otherwise fall back to parsing the JSON.
+            parts = _load_compiled_parts(self._compiled_path, source_digest)
+            compiled = parts is not None
+            if parts is None:
+                parts = _compile_parts(json.loads(raw_content.decode('utf-8')))
+
+            snapshot = _freeze_parts(parts)
+            previous = self._snapshot
+            if previous.memo is not None and previous.checksum == snapshot.checksum:
+                memo = previous.memo
+            else:
+                memo = LookupMemo(snapshot, self._cache_size, self._fuzzy_threshold)
+            snapshot = replace(
+                snapshot,
+                memo=memo,
+                compiled=compiled,
+                signature=signature,
+                loaded_at=time.time(),
+                load_duration_ms=(time.perf_counter() - started) * 1000,
+            )
+            # Publishing is a single reference assignment, so readers observe
+            # either the previous snapshot or the new one, never a mix.
+            self._snapshot = snapshot
+        return len(snapshot.entries)
+
+    def snapshot(self) -> DictionarySnapshot:
+        """Return the currently published snapshot."""
+        return self._snapshot
+
+    def has_changed(self) -> bool:
+        """Cheaply check whether the file differs from the loaded snapshot."""
+        signature = self._stat_signature()
+        return signature is not None and signature != self._snapshot.signature
+
+    def reload_if_changed(self) -> bool:
+        """Reload only when file mtime, size or inode changed."""
+        if not self.has_changed():
+            return False
+        self.reload()
+        return True
 
-            application_value = item.get('application')
-            if application_value:
-                cleaned_application = str(application_value).strip()
-                if cleaned_application:
-                    entry['application'] = cleaned_application
-
-            entries.append(entry)
-
-        entries.sort(key=lambda entry: len(entry['normalized']), reverse=True)
-
-        sources: List[Dict[str, str]] = []
-        if isinstance(raw_sources, list):
-            for candidate in raw_sources:
-                if isinstance(candidate, dict):
-                    url = str(candidate.get('url', '')).strip()
-                    if not url:
-                        continue
-                    source_entry: Dict[str, str] = {'url': url}
-                    label = candidate.get('label')
-                    if isinstance(label, str) and label.strip():
-                        source_entry['label'] = label.strip()
-                    sources.append(source_entry)
-                elif isinstance(candidate, str):
-                    url = candidate.strip()
-                    if url:
-                        sources.append({'url': url})
-
-        serialized = json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')
-        checksum = hashlib.sha256(serialized).hexdigest()
-
-        with self._lock:
-            self._entries = entries
-            self._operators = operator_map
-            self._applications = application_map
-            self._version = data.get('version')
-            self._sources = sources
-            self._checksum = checksum
-
-        return len(entries)
-
-    def lookup(self, candidate: Optional[str]) -> Optional[Dict[str, str]]:
+    def lookup(self, candidate: Optional[str]) -> Optional[Mapping[str, str]]:
+        """Return read-only alias entry matching ``candidate``."""
         if not candidate:
             return None
-
-        normalized_candidate = _normalize(candidate)
-        if not normalized_candidate:
-            return None
-
-        with self._lock:
-            for entry in self._entries:
-                normalized_alias = entry['normalized']
-                if not normalized_alias:
-                    continue
-                if normalized_alias == normalized_candidate:
-                    return entry.copy()
-                if normalized_alias in normalized_candidate:
-                    return entry.copy()
-                if normalized_candidate in normalized_alias:
-                    return entry.copy()
-        return None
+        return self._snapshot.memo.lookup(candidate)
 
     def normalize(self, candidate: Optional[str]) -> str:
         if not candidate:
             return ''
+        return self._snapshot.memo.normalize(candidate)
 
-        entry = self.lookup(candidate)
-        if entry:
-            return entry['normalized']
+    def match(self, candidate: Optional[str]) -> Optional[Tuple[Mapping[str, str], float]]:
+        """Return ``(entry, score)`` using exact lookup, then trigram similarity.
 
-        return _normalize(candidate)
+        Exact and substring matches score ``1.0``; otherwise the best alias
+        whose trigram similarity reaches the fuzzy threshold is returned.
+        """
+        if not candidate:
+            return None
+        return self._snapshot.memo.match(candidate)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters of the memo bound to current checksum."""
+        snapshot = self._snapshot
+        stats: Dict[str, Any] = {'checksum': snapshot.checksum}
+        if snapshot.memo is not None:
+            stats.update(snapshot.memo.stats())
+        return stats
 
     def size(self) -> int:
-        with self._lock:
-            return len(self._entries)
+        return len(self._snapshot.entries)
 
     def checksum(self) -> Optional[str]:
-        with self._lock:
-            return self._checksum
+        return self._snapshot.checksum
 
     def sources(self) -> List[Dict[str, str]]:
-        with self._lock:
-            return [source.copy() for source in self._sources]
+        return [dict(source) for source in self._snapshot.sources]
 
-    def get_operator_metadata(self, name: Optional[str]) -> Dict[str, Any]:
+    def get_operator_metadata(self, name: Optional[str]) -> Mapping[str, Any]:
         if not name:
-            return {}
+            return _EMPTY_MAPPING
         key = str(name).strip()
         if not key:
-            return {}
-        with self._lock:
-            metadata = self._operators.get(key)
-            return metadata.copy() if isinstance(metadata, dict) else {}
+            return _EMPTY_MAPPING
+        return self._snapshot.operators.get(key, _EMPTY_MAPPING)
 
-    def get_application_metadata(self, name: Optional[str]) -> Dict[str, Any]:
+    def get_application_metadata(self, name: Optional[str]) -> Mapping[str, Any]:
         if not name:
-            return {}
+            return _EMPTY_MAPPING
         key = str(name).strip()
         if not key:
-            return {}
-        with self._lock:
-            metadata = self._applications.get(key)
-            return metadata.copy() if isinstance(metadata, dict) else {}
+            return _EMPTY_MAPPING
+        return self._snapshot.applications.get(key, _EMPTY_MAPPING)
 
     @property
     def version(self) -> Optional[Any]:
-        with self._lock:
-            return self._version
+        return self._snapshot.version
 
     @property
     def path(self) -> Path:
         return self._path
 
 
+def _compile_parts(data: Dict) -> Dict[str, Any]:
+    """Normalize raw dictionary JSON into picklable snapshot components."""
+    raw_aliases = data.get('aliases', {})
+    raw_operator_map = data.get('operators', {})
+    raw_application_map = data.get('applications', {})
+    raw_sources = data.get('sources', [])
+
+    operator_map: Dict[str, Dict[str, Any]] = {}
+    if isinstance(raw_operator_map, dict):
+        for name, metadata in raw_operator_map.items():
+            if not isinstance(name, str):
+                continue
+            cleaned_name = name.strip()
+            if not cleaned_name:
+                continue
+            if isinstance(metadata, dict):
+                operator_map[cleaned_name] = metadata.copy()
+            else:
+                operator_map[cleaned_name] = {'display_name': str(metadata)}
+
+    application_map: Dict[str, Dict[str, Any]] = {}
+    if isinstance(raw_application_map, dict):
+        for name, metadata in raw_application_map.items():
+            if not isinstance(name, str):
+                continue
+            cleaned_name = name.strip()
+            if not cleaned_name:
+                continue
+            if isinstance(metadata, dict):
+                application_map[cleaned_name] = metadata.copy()
+            else:
+                application_map[cleaned_name] = {'name': str(metadata)}
+
+    if isinstance(raw_aliases, list):
+        items: List[Dict[str, Any]] = []
+        for item in raw_aliases:
+            if not isinstance(item, dict):
+                continue
+            alias = item.get('alias') or item.get('pattern')
+            operator = item.get('operator') or item.get('value')
+            application = item.get('application') or item.get('app')
+            if alias and operator:
+                entry: Dict[str, Any] = {
+                    'alias': str(alias),
+                    'operator': str(operator),
+                }
+                if application:
+                    entry['application'] = str(application)
+                items.append(entry)
+    elif isinstance(raw_aliases, dict):
+        items = [
+            {
+                'alias': str(alias),
+                'operator': str(operator),
+            }
+            for alias, operator in raw_aliases.items()
+            if alias and operator
+        ]
+    else:
+        raise ValueError('Invalid dictionary format: "aliases" must be dict or list')
+
+    entries: List[Dict[str, str]] = []
+    for item in items:
+        cleaned_alias = item['alias'].strip()
+        cleaned_operator = item['operator'].strip()
+        if not cleaned_alias or not cleaned_operator:
+            continue
+
+        entry: Dict[str, str] = {
+            'alias': cleaned_alias,
+            'operator': cleaned_operator,
+            'normalized': _normalize(cleaned_alias),
+        }
+
+        application_value = item.get('application')
+        if application_value:
+            cleaned_application = str(application_value).strip()
+            if cleaned_application:
+                entry['application'] = cleaned_application
+
+        entries.append(entry)
+
+    entries.sort(key=lambda entry: len(entry['normalized']), reverse=True)
+    normalized_aliases = [entry['normalized'] for entry in entries]
+    matcher = AliasMatcher(normalized_aliases)
+    fuzzy = TrigramIndex(normalized_aliases)
+
+    sources: List[Dict[str, str]] = []
+    if isinstance(raw_sources, list):
+        for candidate in raw_sources:
+            if isinstance(candidate, dict):
+                url = str(candidate.get('url', '')).strip()
+                if not url:
+                    continue
+                source_entry: Dict[str, str] = {'url': url}
+                label = candidate.get('label')
+                if isinstance(label, str) and label.strip():
+                    source_entry['label'] = label.strip()
+                sources.append(source_entry)
+            elif isinstance(candidate, str):
+                url = candidate.strip()
+                if url:
+                    sources.append({'url': url})
+
+    serialized = json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    checksum = hashlib.sha256(serialized).hexdigest()
+
+    return {
+        'entries': entries,
+        'matcher': matcher,
+        'fuzzy': fuzzy,
+        'operators': operator_map,
+        'applications': application_map,
+        'sources': sources,
+        'version': data.get('version'),
+        'checksum': checksum,
+    }
+
+
+def _freeze_parts(parts: Dict[str, Any]) -> DictionarySnapshot:
+    return DictionarySnapshot(
+        entries=tuple(MappingProxyType(entry) for entry in parts['entries']),
+        matcher=parts['matcher'],
+        fuzzy=parts['fuzzy'],
+        operators=MappingProxyType({
+            name: MappingProxyType(metadata) for name, metadata in parts['operators'].items()
+        }),
+        applications=MappingProxyType({
+            name: MappingProxyType(metadata) for name, metadata in parts['applications'].items()
+        }),
+        sources=tuple(MappingProxyType(source) for source in parts['sources']),
+        version=parts['version'],
+        checksum=parts['checksum'],
+    )
+
+
+def compiled_path_for(dictionary_path: Path) -> Path:
+    """Default location of the precompiled snapshot next to the JSON file."""
+    dictionary_path = Path(dictionary_path)
+    return dictionary_path.with_name(dictionary_path.stem + _COMPILED_SUFFIX)
+
+
+def compile_operator_dictionary(dictionary_path: Path, output_path: Optional[Path] = None) -> Path:
+    """Build a precompiled snapshot of ``dictionary_path`` and return its path.
+
+    The file stores normalized aliases, metadata, matcher tables and the
+    checksum together with a digest of the source bytes, so workers can load
+    it without parsing the JSON as long as the source is unchanged.
+    """
+    dictionary_path = Path(dictionary_path)
+    output_path = Path(output_path) if output_path else compiled_path_for(dictionary_path)
+
+    raw_content = dictionary_path.read_bytes()
+    payload = {
+        'format': _COMPILED_FORMAT_VERSION,
+        'source_digest': hashlib.sha256(raw_content).hexdigest(),
+        'parts': _compile_parts(json.loads(raw_content.decode('utf-8'))),
+    }
+
+    temporary_path = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+    with temporary_path.open('wb') as stream:
+        pickle.dump(payload, stream, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, output_path)
+    return output_path
+
+
+def _load_compiled_parts(compiled_path: Optional[Path], source_digest: str) -> Optional[Dict[str, Any]]:
+    if compiled_path is None:
+        return None
+    try:
+        with compiled_path.open('rb') as stream:
+            payload = pickle.load(stream)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError) as error:
+        logger.warning('Ignoring unreadable compiled dictionary %s: %s', compiled_path, error)
+        return None
+
+    if not isinstance(payload, dict) or payload.get('format') != _COMPILED_FORMAT_VERSION:
+        return None
+    if payload.get('source_digest') != source_digest:
+        logger.info('Compiled dictionary %s is stale, loading JSON source', compiled_path)
+        return None
+    return payload.get('parts')
+
+
 def _default_dictionary_path() -> Path:
     module_path = Path(__file__).resolve()
     project_root = module_path.parents[4]
@@ -241,7 +461,15 @@ def get_operator_dictionary() -> OperatorDictionary:
     with _DICTIONARY_LOCK:
         if _DICTIONARY_INSTANCE is None:
             dictionary_path = Path(os.getenv('OPERATORS_DICTIONARY_PATH', _default_dictionary_path()))
-            _DICTIONARY_INSTANCE = OperatorDictionary(dictionary_path)
+            compiled_path = os.getenv('OPERATORS_DICTIONARY_COMPILED_PATH')
+            cache_size = int(os.getenv('OPERATORS_DICTIONARY_CACHE_SIZE', _DEFAULT_CACHE_SIZE))
+            fuzzy_threshold = float(os.getenv('OPERATORS_DICTIONARY_FUZZY_THRESHOLD', _DEFAULT_FUZZY_THRESHOLD))
+            _DICTIONARY_INSTANCE = OperatorDictionary(
+                dictionary_path,
+                Path(compiled_path) if compiled_path else None,
+                cache_size=cache_size,
+                fuzzy_threshold=fuzzy_threshold,
+            )
         return _DICTIONARY_INSTANCE
 
 
@@ -249,15 +477,137 @@ def reload_operator_dictionary() -> Dict[str, Any]:
     dictionary = get_operator_dictionary()
     previous_checksum = dictionary.checksum()
     entries = dictionary.reload()
-    current_checksum = dictionary.checksum()
+    snapshot = dictionary.snapshot()
     return {
         'entries': entries,
-        'changed': previous_checksum != current_checksum,
-        'checksum': current_checksum,
-        'version': dictionary.version,
+        'changed': previous_checksum != snapshot.checksum,
+        'checksum': snapshot.checksum,
+        'version': snapshot.version,
+        'duration_ms': snapshot.load_duration_ms,
     }
 
 
+class DictionaryWatcher:
+    """Background thread that hot-reloads the dictionary when its file changes.
+
+    Each poll is a single ``stat`` call; the file is parsed and a new snapshot
+    built on the watcher thread only when mtime, size or inode differ, so
+    request threads never wait for a reload. A failed reload (e.g. a file
+    caught mid-write) keeps the previous snapshot and is retried on the next
+    poll.
+    """
+
+    def __init__(
+        self,
+        dictionary: OperatorDictionary,
+        interval: float = 5.0,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self._dictionary = dictionary
+        self._interval = interval
+        self._logger = logger or logging.getLogger(__name__)
+        self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._reloads = 0
+        self._last_error: Optional[str] = None
+        self._last_checked_at: Optional[float] = None
+
+    @property
+    def dictionary(self) -> OperatorDictionary:
+        return self._dictionary
+
+    def check(self) -> bool:
+        """Poll the file once and reload it if needed."""
+        self._last_checked_at = time.time()
+        try:
+            reloaded = self._dictionary.reload_if_changed()
+        except (OSError, ValueError) as error:
+            self._last_error = str(error)
+            self._logger.warning('Operator dictionary hot reload failed: %s', error)
+            return False
+
+        if reloaded:
+            snapshot = self._dictionary.snapshot()
+            self._reloads += 1
+            self._last_error = None
+            self._logger.info(
+                'Operator dictionary hot-reloaded by watcher: %d entries in %.1f ms (checksum %s)',
+                len(snapshot.entries),
+                snapshot.load_duration_ms or 0.0,
+                snapshot.checksum,
+            )
+        return reloaded
+
+    def is_running(self) -> bool:
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and self._pid == os.getpid()
+        )
+
+    def ensure_running(self) -> None:
+        """Start the polling thread, restarting it in forked worker processes."""
+        if self.is_running():
+            return
+        with self._start_lock:
+            if self.is_running():
+                return
+            self._stop_event.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='operator-dictionary-watcher',
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            self.check()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'running': self.is_running(),
+            'interval': self._interval,
+            'reloads': self._reloads,
+            'last_error': self._last_error,
+            'last_checked_at': self._last_checked_at,
+        }
+
+
+_WATCHER_INSTANCE: Optional[DictionaryWatcher] = None
+
+
+def start_dictionary_watcher(
+    interval: float,
+    logger: Optional[logging.Logger] = None,
+) -> DictionaryWatcher:
+    """Start (or reuse) the process-wide watcher for the shared dictionary."""
+    global _WATCHER_INSTANCE
+    dictionary = get_operator_dictionary()
+    with _DICTIONARY_LOCK:
+        watcher = _WATCHER_INSTANCE
+        if watcher is None or watcher.dictionary is not dictionary:
+            if watcher is not None:
+                watcher.stop()
+            watcher = DictionaryWatcher(dictionary, interval=interval, logger=logger)
+            _WATCHER_INSTANCE = watcher
+    watcher.ensure_running()
+    return watcher
+
+
+def get_dictionary_watcher() -> Optional[DictionaryWatcher]:
+    return _WATCHER_INSTANCE
+
+
 def normalize_operator_value(value: str, dictionary: Optional[OperatorDictionary] = None) -> str:
     if dictionary is None:
         dictionary = get_operator_dictionary()
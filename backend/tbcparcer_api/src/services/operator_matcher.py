@@ -0,0 +1,310 @@
+"""Compiled matchers for resolving operators from descriptions.
+
+Global operators are compiled once and shared; each user only gets a small
+layer with their personal operators on top, kept in a bounded LRU.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+from flask import current_app
+
+from src.models.operator import Operator
+from src.services.alias_matcher import AliasMatcher
+
+OperatorRow = Tuple[int, str, Optional[str]]
+
+_EXTENSION_KEY = 'operator_matchers'
+_NAME_INDEX_EXTENSION_KEY = 'operator_name_indexes'
+_SHARED_EXTENSION_KEY = 'operator_shared_layers'
+_DEFAULT_TTL_SECONDS = 60.0
+_DEFAULT_CACHE_SIZE = 256
+
+_cache_lock = threading.Lock()
+
+_Layer = TypeVar('_Layer')
+
+
+class CompiledOperatorMatcher:
+    """Operators of one user compiled into two Aho-Corasick automatons.
+
+    Mirrors the historical two-pass search: first the earliest operator whose
+    lowercased name occurs in the text, then the earliest operator whose
+    description shares a keyword with it. Names and keywords are lowercased
+    and split once at build time, so matching walks the text once per pass.
+
+    With ``shared`` the rows are only the user's personal operators, searched
+    before the shared matcher of global operators; a global operator with the
+    same name as a personal one is skipped, as in
+    ``Operator.get_operators_for_user``.
+    """
+
+    def __init__(self, rows: Iterable[OperatorRow], shared: Optional[CompiledOperatorMatcher] = None):
+        names: List[str] = []
+        name_patterns: List[str] = []
+        name_ids: List[int] = []
+        keyword_patterns: List[str] = []
+        keyword_ids: List[int] = []
+        self._empty_name_id: Optional[int] = None
+
+        for operator_id, name, description in rows:
+            lowered_name = (name or '').lower()
+            if not lowered_name and self._empty_name_id is None:
+                # ``'' in text`` is always true, so such an operator wins
+                # every name match that comes after it.
+                self._empty_name_id = len(name_patterns)
+            names.append(name)
+            name_patterns.append(lowered_name)
+            name_ids.append(operator_id)
+
+            if description:
+                for keyword in dict.fromkeys(description.lower().split()):
+                    keyword_patterns.append(keyword)
+                    keyword_ids.append(operator_id)
+
+        self._name_patterns = tuple(name_patterns)
+        self._name_ids = tuple(name_ids)
+        self._keyword_patterns = tuple(keyword_patterns)
+        self._keyword_ids = tuple(keyword_ids)
+        self._names = AliasMatcher(name_patterns, containing=False)
+        self._keywords = AliasMatcher(keyword_patterns, containing=False)
+
+        self.shared = shared
+        self._hidden: FrozenSet[int] = frozenset()
+        if shared is not None:
+            own_names = set(names)
+            self._hidden = frozenset(
+                operator_id
+                for operator_id, name in zip(shared._name_ids, shared._raw_names)
+                if name in own_names
+            )
+        self._raw_names = tuple(names)
+
+    def match(self, description_text: Optional[str]) -> Optional[int]:
+        """Return id of the operator matching ``description_text``."""
+        if description_text is None:
+            return None
+        text = description_text.lower()
+
+        operator_id = self._find_name(text)
+        if operator_id is None and self.shared is not None:
+            operator_id = self.shared._find_name(text, self._hidden)
+        if operator_id is None:
+            operator_id = self._find_keyword(text)
+        if operator_id is None and self.shared is not None:
+            operator_id = self.shared._find_keyword(text, self._hidden)
+        return operator_id
+
+    def _find_name(self, text: str, hidden: FrozenSet[int] = frozenset()) -> Optional[int]:
+        index = self._names.find_contained(text)
+        if self._empty_name_id is not None and (index is None or self._empty_name_id < index):
+            index = self._empty_name_id
+        return self._visible(index, text, self._name_patterns, self._name_ids, hidden)
+
+    def _find_keyword(self, text: str, hidden: FrozenSet[int] = frozenset()) -> Optional[int]:
+        index = self._keywords.find_contained(text)
+        return self._visible(index, text, self._keyword_patterns, self._keyword_ids, hidden)
+
+    @staticmethod
+    def _visible(
+        index: Optional[int],
+        text: str,
+        patterns: Tuple[str, ...],
+        ids: Tuple[int, ...],
+        hidden: FrozenSet[int],
+    ) -> Optional[int]:
+        if index is None:
+            return None
+        if ids[index] not in hidden:
+            return ids[index]
+        # The earliest hit is overridden by a personal operator; rare enough
+        # to settle with a plain scan past it.
+        for position in range(index + 1, len(patterns)):
+            if ids[position] not in hidden and patterns[position] in text:
+                return ids[position]
+        return None
+
+
+class OperatorNameIndex:
+    """Operators of one user keyed by their dictionary-normalized name.
+
+    Normalizing every operator name on every receipt made enrichment
+    O(operators x aliases); here names are normalized once. Lookups are a
+    dict hit for an exact normalized name, falling back to the earliest
+    operator whose normalized name contains or is contained in the target.
+
+    With ``shared`` the operators are only the user's personal ones and
+    misses fall through to the shared index of global operators. A global
+    operator overridden by a personal one has the same normalized name, so
+    the personal one is always found first.
+    """
+
+    def __init__(self, operators: Iterable[Any], dictionary, shared: Optional[OperatorNameIndex] = None):
+        rows: List[Dict[str, Any]] = []
+        normalized_names: List[str] = []
+        by_normalized: Dict[str, Dict[str, Any]] = {}
+
+        for operator in operators:
+            if isinstance(operator, dict):
+                row = operator
+            elif isinstance(operator, tuple):
+                operator_id, name, description = operator
+                row = {'id': operator_id, 'name': name, 'description': description}
+            else:
+                row = {'id': operator.id, 'name': operator.name, 'description': operator.description}
+
+            name = row.get('name')
+            normalized_name = dictionary.normalize(name) if name else ''
+            rows.append(row)
+            normalized_names.append(normalized_name)
+            if normalized_name:
+                by_normalized.setdefault(normalized_name, row)
+
+        self._rows = tuple(rows)
+        self._by_normalized = by_normalized
+        self._matcher = AliasMatcher(normalized_names)
+
+        self.shared = shared
+        self._size = len(rows)
+        if shared is not None:
+            own_names = {row.get('name') for row in rows}
+            self._size += sum(1 for row in shared._rows if row.get('name') not in own_names)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def find(self, normalized_target: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not normalized_target:
+            return None
+        row = self._by_normalized.get(normalized_target)
+        if row is not None:
+            return row
+        index = self._matcher.find(normalized_target)
+        if index is not None:
+            return self._rows[index]
+        return self.shared.find(normalized_target) if self.shared is not None else None
+
+
+def _cache_ttl() -> float:
+    return float(current_app.config.get('OPERATOR_MATCHER_TTL', _DEFAULT_TTL_SECONDS))
+
+
+def _cache_size() -> int:
+    return int(current_app.config.get('OPERATOR_MATCHER_CACHE_SIZE', _DEFAULT_CACHE_SIZE))
+
+
+def _shared_layer(name: str, version: Hashable, build: Callable[[], _Layer]) -> _Layer:
+    """Global-operator layer ``name``, rebuilt on a new ``version`` or after the TTL."""
+    layers: Dict[str, Tuple[float, Hashable, Any]] = current_app.extensions.setdefault(_SHARED_EXTENSION_KEY, {})
+    now = time.monotonic()
+
+    cached = layers.get(name)
+    if cached is not None and cached[1] == version and now - cached[0] < _cache_ttl():
+        return cached[2]
+
+    layer = build()
+    layers[name] = (now, version, layer)
+    return layer
+
+
+def _user_layer(key: str, user_id: int, shared: Any, build: Callable[[], _Layer]) -> _Layer:
+    """Personal layer of ``user_id`` on top of ``shared``, kept in a bounded LRU.
+
+    Entries built on an older shared layer or past the TTL are rebuilt, and
+    every insert evicts expired entries and then the least recently used ones
+    beyond ``OPERATOR_MATCHER_CACHE_SIZE``.
+    """
+    ttl = _cache_ttl()
+    now = time.monotonic()
+    with _cache_lock:
+        cache: OrderedDict = current_app.extensions.setdefault(key, OrderedDict())
+        cached = cache.get(user_id)
+        if cached is not None and cached[1] is shared and now - cached[0] < ttl:
+            cache.move_to_end(user_id)
+            return cached[2]
+
+    layer = build()
+
+    with _cache_lock:
+        cache[user_id] = (now, shared, layer)
+        cache.move_to_end(user_id)
+        for expired in [cached_id for cached_id, entry in cache.items() if now - entry[0] >= ttl]:
+            del cache[expired]
+        while len(cache) > _cache_size():
+            cache.popitem(last=False)
+    return layer
+
+
+def get_operator_matcher(
+    user_id: Optional[int],
+    loader: Callable[[Optional[int]], Iterable[OperatorRow]],
+) -> CompiledOperatorMatcher:
+    """Return cached matcher for ``user_id`` (``None`` for global operators).
+
+    ``loader(user_id)`` returns only the operators owned by ``user_id``
+    (global ones for ``None``). Layers are cached per Flask application and
+    rebuilt after explicit invalidation or once ``OPERATOR_MATCHER_TTL``
+    seconds pass, which bounds staleness in other worker processes.
+    """
+    shared = _shared_layer(_EXTENSION_KEY, None, lambda: CompiledOperatorMatcher(loader(None)))
+    if user_id is None:
+        return shared
+    return _user_layer(
+        _EXTENSION_KEY, user_id, shared, lambda: CompiledOperatorMatcher(loader(user_id), shared=shared)
+    )
+
+
+def get_operator_name_index(
+    user_id: Optional[int],
+    loader: Callable[[Optional[int]], Iterable[OperatorRow]],
+    dictionary,
+) -> OperatorNameIndex:
+    """Return cached name index for ``user_id`` and the current dictionary.
+
+    ``loader`` is called as in :func:`get_operator_matcher`. The shared
+    global index is also keyed by dictionary checksum because normalized
+    names depend on the alias table; personal layers follow it.
+    """
+    shared = _shared_layer(
+        _NAME_INDEX_EXTENSION_KEY, dictionary.checksum(), lambda: OperatorNameIndex(loader(None), dictionary)
+    )
+    if user_id is None:
+        return shared
+    return _user_layer(
+        _NAME_INDEX_EXTENSION_KEY,
+        user_id,
+        shared,
+        lambda: OperatorNameIndex(loader(user_id), dictionary, shared=shared),
+    )
+
+
+def find_operator_id(description_text: Optional[str], user_id: Optional[int] = None) -> Optional[int]:
+    """Id of the operator of ``user_id`` (or a global one) found in ``description_text``."""
+    return get_operator_matcher(user_id or None, Operator.get_owned_matcher_rows).match(description_text)
+
+
+def get_user_operator_index(user_id: Optional[int], dictionary) -> OperatorNameIndex:
+    """Cached normalized-name index of operators available to ``user_id``."""
+    return get_operator_name_index(user_id or None, Operator.get_owned_matcher_rows, dictionary)
+
+
+def invalidate_operator_matchers(user_id: Optional[int] = None) -> None:
+    """Drop cached matchers and name indexes for ``user_id``.
+
+    ``None`` clears every user and the shared global layers.
+    """
+    with _cache_lock:
+        if user_id is None:
+            current_app.extensions.pop(_SHARED_EXTENSION_KEY, None)
+        for key in (_EXTENSION_KEY, _NAME_INDEX_EXTENSION_KEY):
+            cache = current_app.extensions.get(key)
+            if not cache:
+                continue
+            if user_id is None:
+                cache.clear()
+            else:
+                cache.pop(user_id, None)
@@ -0,0 +1,240 @@
+"""Persistent cache of receipt parse results.
+
+Identical receipts are parsed over and over: users preview a receipt via
+``/api/ai/parse`` before saving it, and the same bank notification is often
+forwarded by several family members. Results are keyed by a digest of the
+whitespace-normalized receipt text, the model and the prompt version, so a
+prompt or model change never serves stale output.
+
+Lookups go through an in-process LRU first and fall back to a small SQLite
+table that survives restarts and is shared between worker processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+_DEFAULT_MAX_ENTRIES = 10000
+_DEFAULT_MEMORY_ENTRIES = 1024
+# Expired rows are swept at most once per this many writes.
+_EVICT_INTERVAL = 256
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cache_key(receipt_text: str, model: str, prompt_version: str) -> str:
+    """Digest identifying a parse of ``receipt_text`` by ``model``/``prompt_version``."""
+
+    normalized = ' '.join((receipt_text or '').split())
+    payload = '\0'.join((model, prompt_version, normalized))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ParseResultCache:
+    """Two-level (memory LRU + SQLite) cache with TTL and size-bounded eviction.
+
+    ``path=None`` keeps the cache in memory only. Values are stored as JSON
+    and every hit returns a fresh dict, so callers may mutate results.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        *,
+        ttl: float = _DEFAULT_TTL_SECONDS,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        memory_entries: int = _DEFAULT_MEMORY_ENTRIES,
+    ) -> None:
+        self._path = Path(path) if path else None
+        self._ttl = float(ttl)
+        self._max_entries = max(0, int(max_entries))
+        self._memory_entries = max(0, min(int(memory_entries), self._max_entries))
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        # Upper bound on the rows in the table, kept without a COUNT(*) per write.
+        self._stored_entries = 0
+        self._writes_since_evict = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0 and self._max_entries > 0
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                expires_at, payload = cached
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._hits += 1
+                    return json.loads(payload)
+                del self._memory[key]
+
+            row = None
+            connection = self._connect()
+            if connection is not None:
+                try:
+                    row = connection.execute(
+                        'SELECT payload, expires_at FROM parse_cache WHERE key = ? AND expires_at > ?',
+                        (key, now),
+                    ).fetchone()
+                except sqlite3.Error as error:  # pragma: no cover - disk failure guard
+                    logger.warning('Parse cache read failed: %s', error)
+
+            if row is None:
+                self._misses += 1
+                return None
+
+            payload, expires_at = row
+            self._remember(key, expires_at, payload)
+            self._hits += 1
+            return json.loads(payload)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        now = time.time()
+        expires_at = now + self._ttl
+
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                with connection:
+                    connection.execute(
+                        'INSERT OR REPLACE INTO parse_cache (key, payload, created_at, expires_at) '
+                        'VALUES (?, ?, ?, ?)',
+                        (key, payload, now, expires_at),
+                    )
+                    self._stored_entries += 1
+                    self._writes_since_evict += 1
+                    if self._stored_entries > self._max_entries or self._writes_since_evict >= _EVICT_INTERVAL:
+                        self._evict(connection, now)
+            except sqlite3.Error as error:  # pragma: no cover - disk failure guard
+                logger.warning('Parse cache write failed: %s', error)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._hits = self._misses = 0
+            connection = self._connect()
+            if connection is not None:
+                with connection:
+                    connection.execute('DELETE FROM parse_cache')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'persistent': self._path is not None,
+                'hits': self._hits,
+                'misses': self._misses,
+                'memory_entries': len(self._memory),
+                'max_entries': self._max_entries,
+                'ttl_seconds': self._ttl,
+            }
+
+    def _remember(self, key: str, expires_at: float, payload: str) -> None:
+        if not self._memory_entries:
+            return
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute('DELETE FROM parse_cache WHERE expires_at <= ?', (now,))
+        (count,) = connection.execute('SELECT COUNT(*) FROM parse_cache').fetchone()
+        overflow = count - self._max_entries
+        if overflow > 0:
+            connection.execute(
+                'DELETE FROM parse_cache WHERE key IN '
+                '(SELECT key FROM parse_cache ORDER BY created_at LIMIT ?)',
+                (overflow,),
+            )
+        self._stored_entries = min(count, self._max_entries)
+        self._writes_since_evict = 0
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._path is None:
+            return None
+
+        # Connections must not cross fork boundaries in pre-forked workers.
+        pid = os.getpid()
+        if self._connection is not None and self._connection_pid == pid:
+            return self._connection
+
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self._path), timeout=5, check_same_thread=False)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS parse_cache ('
+                'key TEXT PRIMARY KEY, payload TEXT NOT NULL, '
+                'created_at REAL NOT NULL, expires_at REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS ix_parse_cache_created_at ON parse_cache (created_at)'
+            )
+            connection.commit()
+            (self._stored_entries,) = connection.execute('SELECT COUNT(*) FROM parse_cache').fetchone()
+        except sqlite3.Error as error:
+            logger.warning('Parse cache at %s is unavailable, using memory only: %s', self._path, error)
+            self._path = None
+            return None
+
+        self._connection = connection
+        self._connection_pid = pid
+        return connection
+
+
+def _default_cache_path() -> Path:
+    return Path(__file__).resolve().parents[1] / 'database' / 'parse_cache.db'
+
+
+_PARSE_CACHE_INSTANCE: Optional[ParseResultCache] = None
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def get_parse_cache() -> ParseResultCache:
+    """Process-wide cache configured from ``AI_PARSE_CACHE_*`` variables.
+
+    An empty ``AI_PARSE_CACHE_PATH`` keeps the cache in memory only and a
+    non-positive TTL or size disables it.
+    """
+
+    global _PARSE_CACHE_INSTANCE
+    with _PARSE_CACHE_LOCK:
+        if _PARSE_CACHE_INSTANCE is None:
+            path = os.getenv('AI_PARSE_CACHE_PATH', str(_default_cache_path()))
+            _PARSE_CACHE_INSTANCE = ParseResultCache(
+                Path(path) if path else None,
+                ttl=float(os.getenv('AI_PARSE_CACHE_TTL', _DEFAULT_TTL_SECONDS)),
+                max_entries=int(os.getenv('AI_PARSE_CACHE_MAX_ENTRIES', _DEFAULT_MAX_ENTRIES)),
+            )
+        return _PARSE_CACHE_INSTANCE
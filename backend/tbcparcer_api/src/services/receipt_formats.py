@@ -0,0 +1,285 @@
+"""Format-specific extractors for known receipt layouts.
+
+The generic heuristics in ``LocalReceiptParser`` have to guess which number
+is the amount and which separator is decimal. The layouts listed in
+``docs/requirements_analysis.md`` are rigid, though: every value sits in a
+fixed slot marked by an emoji or a keyword. A cheap classifier looks at the
+first line of a receipt and routes it to the matching extractor, which reads
+the slots directly. Receipts no extractor recognises, or where it cannot
+fill the required fields, go through the generic path instead.
+
+New layouts are added by subclassing :class:`ReceiptFormat` and calling
+:func:`register_receipt_format`.
+"""
+
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SLOT_CONFIDENCE = 0.95
+SHORT_YEAR_CONFIDENCE = 0.9
+
+# Headers are checked in this order, so "Отмена покупки" is a cancel.
+_OPERATION_WORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("cancel", ("отмена", "возврат", "otmena", "vozvrat", "cancel", "refund")),
+    ("conversion", ("конверсия", "konversiya", "konvertatsiya", "conversion")),
+    ("refill", ("пополнение", "зачисление", "поступление", "popolnenie", "zachislenie", "postuplenie", "refill")),
+    ("payment", ("оплата", "списание", "покупка", "oplata", "spisanie", "pokupka", "payment")),
+)
+
+_CURRENCY_ALIASES = {"сум": "UZS", "sum": "UZS", "$": "USD", "€": "EUR", "₽": "RUB", "руб": "RUB"}
+
+_MONEY_PATTERN = re.compile(r"([+-]?\d[\d\s.,']*)\s*([a-zа-я]{3}|\$|€|₽)?", re.IGNORECASE)
+_CARD_DIGITS_PATTERN = re.compile(r"(\d{4})\s*$")
+_TIME_DATE_PATTERN = re.compile(r"(\d{2}):(\d{2})(?::(\d{2}))?\s+(\d{2})[./-](\d{2})[./-](\d{4}|\d{2})\b")
+_DATE_TIME_PATTERN = re.compile(r"(\d{2})[./-](\d{2})[./-](\d{4}|\d{2})[\s,]+(\d{2}):(\d{2})(?::(\d{2}))?")
+
+
+@dataclass
+class ExtractedReceipt:
+    """Raw fields of a receipt before operator resolution.
+
+    ``operator`` is the candidate text for the operator dictionary and
+    ``lines`` are the non-empty receipt lines it may fall back to.
+    """
+
+    fields: Dict[str, Any] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+    operator: Optional[str] = None
+    lines: List[str] = field(default_factory=list)
+    receipt_format: str = "generic"
+
+    def put(self, name: str, value: Any, confidence: float = SLOT_CONFIDENCE) -> None:
+        if value is None:
+            return
+        self.fields[name] = value
+        self.confidence[name] = confidence
+
+
+def parse_money(value: str, decimal_separator: str = ".") -> Tuple[Optional[float], Optional[str]]:
+    """Amount and currency from e.g. ``"6.000.000,00 UZS"`` with ``decimal_separator=","``."""
+
+    match = _MONEY_PATTERN.search(value)
+    if not match:
+        return None, None
+
+    thousands = "," if decimal_separator == "." else "."
+    number = re.sub(r"[\s']", "", match.group(1)).replace(thousands, "")
+    number = number.replace(decimal_separator, ".")
+    try:
+        amount = abs(float(number))
+    except ValueError:
+        return None, None
+
+    currency = match.group(2)
+    if currency:
+        currency = _CURRENCY_ALIASES.get(currency.lower(), currency.upper())
+    return amount, currency
+
+
+def parse_receipt_datetime(value: str) -> Tuple[Optional[str], float]:
+    """ISO date-time from ``"18:46 04.04.2025"`` or ``"02.04.25 08:37"``."""
+
+    match = _DATE_TIME_PATTERN.search(value)
+    if match:
+        day, month, year, hour, minute, second = match.groups(default="0")
+    else:
+        match = _TIME_DATE_PATTERN.search(value)
+        if not match:
+            return None, 0.0
+        hour, minute, second, day, month, year = match.groups(default="0")
+
+    short_year = len(year) == 2
+    try:
+        parsed = datetime(
+            2000 + int(year) if short_year else int(year),
+            int(month),
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+        )
+    except ValueError:
+        return None, 0.0
+    return parsed.isoformat(), SHORT_YEAR_CONFIDENCE if short_year else SLOT_CONFIDENCE
+
+
+def detect_operation(header: str) -> Optional[str]:
+    lowered = header.lower()
+    for operation_type, words in _OPERATION_WORDS:
+        if any(word in lowered for word in words):
+            return operation_type
+    return None
+
+
+def masked_card(value: str) -> Optional[str]:
+    match = _CARD_DIGITS_PATTERN.search(value)
+    return f"*{match.group(1)}" if match else None
+
+
+class ReceiptFormat(ABC):
+    """A known receipt layout: a cheap fingerprint plus a slot extractor."""
+
+    name = "generic"
+
+    @abstractmethod
+    def matches(self, header: str, text: str) -> bool:
+        """Whether ``text`` (first non-empty line ``header``) has this layout."""
+
+    @abstractmethod
+    def extract(self, lines: Sequence[str]) -> ExtractedReceipt:
+        """Fill the slots of this layout from the receipt ``lines``."""
+
+
+class EmojiSlotFormat(ReceiptFormat):
+    """Notification bots that put every value on its own emoji-marked line.
+
+    The header names the operation; below it ➖/➕ mark the amount, 📍 the
+    merchant, 💳 the card, a clock face the date and 💰/💵 the balance.
+    """
+
+    header_markers: Tuple[str, ...] = ()
+    balance_marker = "💰"
+    decimal_separator = "."
+
+    _SLOTS = {
+        "➖": "amount",
+        "➕": "amount",
+        "📍": "merchant",
+        "💳": "card",
+        "💰": "balance",
+        "💵": "balance",
+        **{chr(code): "date_time" for code in range(0x1F550, 0x1F568)},
+    }
+
+    def matches(self, header: str, text: str) -> bool:
+        return header.startswith(self.header_markers) and self.balance_marker in text
+
+    def extract(self, lines: Sequence[str]) -> ExtractedReceipt:
+        extracted = ExtractedReceipt(lines=list(lines), receipt_format=self.name)
+        extracted.put("operation_type", detect_operation(lines[0]))
+
+        filled = set()
+        for line in lines[1:]:
+            marker, _, body = line.partition(" ")
+            slot = self._SLOTS.get(marker.rstrip("\ufe0f"))
+            body = body.strip()
+            if slot is None or slot in filled or not body:
+                continue
+            filled.add(slot)
+
+            if slot == "amount":
+                amount, currency = parse_money(body, self.decimal_separator)
+                extracted.put("amount", amount)
+                extracted.put("currency", currency)
+            elif slot == "balance":
+                extracted.put("balance", parse_money(body, self.decimal_separator)[0])
+            elif slot == "card":
+                extracted.put("card_number", masked_card(body))
+            elif slot == "date_time":
+                value, confidence = parse_receipt_datetime(body)
+                extracted.put("date_time", value, confidence)
+            else:  # merchant
+                extracted.operator = body
+                extracted.fields["description"] = body
+
+        return extracted
+
+
+class HumoFormat(EmojiSlotFormat):
+    """HUMO card bot: ``💸 Оплата`` ... ``💰 935.000,40 UZS``, time before date."""
+
+    name = "humo"
+    header_markers = ("💸",)
+    balance_marker = "💰"
+    decimal_separator = ","
+
+
+class NbuConversionFormat(EmojiSlotFormat):
+    """NBU card bot: ``💸 Конверсия`` ... ``💵 0.00 USD``."""
+
+    name = "nbu"
+    header_markers = ("💸",)
+    balance_marker = "💵"
+
+
+class CardXabarFormat(EmojiSlotFormat):
+    """CardXabar bot: ``🔴 Pokupka`` ... ``💵 2 607 792.14 UZS``."""
+
+    name = "cardxabar"
+    header_markers = ("🔴", "🟢", "🔵", "🟡")
+    balance_marker = "💵"
+
+    def matches(self, header: str, text: str) -> bool:
+        return header.startswith(self.header_markers)
+
+
+class BankTextFormat(ReceiptFormat):
+    """One-line bank SMS: ``Pokupka: <merchant> 02.04.25 08:37 karta ***0907. summa:... balans:...``."""
+
+    name = "bank_text"
+
+    _PATTERN = re.compile(
+        r"^(?P<operation>[^\W\d_]+):\s*(?P<merchant>.*?)\s*"
+        r"(?P<date_time>\d{2}\.\d{2}\.\d{2,4}\s+\d{2}:\d{2}(?::\d{2})?)\s*"
+        r"(?:karta|card|карта)\s*(?P<card>[*\d]+)\W*"
+        r"summa:\s*(?P<amount>[^,]+)"
+        r"(?:,\s*balans:\s*(?P<balance>.+?))?\s*$",
+        re.IGNORECASE,
+    )
+
+    def matches(self, header: str, text: str) -> bool:
+        return "summa:" in header.lower()
+
+    def extract(self, lines: Sequence[str]) -> ExtractedReceipt:
+        extracted = ExtractedReceipt(lines=list(lines), receipt_format=self.name)
+        match = self._PATTERN.match(lines[0])
+        if not match:
+            return extracted
+
+        extracted.put("operation_type", detect_operation(match.group("operation")))
+        amount, currency = parse_money(match.group("amount"))
+        extracted.put("amount", amount)
+        extracted.put("currency", currency)
+        if match.group("balance"):
+            extracted.put("balance", parse_money(match.group("balance"))[0])
+        extracted.put("card_number", masked_card(match.group("card")))
+        value, confidence = parse_receipt_datetime(match.group("date_time"))
+        extracted.put("date_time", value, confidence)
+
+        merchant = match.group("merchant").strip(" ,")
+        if merchant:
+            extracted.operator = merchant
+            extracted.fields["description"] = merchant
+        return extracted
+
+
+_RECEIPT_FORMATS: List[ReceiptFormat] = [
+    HumoFormat(),
+    NbuConversionFormat(),
+    CardXabarFormat(),
+    BankTextFormat(),
+]
+
+
+def register_receipt_format(receipt_format: ReceiptFormat) -> None:
+    """Add ``receipt_format`` ahead of the built-in layouts."""
+
+    _RECEIPT_FORMATS.insert(0, receipt_format)
+
+
+def classify_receipt(lines: Sequence[str]) -> Optional[ReceiptFormat]:
+    """Extractor for the layout of ``lines``, or ``None`` for the generic path."""
+
+    if not lines:
+        return None
+    header = lines[0]
+    text = "\n".join(lines)
+    for receipt_format in _RECEIPT_FORMATS:
+        if receipt_format.matches(header, text):
+            return receipt_format
+    return None
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional, Sequence, Tuple
+from typing import Dict, Optional, Tuple
 
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -12,6 +12,8 @@ from src.models.operator import Operator
 from src.models.transaction import Transaction
 from src.models.user import User, db
 from src.services.ai_parser import AIParsingService
+from src.services.operator_dictionary import get_operator_dictionary
+from src.services.operator_matcher import OperatorNameIndex, find_operator_id, get_user_operator_index
 
 
 class ReceiptProcessingError(Exception):
@@ -44,9 +46,9 @@ class ReceiptPipeline:
         """Expose underlying AI parsing service for advanced scenarios."""
         return self._parser
 
-    def get_operators_for_user(self, user: Optional[User]) -> Sequence[Operator]:
-        """Public helper that exposes available operators for a user."""
-        return self._load_operators_for_user(user)
+    def get_operator_index(self, user: Optional[User]) -> OperatorNameIndex:
+        """Cached normalized-name index of operators available to a user."""
+        return get_user_operator_index(user.id if user else None, get_operator_dictionary())
 
     def parse_receipt(
         self,
@@ -69,8 +71,8 @@ class ReceiptPipeline:
             raise ReceiptProcessingError(parsed_data['error'], status_code=400)
 
         user = self._resolve_user(telegram_id)
-        operators = self._load_operators_for_user(user)
-        enhanced_data = self._parser.enhance_with_operator_info(parsed_data, operators)
+        operator_index = self.get_operator_index(user)
+        enhanced_data = self._parser.enhance_with_operator_info(parsed_data, operator_index)
 
         return enhanced_data, user
 
@@ -84,10 +86,9 @@ class ReceiptPipeline:
 
         user = User.get_or_create_user(telegram_id, username)
 
-        existing = Transaction.query.filter_by(
-            user_id=user.id,
-            raw_text=receipt_text,
-        ).first()
+        # Cheap indexed probe that spares the parser; the unique index on
+        # (user_id, raw_text_digest) remains the authority on insert.
+        existing = Transaction.find_duplicate(user.id, receipt_text)
         if existing:
             raise DuplicateTransactionError(existing)
 
@@ -114,17 +115,20 @@ class ReceiptPipeline:
             description=enhanced_data.get('description'),
             balance=balance,
             operator_id=operator_id,
+            application=enhanced_data.get('operator_application'),
+            category=enhanced_data.get('operator_category'),
             raw_text=receipt_text,
         )
 
         try:
-            db.session.add(transaction)
-            db.session.commit()
+            existing = Transaction.insert_unique(transaction)
         except SQLAlchemyError as exc:  # pragma: no cover - defensive
             db.session.rollback()
             raise ReceiptProcessingError(
                 f'Не удалось сохранить транзакцию: {exc}'
             ) from exc
+        if existing:
+            raise DuplicateTransactionError(existing)
 
         return transaction, enhanced_data
 
@@ -136,11 +140,6 @@ class ReceiptPipeline:
         except (TypeError, ValueError):
             raise ReceiptProcessingError('Некорректный telegram_id', status_code=400)
 
-    def _load_operators_for_user(self, user: Optional[User]) -> Sequence[Operator]:
-        if user:
-            return Operator.get_operators_for_user(user.id)
-        return Operator.get_global_operators()
-
     def _resolve_operator_id(self, parsed_data: Dict, user_id: int) -> Optional[int]:
         operator_id_value = parsed_data.get('operator_id')
         if operator_id_value not in (None, '', []):
@@ -158,9 +157,7 @@ class ReceiptPipeline:
 
         description = parsed_data.get('description')
         if description:
-            operator = Operator.find_operator_by_description(description, user_id)
-            if operator:
-                return operator.id
+            return find_operator_id(description, user_id)
         return None
 
     def _parse_datetime(self, value: Optional[str]) -> Optional[datetime]:
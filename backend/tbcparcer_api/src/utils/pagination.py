@@ -0,0 +1,26 @@
+"""Opaque cursors for keyset pagination."""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(date_time: datetime, row_id: int) -> str:
+    """Cursor pointing just past the row ``(date_time, row_id)``."""
+
+    payload = json.dumps([date_time.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of :func:`encode_cursor`; raises ``ValueError`` for malformed input."""
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_time, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(date_time), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError('Malformed cursor') from exc
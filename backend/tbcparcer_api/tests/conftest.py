@@ -0,0 +1,76 @@
+"""Database selection for the test suite.
+
+Tests run against throwaway SQLite files by default. To run them against
+PostgreSQL, point ``TEST_DATABASE_URL`` at an empty database you can drop
+tables in, or set ``TEST_DATABASE_URL=testing.postgresql`` to start a
+temporary server with the optional ``testing.postgresql`` package. Tests
+that exercise SQLite-specific behaviour are marked ``sqlite_only`` and are
+skipped on PostgreSQL. The shared parse cache is kept in memory so tests
+never write next to the sources.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+_STAND_IN = 'testing.postgresql'
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'sqlite_only: relies on SQLite files, pragmas or query plans')
+
+
+@pytest.fixture(autouse=True)
+def _memory_parse_cache(monkeypatch):
+    """Keep the process-wide parse cache in memory and fresh for every test."""
+
+    from src.services import parse_cache
+
+    monkeypatch.setenv('AI_PARSE_CACHE_PATH', '')
+    monkeypatch.setattr(parse_cache, '_PARSE_CACHE_INSTANCE', None)
+
+
+@pytest.fixture(scope='session')
+def _postgres_url():
+    url = os.getenv('TEST_DATABASE_URL')
+    if url != _STAND_IN:
+        yield url
+        return
+
+    testing_postgresql = pytest.importorskip('testing.postgresql')
+    with testing_postgresql.Postgresql() as server:
+        yield server.url()
+
+
+def pytest_collection_modifyitems(config, items):
+    if not os.getenv('TEST_DATABASE_URL'):
+        return
+    skip = pytest.mark.skip(reason='SQLite-specific test; TEST_DATABASE_URL selects another database')
+    for item in items:
+        if 'sqlite_only' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture()
+def database_uri(tmp_path, _postgres_url):
+    """``database_uri(name)``: SQLAlchemy URI of an empty database for one test.
+
+    PostgreSQL databases are shared between tests, so every table is dropped
+    again when the test finishes.
+    """
+
+    if not _postgres_url:
+        yield lambda name: f'sqlite:///{tmp_path / name}'
+        return
+
+    yield lambda name: _postgres_url
+
+    from src.models.postgres_profile import normalize_database_uri
+    from src.models.user import db
+
+    engine = create_engine(normalize_database_uri(_postgres_url))
+    try:
+        db.metadata.drop_all(engine)
+    finally:
+        engine.dispose()
@@ -0,0 +1,137 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.services.alias_matcher import AliasMatcher, TrigramIndex, _trigrams
+from src.services.operator_dictionary import _normalize
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+
+def _linear_find(patterns, text):
+    """Reference implementation mirroring the original linear alias scan."""
+    for index, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        if pattern == text or pattern in text or text in pattern:
+            return index
+    return None
+
+
+def _load_patterns():
+    data = json.loads(DICTIONARY_PATH.read_text(encoding='utf-8'))
+    patterns = [_normalize(item['alias']) for item in data['aliases']]
+    patterns.sort(key=len, reverse=True)
+    return patterns
+
+
+def test_matcher_prefers_longest_contained_alias():
+    patterns = ['UPAY P2P UZ', 'UPAY P2P', 'P2P']
+    matcher = AliasMatcher(patterns)
+
+    assert matcher.find('UPAY P2P UZ 4411') == 0
+    assert matcher.find('DAVR UPAY P2P') == 1
+    assert matcher.find('HUMO P2P') == 2
+    assert matcher.find('PAYME') is None
+
+
+def test_matcher_resolves_text_contained_in_alias():
+    patterns = ['TENGE 24 P2P UZCARD HUMO UZ', 'TENGE 24 P2P UZCARD UZCARD UZ']
+    matcher = AliasMatcher(patterns)
+
+    assert matcher.find('UZCARD UZCARD') == 1
+    assert matcher.find('TENGE 24') == 0
+
+
+def test_matcher_skips_empty_patterns():
+    matcher = AliasMatcher(['', 'UPAY'])
+
+    assert len(matcher) == 1
+    assert matcher.find('UPAY P2P') == 1
+    assert matcher.find('') is None
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matcher_agrees_with_linear_scan_on_random_patterns(seed):
+    rng = random.Random(seed)
+    alphabet = 'AB C1'
+    for _ in range(50):
+        patterns = [
+            ' '.join(''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 6))).split())
+            for _ in range(rng.randint(1, 12))
+        ]
+        patterns.sort(key=len, reverse=True)
+        matcher = AliasMatcher(patterns)
+        for _ in range(30):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 10)))
+            assert matcher.find(text) == _linear_find(patterns, text)
+
+
+def test_matcher_agrees_with_linear_scan_on_dictionary_aliases():
+    patterns = _load_patterns()
+    matcher = AliasMatcher(patterns)
+
+    candidates = list(patterns)
+    candidates += [pattern[: len(pattern) // 2] for pattern in patterns]
+    candidates += [f'POKUPKA {pattern} SUMMA 100' for pattern in patterns]
+    candidates += ['UZCARD', 'HUMO', 'P2P', 'UNKNOWN PROVIDER']
+
+    for candidate in candidates:
+        assert matcher.find(candidate) == _linear_find(patterns, candidate), candidate
+
+
+def _linear_best_similarity(patterns, text, threshold):
+    query = _trigrams(text)
+    best = None
+    for index, pattern in enumerate(patterns):
+        grams = _trigrams(pattern) if pattern else set()
+        score = 2.0 * len(query & grams) / (len(query) + len(grams))
+        if score > 0 and (best is None or score > best[1]):
+            best = (index, score)
+    if best is None or best[1] < threshold:
+        return None
+    return best
+
+
+def test_trigram_index_resolves_typos_and_truncations():
+    patterns = _load_patterns()
+    index = TrigramIndex(patterns)
+
+    typo = index.search('UPAI P2P UZ', 0.6)
+    assert typo is not None
+    assert patterns[typo[0]] == 'UPAY P2P UZ'
+    assert 0.6 <= typo[1] < 1.0
+
+    truncated = index.search('DAVR UPAY HUMANS UZCARD2H', 0.6)
+    assert truncated is not None
+    assert patterns[truncated[0]] == 'DAVR UPAY HUMANS UZCARD2HU UZ'
+
+    assert index.search('120 000 UZS', 0.6) is None
+
+
+@pytest.mark.parametrize('threshold', [0.3, 0.6, 0.8])
+def test_trigram_index_agrees_with_exhaustive_scoring(threshold):
+    patterns = _load_patterns()
+    index = TrigramIndex(patterns)
+    rng = random.Random(7)
+
+    for _ in range(200):
+        characters = list(rng.choice(patterns))
+        for _ in range(rng.randint(0, 3)):
+            characters[rng.randrange(len(characters))] = rng.choice('AXZ0 ')
+        text = ''.join(characters)[: rng.randint(4, len(characters))]
+
+        result = index.search(text, threshold)
+        expected = _linear_best_similarity(patterns, text, threshold)
+        if expected is None:
+            assert result is None, text
+        else:
+            assert result is not None, text
+            assert result[1] == pytest.approx(expected[1]), text
@@ -0,0 +1,204 @@
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.services.ai_parser import AIParsingService
+from src.services.parse_cache import ParseResultCache
+
+
+class _SlowCompletions:
+    """Echo the receipt amount back after a delay, tracking concurrency."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def create(self, messages, **kwargs):
+        receipt = messages[-1]['content'].rsplit('\n', 1)[-1]
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays.get(receipt, 0.2))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        payload = {
+            'date_time': '2025-04-04 18:46:00',
+            'operation_type': 'payment',
+            'amount': float(receipt.split()[-1]),
+            'currency': 'UZS',
+        }
+        message = SimpleNamespace(content=json.dumps(payload))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _service(monkeypatch, delays=None):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    completions = _SlowCompletions(delays or {})
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    service = AIParsingService(client=client, cache=ParseResultCache(None))
+    return service, completions
+
+
+def test_batch_runs_concurrently_and_keeps_order(monkeypatch):
+    service, completions = _service(monkeypatch)
+    receipts = [f'Summa {index}' for index in range(1, 13)]
+
+    started = time.monotonic()
+    results = service.batch_parse_receipts(receipts, max_concurrency=4, item_timeout=5, pack_size=1)
+    elapsed = time.monotonic() - started
+
+    assert [result['batch_index'] for result in results] == list(range(12))
+    assert [result['amount'] for result in results] == [float(index) for index in range(1, 13)]
+    assert completions.max_in_flight == 4
+    assert elapsed < 12 * 0.2 / 2
+
+
+def test_batch_reports_timeout_for_slow_item(monkeypatch):
+    service, _ = _service(monkeypatch, delays={'Summa 2': 3.0})
+
+    results = service.batch_parse_receipts(
+        ['Summa 1', 'Summa 2', 'Summa 3'],
+        max_concurrency=3,
+        item_timeout=0.5,
+        pack_size=1,
+    )
+
+    assert results[0]['amount'] == 1.0
+    assert 'error' in results[1] and results[1]['batch_index'] == 1
+    assert results[2]['amount'] == 3.0
+
+
+class _BrokenPackCompletions(_SlowCompletions):
+    """Fails every packed request; single receipts are answered as usual."""
+
+    def __init__(self):
+        super().__init__({})
+        self.pack_timeouts = []
+
+    def create(self, messages, **kwargs):
+        if '### ' in messages[-1]['content']:
+            self.pack_timeouts.append(kwargs.get('timeout'))
+            raise ValueError('malformed pack response')
+        return super().create(messages, **kwargs)
+
+
+def test_failed_pack_is_logged_and_falls_back_to_single_requests(monkeypatch, caplog):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    completions = _BrokenPackCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    service = AIParsingService(client=client, cache=ParseResultCache(None), local_confidence_threshold=2.0)
+
+    with caplog.at_level('WARNING', logger='src.services.ai_parser'):
+        results = service.batch_parse_receipts(
+            ['Summa 1', 'Summa 2', 'Summa 3'], max_concurrency=1, item_timeout=2, pack_size=3
+        )
+
+    assert [result['amount'] for result in results] == [1.0, 2.0, 3.0]
+    assert completions.pack_timeouts == [6]
+    assert 'Pack of 3 receipts failed' in caplog.text
+
+
+def _receipt_payload(receipt):
+    return {
+        'date_time': '2025-04-04 18:46:00',
+        'operation_type': 'payment',
+        'amount': float(receipt.split()[-1]),
+        'currency': 'UZS',
+    }
+
+
+class _StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Minimal /chat/completions endpoint; packed items named BROKEN fail."""
+
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        system, user = (message['content'] for message in body['messages'])
+        type(self).requests.append(body)
+
+        if '"results"' in system:
+            items = re.findall(r'### (\d+)\n(.*)', user)
+            content = {
+                'results': [
+                    {'index': int(position), 'date_time': None}
+                    if 'BROKEN' in receipt
+                    else {'index': int(position), **_receipt_payload(receipt)}
+                    for position, receipt in items
+                ]
+            }
+        else:
+            content = _receipt_payload(user.rsplit('\n', 1)[-1])
+
+        response = json.dumps(
+            {
+                'id': 'stub',
+                'object': 'chat.completion',
+                'created': 0,
+                'model': body['model'],
+                'choices': [
+                    {
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': json.dumps(content)},
+                        'finish_reason': 'stop',
+                    }
+                ],
+            }
+        ).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def openai_stub(monkeypatch):
+    _StubOpenAIHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubOpenAIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_API_BASE', f'http://127.0.0.1:{server.server_port}/v1')
+    yield _StubOpenAIHandler.requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_packed_batch_sends_one_request_and_retries_failed_items(openai_stub):
+    cache = ParseResultCache(None)
+    service = AIParsingService(cache=cache)
+    service.parse_receipt('Summa 9')
+    openai_stub.clear()
+
+    receipts = ['Summa 1', 'Summa 2', 'BROKEN Summa 3', 'Summa 4', 'Summa 9']
+    results = service.batch_parse_receipts(receipts, max_concurrency=4, item_timeout=5, pack_size=10)
+
+    assert [result['batch_index'] for result in results] == list(range(5))
+    assert [result['amount'] for result in results] == [1.0, 2.0, 3.0, 4.0, 9.0]
+    assert results[4]['cache_hit'] is True
+
+    packed, retried = openai_stub
+    assert len(openai_stub) == 2
+    assert packed['messages'][1]['content'].count('### ') == 4
+    assert 'BROKEN' in retried['messages'][1]['content']
+    assert '### ' not in retried['messages'][1]['content']
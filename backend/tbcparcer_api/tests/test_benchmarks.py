@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from benchmarks.receipt_corpus import (
+    RECEIPT_FORMATS,
+    build_dictionary_payload,
+    generate_receipts,
+    load_dictionary_payload,
+)
+from benchmarks.suite import BenchmarkResult, find_regressions, run_suite
+from src.services import operator_dictionary as dictionary_module
+from src.services.ai_parser import LocalReceiptParser
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+EXPECTED_LAYOUTS = {
+    'humo': 'humo',
+    'bank_text': 'bank_text',
+    'cardxabar': 'cardxabar',
+    'nbu_conversion': 'nbu',
+    'labelled': 'generic',
+}
+
+
+@pytest.fixture(autouse=True)
+def dictionary(monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    dictionary_module._DICTIONARY_INSTANCE = None
+    yield
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+
+def test_corpus_covers_every_format_and_alias():
+    aliases = [entry['alias'] for entry in load_dictionary_payload(DICTIONARY_PATH)['aliases']]
+    receipts = list(generate_receipts(aliases, 2 * len(aliases)))
+
+    assert {receipt['alias'] for receipt in receipts} >= set(aliases)
+    assert {receipt['format'] for receipt in receipts} == set(RECEIPT_FORMATS)
+
+    parser = LocalReceiptParser()
+    for receipt in receipts[: 4 * len(RECEIPT_FORMATS)]:
+        result = parser.parse(receipt['text'])
+        assert result['receipt_format'] == EXPECTED_LAYOUTS[receipt['format']]
+        assert result['amount'] and result['date_time'] and result['card_number']
+
+
+def test_dictionary_payload_is_padded_to_size():
+    base = load_dictionary_payload(DICTIONARY_PATH)
+
+    assert len(build_dictionary_payload(base, 10)['aliases']) == 10
+    padded = build_dictionary_payload(base, 1_000)['aliases']
+    assert len(padded) == 1_000
+    assert len({entry['alias'] for entry in padded}) == 1_000
+
+
+def test_suite_reports_every_stage_and_flags_regressions():
+    results = run_suite(load_dictionary_payload(DICTIONARY_PATH), sizes=(100,), receipts=20)
+
+    assert [result.key for result in results] == ['parse@100', 'lookup@100', 'enrich@100']
+    assert all(result.ops_per_sec > 0 and result.p99_us >= result.p50_us for result in results)
+
+    baseline = {result.key: result for result in results}
+    assert find_regressions(results, baseline) == []
+
+    slower = [
+        BenchmarkResult(**dict(vars(result), p50_us=result.p50_us * 2, ops_per_sec=result.ops_per_sec / 2))
+        for result in results
+    ]
+    regressions = find_regressions(slower, baseline, threshold=0.5)
+    assert {(regression.key, regression.metric) for regression in regressions} == {
+        (key, metric) for key in baseline for metric in ('p50_us', 'ops_per_sec')
+    }
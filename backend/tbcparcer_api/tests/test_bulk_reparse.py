@@ -0,0 +1,177 @@
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.operator import Operator
+from src.models.transaction import Transaction
+from src.models.user import User, db
+from src.services import operator_dictionary as dictionary_module
+from src.services import bulk_reparse
+from src.services.bulk_reparse import BulkReparser
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+HUMO_TEMPLATE = (
+    "💸 Оплата\n➖ {amount},00 UZS\n📍 PAYME P2P, UZ\n"
+    "💳 HUMOCARD *6714\n🕓 18:46 04.04.2025\n💰 935.000,40 UZS"
+)
+
+
+@pytest.fixture()
+def app(database_uri, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+    app = create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_uri('reparse.db'),
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+
+def _seed(app, count):
+    with app.app_context():
+        user = User.get_or_create_user(4242, 'reparse')
+        for index in range(count):
+            db.session.add(
+                Transaction(
+                    user_id=user.id,
+                    date_time=datetime(2025, 4, 4, 18, 46),
+                    operation_type='payment',
+                    amount=1000 + index,
+                    currency='UZS',
+                    raw_text=HUMO_TEMPLATE.format(amount=1000 + index),
+                )
+            )
+        # A receipt the local parser cannot attribute keeps its operator.
+        manual = Operator.query.filter_by(name='UPAY P2P', user_id=None).first()
+        db.session.add(
+            Transaction(
+                user_id=user.id,
+                date_time=datetime(2025, 4, 4, 18, 46),
+                operation_type='payment',
+                amount=1,
+                currency='UZS',
+                operator_id=manual.id,
+                raw_text='Перевод другу',
+            )
+        )
+        db.session.commit()
+        payme = Operator.query.filter_by(name='PAYME P2P, UZ', user_id=None).first()
+        return payme.id, manual.id
+
+
+def _operator_fields(app):
+    with app.app_context():
+        return [
+            (row.operator_id, row.application, row.category)
+            for row in Transaction.query.order_by(Transaction.id)
+        ]
+
+
+def test_dry_run_reports_diff_without_writing(app, tmp_path):
+    payme_id, _ = _seed(app, 3)
+    before = _operator_fields(app)
+    diffs = []
+
+    reparser = BulkReparser(
+        chunk_size=2,
+        workers=0,
+        dry_run=True,
+        checkpoint_path=tmp_path / 'checkpoint.json',
+        on_diff=diffs.append,
+    )
+    with app.app_context():
+        report = reparser.run()
+
+    assert report.processed == 4
+    assert report.changed == 3
+    assert _operator_fields(app) == before
+    assert not (tmp_path / 'checkpoint.json').exists()
+    assert diffs[0]['changes'] == {
+        'operator_id': (None, payme_id),
+        'application': (None, 'Payme'),
+        'category': (None, 'payment_service'),
+    }
+
+
+def test_interrupted_run_resumes_from_checkpoint(app, tmp_path, monkeypatch):
+    payme_id, manual_id = _seed(app, 5)
+    checkpoint = tmp_path / 'checkpoint.json'
+
+    original_apply = BulkReparser._apply
+    applied = []
+
+    def _failing_apply(self, chunk, results, report):
+        if len(applied) == 2:
+            raise RuntimeError('worker killed')
+        applied.append(chunk)
+        original_apply(self, chunk, results, report)
+
+    monkeypatch.setattr(BulkReparser, '_apply', _failing_apply)
+    with app.app_context(), pytest.raises(RuntimeError):
+        BulkReparser(chunk_size=2, workers=0, checkpoint_path=checkpoint).run()
+
+    saved = json.loads(checkpoint.read_text())
+    assert saved['processed'] == 4
+    assert saved['finished'] is False
+
+    monkeypatch.setattr(BulkReparser, '_apply', original_apply)
+    with app.app_context():
+        report = BulkReparser(chunk_size=2, workers=0, checkpoint_path=checkpoint).run(resume=True)
+
+    assert report.processed == 6
+    assert report.finished is True
+    fields = _operator_fields(app)
+    assert fields[:5] == [(payme_id, 'Payme', 'payment_service')] * 5
+    assert fields[5] == (manual_id, None, None)
+
+
+def test_process_pool_updates_in_batches(app, tmp_path):
+    payme_id, _ = _seed(app, 6)
+
+    with app.app_context():
+        report = BulkReparser(chunk_size=2, workers=2, checkpoint_path=tmp_path / 'checkpoint.json').run()
+
+    assert report.processed == 7
+    assert report.changed == 6
+    assert report.failed == 0
+    assert [fields[0] for fields in _operator_fields(app)[:6]] == [payme_id] * 6
+
+
+def test_worker_keeps_only_recent_personal_layers(app, monkeypatch):
+    monkeypatch.setattr(bulk_reparse, '_WORKER_MATCHER_CACHE_SIZE', 2)
+    raw_text = HUMO_TEMPLATE.format(amount=1000)
+
+    with app.app_context():
+        global_rows = [tuple(row) for row in Operator.get_owned_matcher_rows(None)]
+        payme_id = Operator.query.filter_by(name='PAYME P2P, UZ', user_id=None).first().id
+        bulk_reparse.init_worker(global_rows)
+
+        personal = {1: [(900, 'PAYME P2P, UZ', 'Personal')], 2: [], 3: []}
+        results = bulk_reparse.reparse_chunk(
+            [(index, user_id, raw_text, None) for index, user_id in enumerate(personal, 1)],
+            personal,
+        )
+
+    assert [derived['operator_id'] for _, derived, _ in results] == [900, payme_id, payme_id]
+    assert list(bulk_reparse._WORKER_MATCHERS) == [2, 3]
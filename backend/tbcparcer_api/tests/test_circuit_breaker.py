@@ -0,0 +1,115 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.services import operator_dictionary as dictionary_module
+from src.services.ai_parser import AIParsingService
+from src.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.services.parse_cache import ParseResultCache
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+# Valid for the local parser, but not confident enough to skip OpenAI.
+AMBIGUOUS_RECEIPT = 'Оплата, отмена\n04.04.25 18:46\nПлатёж 60 000 UZS'
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock, **options):
+    options.setdefault('min_calls', 4)
+    return CircuitBreaker(window_size=10, open_seconds=30, clock=clock, **options)
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_through_half_open():
+    clock = _Clock()
+    breaker = _breaker(clock)
+
+    for _ in range(2):
+        breaker.record_success(0.1)
+    for _ in range(2):
+        breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.status()['times_opened'] == 2
+
+
+def test_breaker_opens_on_slow_calls():
+    breaker = _breaker(_Clock(), slow_call_seconds=5)
+
+    breaker.record_success(0.2)
+    for _ in range(3):
+        breaker.record_success(6.0)
+
+    status = breaker.status()
+    assert status['state'] == OPEN
+    assert status['retry_in_seconds'] == 30
+
+
+@pytest.fixture()
+def failing_service(monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+    calls = []
+
+    def _create(**kwargs):
+        calls.append(kwargs)
+        raise ConnectionError('OpenAI is down')
+
+    client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=_create)),
+        retries_transient_errors=True,
+    )
+    breaker = _breaker(_Clock(), min_calls=2)
+    service = AIParsingService(client=client, cache=ParseResultCache(None), breaker=breaker)
+    yield service, breaker, calls
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+
+def test_service_falls_back_to_local_parser_and_stops_calling_open_api(failing_service):
+    service, breaker, calls = failing_service
+
+    for _ in range(2):
+        result = service.parse_receipt(AMBIGUOUS_RECEIPT)
+        assert result['parse_path'] == 'local_fallback'
+        assert result['amount'] == 60000.0
+    assert breaker.state == OPEN
+
+    for _ in range(5):
+        assert service.parse_receipt(AMBIGUOUS_RECEIPT)['parse_path'] == 'local_fallback'
+    assert len(calls) == 2
+
+
+def test_service_reports_error_when_local_fallback_cannot_parse(failing_service):
+    service, _, _ = failing_service
+
+    result = service.parse_receipt('привет')
+
+    assert 'error' in result
+    assert '_ai_unavailable' not in result
@@ -0,0 +1,95 @@
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from sqlalchemy import inspect
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import _configure_postgres_engine, create_app
+from src.models.operator import Operator
+from src.models.postgres_profile import postgres_engine_options
+from src.models.transaction import Transaction
+from src.models.user import User, db
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+
+@pytest.fixture()
+def app(database_uri, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+
+    app = create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_uri('backends.db'),
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def test_postgres_uri_gets_pool_and_statement_timeout():
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI='postgres://tbc@db.internal/tbcparcer',
+        SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 3},
+        POSTGRES_POOL_SIZE=10,
+        POSTGRES_MAX_OVERFLOW=5,
+        POSTGRES_STATEMENT_TIMEOUT_MS=15000,
+    )
+
+    _configure_postgres_engine(app)
+
+    assert app.config['SQLALCHEMY_DATABASE_URI'] == 'postgresql://tbc@db.internal/tbcparcer'
+    options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    assert options['pool_size'] == 3  # explicit engine options win
+    assert options['max_overflow'] == 5 and options['pool_pre_ping'] is True
+    assert options['connect_args'] == {'options': '-c statement_timeout=15000'}
+    assert 'connect_args' not in postgres_engine_options(statement_timeout_ms=0)
+
+
+def test_insert_unique_returns_persistent_transaction(app):
+    with app.app_context():
+        user = User.get_or_create_user(9393, 'upsert')
+        operator = Operator.query.filter_by(user_id=None).first()
+
+        def _build():
+            return Transaction(
+                user_id=user.id,
+                date_time=datetime(2025, 4, 4, 10, 15),
+                operation_type='payment',
+                amount=100,
+                operator_id=operator.id,
+                raw_text='upsert receipt',
+            )
+
+        transaction = _build()
+        assert Transaction.insert_unique(transaction) is None
+        assert inspect(transaction).persistent
+        payload = transaction.to_dict()
+        assert payload['id'] and payload['created_at'] and payload['currency'] == 'UZS'
+        assert payload['operator_name'] == operator.name and payload['is_deleted'] is False
+
+        duplicate = Transaction.insert_unique(_build())
+        assert duplicate is not None and duplicate.id == transaction.id
+
+
+def test_get_or_create_user_is_idempotent(app):
+    with app.app_context():
+        first = User.get_or_create_user(9494, 'before')
+        again = User.get_or_create_user(9494, 'after')
+
+        assert again.id == first.id and again.username == 'after'
+        assert User.query.filter_by(telegram_id=9494).count() == 1
@@ -31,8 +31,7 @@ INITIAL_DICTIONARY = {
 
 
 @pytest.fixture()
-def app(tmp_path, monkeypatch):
-    database_path = tmp_path / 'dictionary.db'
+def app(tmp_path, database_uri, monkeypatch):
     dictionary_path = tmp_path / 'operators_dict.json'
     dictionary_path.write_text(json.dumps(INITIAL_DICTIONARY, ensure_ascii=False, indent=2), encoding='utf-8')
 
@@ -45,7 +44,7 @@ def app(tmp_path, monkeypatch):
     app = create_app(
         {
             'TESTING': True,
-            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database_path}',
+            'SQLALCHEMY_DATABASE_URI': database_uri('dictionary.db'),
             'SQLALCHEMY_TRACK_MODIFICATIONS': False,
             'DICT_ADMIN_TOKEN': 'secret-token',
         }
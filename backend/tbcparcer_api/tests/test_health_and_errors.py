@@ -17,17 +17,15 @@ DICTIONARY_PATH = BACKEND_ROOT / 'data' / 'operators_dict.json'
 
 
 @pytest.fixture()
-def app(tmp_path):
+def app(database_uri):
     """Provide an application with an isolated SQLite database."""
     os.environ.pop('OPENAI_API_KEY', None)
     os.environ.setdefault('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
 
-    database_path = tmp_path / 'health-tests.db'
-
     app = create_app(
         {
             'TESTING': True,
-            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database_path}',
+            'SQLALCHEMY_DATABASE_URI': database_uri('health-tests.db'),
             'SQLALCHEMY_TRACK_MODIFICATIONS': False,
         }
     )
@@ -52,6 +50,9 @@ def test_health_endpoint_includes_request_id(client):
     assert payload['status'] in {'ok', 'degraded'}
     assert payload.get('database')
     assert payload.get('dictionary')
+    assert payload['dictionary']['checksum']
+    assert 'reload_ms' in payload['dictionary']
+    assert payload['openai']['breaker']['state'] == 'closed'
     assert payload['request_id'] == 'health-check'
     assert response.headers['X-Request-ID'] == 'health-check'
 
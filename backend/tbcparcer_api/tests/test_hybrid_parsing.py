@@ -0,0 +1,109 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.services import operator_dictionary as dictionary_module
+from src.services.ai_parser import AIParsingService, LocalReceiptParser, parse_path_stats
+from src.services.parse_cache import ParseResultCache
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+TEMPLATED_RECEIPT = 'Оплата\nДата: 04.04.2025 18:46\nСумма: 60 000 UZS\nКарта: *6714'
+FREEFORM_RECEIPT = 'Перевод 60 000 UZS другу'
+
+
+@pytest.fixture(autouse=True)
+def dictionary(monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    dictionary_module._DICTIONARY_INSTANCE = None
+    yield
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+
+class _CountingCompletions:
+    calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        payload = {'date_time': '2025-04-04 18:46:00', 'operation_type': 'payment', 'amount': 60000}
+        message = SimpleNamespace(content=json.dumps(payload))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _service(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    completions = _CountingCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return AIParsingService(client=client, cache=ParseResultCache(None)), completions
+
+
+def test_local_parser_scores_each_field():
+    result = LocalReceiptParser().parse(TEMPLATED_RECEIPT)
+
+    assert result['field_confidence']['date_time'] == pytest.approx(0.95)
+    assert result['field_confidence']['amount'] == pytest.approx(0.95)
+    assert result['field_confidence']['card_number'] == pytest.approx(0.95)
+    assert result['confidence'] == pytest.approx(0.95)
+
+
+def test_local_parser_lowers_confidence_for_guesses():
+    ambiguous = LocalReceiptParser().parse('Оплата, отмена\n04.04.25 18:46\nПлатёж 60 000 UZS')
+    assert ambiguous['field_confidence']['operation_type'] == pytest.approx(0.5)
+    assert ambiguous['field_confidence']['date_time'] == pytest.approx(0.9)
+    assert ambiguous['field_confidence']['amount'] == pytest.approx(0.7)
+    assert ambiguous['confidence'] == pytest.approx(0.5)
+
+    missing = LocalReceiptParser().parse(FREEFORM_RECEIPT)
+    assert missing['confidence'] == 0.0
+
+
+def test_local_parser_tokenizes_lines_once():
+    result = LocalReceiptParser().parse(
+        'Пополнение\nСумма:\n500 000 сум\n2025-01-02\n10:11:12\nОстаток: 1 000 000\nОписание: зарплата'
+    )
+
+    # Values may follow their label on the next line.
+    assert result['amount'] == 500000.0
+    assert result['currency'] == 'UZS'
+    assert result['date_time'] == '2025-01-02T10:11:12'
+    assert result['balance'] == 1000000.0
+    assert result['operation_type'] == 'refill'
+    assert result['description'] == 'зарплата'
+
+    # Unlabelled amounts do not pick up digits from the previous line.
+    unlabelled = LocalReceiptParser().parse('Чек 46\n60 000 UZS')
+    assert unlabelled['amount'] == 60000.0
+
+
+def test_confident_local_parse_skips_openai(monkeypatch):
+    service, completions = _service(monkeypatch)
+    before = parse_path_stats()
+
+    result = service.parse_receipt(TEMPLATED_RECEIPT)
+
+    assert completions.calls == 0
+    assert result['parse_path'] == 'local'
+    assert result['amount'] == 60000
+    assert parse_path_stats()['local'] == before['local'] + 1
+
+
+def test_low_confidence_parse_falls_through_to_openai(monkeypatch):
+    service, completions = _service(monkeypatch)
+    before = parse_path_stats()
+
+    result = service.parse_receipt(FREEFORM_RECEIPT)
+    repeated = service.parse_receipt(FREEFORM_RECEIPT)
+
+    assert completions.calls == 1
+    assert result['parse_path'] == 'openai'
+    assert repeated['parse_path'] == 'openai' and repeated['cache_hit'] is True
+    stats = parse_path_stats()
+    assert stats['openai'] == before['openai'] + 1
+    assert stats['cache'] == before['cache'] + 1
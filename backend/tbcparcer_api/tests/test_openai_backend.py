@@ -0,0 +1,159 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import openai
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.services.openai_backend import AsyncOpenAIBackend, LatencyTracker, backoff_delay
+
+MESSAGES = [{'role': 'user', 'content': 'ping'}]
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    """Serves scripted (delay, status) steps, then immediate 200 responses."""
+
+    script = []
+    calls = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        with type(self).lock:
+            step = type(self).script[type(self).calls] if type(self).calls < len(type(self).script) else (0, 200)
+            type(self).calls += 1
+        delay, status = step
+        time.sleep(delay)
+
+        if status == 200:
+            body = {
+                'id': 'stub',
+                'object': 'chat.completion',
+                'created': 0,
+                'model': 'stub',
+                'choices': [
+                    {'index': 0, 'message': {'role': 'assistant', 'content': 'pong'}, 'finish_reason': 'stop'}
+                ],
+            }
+        else:
+            body = {'error': {'message': 'scripted failure', 'type': 'server_error'}}
+        payload = json.dumps(body).encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def stub_url():
+    _ScriptedHandler.script = []
+    _ScriptedHandler.calls = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ScriptedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/v1'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def make_backend(stub_url):
+    backends = []
+
+    def _make(**options):
+        backend = AsyncOpenAIBackend('test-key', stub_url, **options)
+        backends.append(backend)
+        return backend
+
+    yield _make
+    for backend in backends:
+        backend.close()
+
+
+def _content(response):
+    return response.choices[0].message.content
+
+
+def test_hedged_request_wins_over_slow_primary(make_backend):
+    _ScriptedHandler.script = [(1.5, 200)]
+    backend = make_backend(hedge=True, hedge_after=0.1)
+
+    started = time.monotonic()
+    response = backend.chat.completions.create(model='stub', messages=MESSAGES)
+
+    assert _content(response) == 'pong'
+    assert time.monotonic() - started < 1.0
+    stats = backend.stats()
+    assert stats['hedges'] == 1 and stats['hedge_wins'] == 1
+
+
+def test_hedging_is_opt_in_and_skips_pack_sized_calls(make_backend):
+    _ScriptedHandler.script = [(0.3, 200)]
+    assert make_backend(hedge_after=0.1).stats()['hedge_after_ms'] is None
+
+    backend = make_backend(hedge=True, hedge_after=0.1)
+    backend.chat.completions.create(model='stub', messages=MESSAGES, max_tokens=500 * 4)
+
+    stats = backend.stats()
+    assert stats['hedges'] == 0 and _ScriptedHandler.calls == 1
+    assert backend.latency.percentile(0.5, min_samples=1) is None
+
+
+def test_transient_errors_are_retried_with_backoff(make_backend):
+    _ScriptedHandler.script = [(0, 500), (0, 429)]
+    backend = make_backend(hedge=False, backoff_base=0.01)
+
+    response = backend.chat.completions.create(model='stub', messages=MESSAGES)
+
+    assert _content(response) == 'pong'
+    assert backend.stats()['retries'] == 2
+    assert _ScriptedHandler.calls == 3
+
+
+def test_client_errors_are_not_retried(make_backend):
+    _ScriptedHandler.script = [(0, 400)]
+    backend = make_backend(hedge=False, backoff_base=0.01)
+
+    with pytest.raises(openai.BadRequestError):
+        backend.chat.completions.create(model='stub', messages=MESSAGES)
+    assert _ScriptedHandler.calls == 1
+
+
+def test_overall_timeout_bounds_hung_requests(make_backend):
+    _ScriptedHandler.script = [(3, 200)]
+    backend = make_backend(hedge=False, max_retries=0)
+
+    started = time.monotonic()
+    with pytest.raises(openai.APITimeoutError):
+        backend.chat.completions.create(model='stub', messages=MESSAGES, timeout=0.3)
+    assert time.monotonic() - started < 1.5
+
+
+def test_latency_tracker_needs_samples_before_reporting_p95():
+    tracker = LatencyTracker()
+    for value in range(1, 20):
+        tracker.record(value / 100)
+    assert tracker.percentile(0.95) is None
+
+    tracker.record(0.20)
+    assert tracker.percentile(0.95) == pytest.approx(0.19)
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(attempt, base=0.5, cap=2.0) for attempt in range(6) for _ in range(20)]
+    assert all(0 <= delay <= 2.0 for delay in delays)
+    assert len(set(delays)) > 1
@@ -9,7 +9,9 @@ if str(PROJECT_DIR) not in sys.path:
     sys.path.insert(0, str(PROJECT_DIR))
 
 from src.services.operator_dictionary import (
+    DictionaryWatcher,
     OperatorDictionary,
+    compile_operator_dictionary,
     normalize_operator_value,
 )
 
@@ -73,6 +75,106 @@ class OperatorDictionaryTests(unittest.TestCase):
             [{'url': 'https://example.com', 'label': 'Example'}],
         )
 
+    def test_lookup_returns_shared_read_only_entry(self):
+        first = self.dictionary.lookup('Custom alias extra info')
+        second = self.dictionary.lookup('CUSTOM ALIAS')
+        self.assertIs(first, second)
+        with self.assertRaises(TypeError):
+            first['operator'] = 'Changed'
+
+    def test_reload_publishes_new_snapshot_without_touching_previous(self):
+        previous = self.dictionary.snapshot()
+
+        self._write_aliases({'Another Alias': 'Another'})
+        self.dictionary.reload()
+
+        current = self.dictionary.snapshot()
+        self.assertIsNot(previous, current)
+        self.assertEqual(len(previous.entries), 2)
+        self.assertEqual(len(current.entries), 1)
+        self.assertEqual(previous.entries[previous.matcher.find('UPAY P2P')]['operator'], 'Humans')
+        self.assertEqual(self.dictionary.get_operator_metadata('Missing'), {})
+
+    def test_reload_if_changed_skips_unchanged_file(self):
+        snapshot = self.dictionary.snapshot()
+        self.assertIsNotNone(snapshot.load_duration_ms)
+        self.assertFalse(self.dictionary.has_changed())
+        self.assertFalse(self.dictionary.reload_if_changed())
+        self.assertIs(self.dictionary.snapshot(), snapshot)
+
+    def test_watcher_reloads_changed_file_and_keeps_snapshot_on_error(self):
+        watcher = DictionaryWatcher(self.dictionary, interval=60)
+        self.assertFalse(watcher.check())
+
+        self._write_aliases({'Another Alias': 'Another', 'Third alias': 'Third'})
+        self.assertTrue(watcher.check())
+        self.assertEqual(self.dictionary.size(), 2)
+        self.assertIsNotNone(self.dictionary.lookup('Third alias'))
+        reloaded_checksum = self.dictionary.checksum()
+
+        self.dictionary_path.write_text('{"aliases": ', encoding='utf-8')
+        self.assertFalse(watcher.check())
+        self.assertEqual(self.dictionary.checksum(), reloaded_checksum)
+        status = watcher.status()
+        self.assertEqual(status['reloads'], 1)
+        self.assertIsNotNone(status['last_error'])
+        self.assertFalse(status['running'])
+
+    def test_compiled_snapshot_used_until_source_changes(self):
+        compiled_path = compile_operator_dictionary(self.dictionary_path)
+        self.assertTrue(compiled_path.exists())
+
+        compiled_dictionary = OperatorDictionary(self.dictionary_path)
+        self.assertTrue(compiled_dictionary.snapshot().compiled)
+        self.assertEqual(compiled_dictionary.checksum(), self.dictionary.checksum())
+        self.assertEqual(compiled_dictionary.lookup('UPAY P2P, UZ')['operator'], 'Humans')
+
+        self._write_aliases({'Another Alias': 'Another'})
+        compiled_dictionary.reload()
+        self.assertFalse(compiled_dictionary.snapshot().compiled)
+        self.assertEqual(compiled_dictionary.size(), 1)
+
+    def test_unreadable_compiled_snapshot_falls_back_to_json(self):
+        compiled_path = Path(self.tempdir.name) / 'broken.pickle'
+        compiled_path.write_bytes(b'not a pickle')
+
+        dictionary = OperatorDictionary(self.dictionary_path, compiled_path)
+
+        self.assertFalse(dictionary.snapshot().compiled)
+        self.assertEqual(dictionary.size(), 2)
+
+    def test_lookup_memo_counts_hits_and_resets_on_checksum_change(self):
+        self.dictionary.lookup('UPAY P2P, UZ')
+        self.dictionary.lookup('UPAY P2P, UZ')
+        self.dictionary.normalize('Unknown operator')
+        stats = self.dictionary.cache_stats()
+        self.assertEqual(stats['lookup']['hits'], 1)
+        self.assertEqual(stats['lookup']['misses'], 2)
+        self.assertEqual(stats['normalize']['misses'], 1)
+
+        self.dictionary_path.touch()
+        self.dictionary.reload()
+        self.assertEqual(self.dictionary.cache_stats()['lookup']['hits'], 1)
+
+        self._write_aliases({'UPAY P2P': 'Changed'})
+        self.dictionary.reload()
+        stats = self.dictionary.cache_stats()
+        self.assertEqual(stats['lookup']['hits'], 0)
+        self.assertEqual(stats['lookup']['size'], 0)
+        self.assertEqual(self.dictionary.lookup('UPAY P2P, UZ')['operator'], 'Changed')
+
+    def test_match_reports_exact_and_fuzzy_scores(self):
+        exact_entry, exact_score = self.dictionary.match('UPAY P2P, UZ')
+        self.assertEqual(exact_entry['alias'], 'UPAY P2P')
+        self.assertEqual(exact_score, 1.0)
+
+        fuzzy_entry, fuzzy_score = self.dictionary.match('Custm alias')
+        self.assertEqual(fuzzy_entry['alias'], 'Custom alias')
+        self.assertLess(fuzzy_score, 1.0)
+        self.assertGreaterEqual(fuzzy_score, 0.6)
+
+        self.assertIsNone(self.dictionary.match('Completely different'))
+
 
 if __name__ == '__main__':
     unittest.main()
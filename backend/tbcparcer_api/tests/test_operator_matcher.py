@@ -0,0 +1,207 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.operator import Operator
+from src.models.user import User, db
+from src.services.operator_dictionary import get_operator_dictionary
+from src.services.operator_matcher import (
+    CompiledOperatorMatcher,
+    find_operator_id,
+    get_operator_matcher,
+    get_user_operator_index,
+)
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+
+def _legacy_find(operators, description_text):
+    """Original two-pass search over ORM-like rows."""
+    for operator_id, name, _ in operators:
+        if name.lower() in description_text.lower():
+            return operator_id
+    for operator_id, _, description in operators:
+        if description:
+            keywords = description.lower().split()
+            if any(keyword in description_text.lower() for keyword in keywords):
+                return operator_id
+    return None
+
+
+@pytest.fixture()
+def app(database_uri, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+
+    app = create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_uri('matcher.db'),
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def _count_queries(app):
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _record)
+    return statements, lambda: event.remove(engine, 'before_cursor_execute', _record)
+
+
+def test_compiled_matcher_matches_legacy_search():
+    rows = [
+        (1, 'UPAY P2P', 'Humans'),
+        (2, 'PAYME P2P, UZ', 'Payme wallet'),
+        (3, 'Tenge24 P2P UZCARDHU', 'Tenge24'),
+        (4, 'CLICK', None),
+    ]
+    matcher = CompiledOperatorMatcher(rows)
+
+    for text in (
+        'upay p2p humo',
+        'Перевод PAYME P2P, UZ',
+        'wallet top-up',
+        'tenge24 transfer',
+        'click uz',
+        'unknown merchant',
+        '',
+    ):
+        assert matcher.match(text) == _legacy_find(rows, text), text
+
+
+def test_personal_layer_matches_legacy_search_over_merged_rows():
+    global_rows = [
+        (1, 'UPAY P2P', 'Humans'),
+        (2, 'PAYME P2P, UZ', 'Payme wallet'),
+        (3, 'CLICK', 'Click transfer'),
+        (4, 'CLICK', 'Duplicate'),
+    ]
+    personal_rows = [
+        (10, 'PAYME P2P, UZ', 'Personal'),
+        (11, 'MY SHOP', 'groceries'),
+    ]
+    merged = personal_rows + [row for row in global_rows if row[1] != 'PAYME P2P, UZ']
+    matcher = CompiledOperatorMatcher(personal_rows, shared=CompiledOperatorMatcher(global_rows))
+
+    for text in (
+        'payme p2p, uz',
+        'payme wallet',
+        'wallet top-up',
+        'click transfer',
+        'my shop groceries',
+        'upay p2p humans',
+        'unknown merchant',
+    ):
+        assert matcher.match(text) == _legacy_find(merged, text), text
+
+
+def test_user_matchers_share_global_layer_in_bounded_cache(app):
+    app.config['OPERATOR_MATCHER_CACHE_SIZE'] = 2
+    loaded = []
+
+    def loader(user_id):
+        loaded.append(user_id)
+        return [(100 + (user_id or 0), f'SHOP {user_id}', None)]
+
+    with app.app_context():
+        matchers = [get_operator_matcher(user_id, loader) for user_id in (1, 2, 3)]
+        assert {id(matcher.shared) for matcher in matchers} == {id(get_operator_matcher(None, loader))}
+        assert list(app.extensions['operator_matchers']) == [2, 3]
+
+        assert get_operator_matcher(3, loader) is matchers[2]
+        assert get_operator_matcher(1, loader) is not matchers[0]
+        assert loaded == [None, 1, 2, 3, 1]
+
+
+def test_find_operator_uses_cached_matcher_without_queries(app):
+    with app.app_context():
+        expected = Operator.query.filter_by(name='PAYME P2P, UZ', user_id=None).first()
+        assert find_operator_id('PAYME P2P, UZ 12:00') == expected.id
+
+        statements, stop = _count_queries(app)
+        try:
+            for _ in range(3):
+                assert find_operator_id('PAYME P2P, UZ 12:00') == expected.id
+        finally:
+            stop()
+        assert statements == []
+
+
+def test_operator_routes_invalidate_user_matcher(app):
+    client = app.test_client()
+    telegram_id = 555
+
+    with app.app_context():
+        user = User.get_or_create_user(telegram_id, 'matcher')
+        user_id = user.id
+        assert find_operator_id('MY CUSTOM SHOP', user_id) is None
+
+    response = client.post(
+        '/api/operators',
+        json={'telegram_id': telegram_id, 'name': 'MY CUSTOM SHOP', 'description': 'Shop'},
+    )
+    assert response.status_code == 201
+    operator_id = response.get_json()['operator']['id']
+
+    with app.app_context():
+        assert find_operator_id('Pokupka MY CUSTOM SHOP', user_id) == operator_id
+
+    response = client.put(
+        f'/api/operators/{operator_id}',
+        json={'telegram_id': telegram_id, 'name': 'RENAMED SHOP'},
+    )
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert find_operator_id('Pokupka RENAMED SHOP', user_id) == operator_id
+
+    response = client.delete(f'/api/operators/{operator_id}?telegram_id={telegram_id}')
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert find_operator_id('Pokupka RENAMED SHOP', user_id) is None
+
+
+def test_operator_name_index_is_cached_until_invalidated(app):
+    client = app.test_client()
+    telegram_id = 777
+
+    with app.app_context():
+        user_id = User.get_or_create_user(telegram_id, 'index').id
+        dictionary = get_operator_dictionary()
+        index = get_user_operator_index(user_id, dictionary)
+        assert get_user_operator_index(user_id, dictionary) is index
+        assert index.find('PAYME P2P UZ')['name'] == 'PAYME P2P, UZ'
+
+    response = client.post(
+        '/api/operators',
+        json={'telegram_id': telegram_id, 'name': 'Payme P2P, UZ', 'description': 'Personal'},
+    )
+    assert response.status_code == 201
+
+    with app.app_context():
+        refreshed = get_user_operator_index(user_id, get_operator_dictionary())
+        assert refreshed is not index
+        assert refreshed.find('PAYME P2P UZ')['description'] == 'Personal'
+        assert refreshed.shared is index.shared is get_user_operator_index(None, get_operator_dictionary())
+        assert len(refreshed) == len(Operator.get_operators_for_user(user_id))
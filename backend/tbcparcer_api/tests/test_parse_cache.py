@@ -0,0 +1,130 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.services import parse_cache as parse_cache_module
+from src.services.ai_parser import AIParsingService
+from src.services.parse_cache import ParseResultCache, parse_cache_key
+
+RECEIPT = 'Pokupka: PAYME P2P, UZ\n04.04.25 18:46\nSumma: 60 000 UZS\nKarta: *6714'
+
+
+class _FakeCompletions:
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=json.dumps(self.payload))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _fake_client(payload):
+    return SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions(payload)))
+
+
+def test_cache_persists_between_instances(tmp_path):
+    path = tmp_path / 'cache.db'
+    ParseResultCache(path).set('key', {'amount': 1.5})
+
+    reopened = ParseResultCache(path)
+    assert reopened.get('key') == {'amount': 1.5}
+    assert reopened.get('missing') is None
+    assert reopened.stats()['hits'] == 1
+
+
+def test_cache_expires_entries_and_bounds_size(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(parse_cache_module.time, 'time', lambda: clock[0])
+    path = tmp_path / 'cache.db'
+
+    cache = ParseResultCache(path, ttl=60, max_entries=2)
+    for index in range(3):
+        clock[0] += 1
+        cache.set(f'key-{index}', {'index': index})
+
+    reopened = ParseResultCache(path, ttl=60, max_entries=2)
+    assert reopened.get('key-0') is None
+    assert reopened.get('key-2') == {'index': 2}
+
+    clock[0] += 120
+    assert cache.get('key-2') is None
+    assert reopened.get('key-1') is None
+
+
+def test_eviction_runs_only_on_overflow_or_interval(tmp_path, monkeypatch):
+    sweeps = []
+    evict = ParseResultCache._evict
+    monkeypatch.setattr(ParseResultCache, '_evict', lambda self, *args: sweeps.append(1) or evict(self, *args))
+
+    cache = ParseResultCache(tmp_path / 'cache.db', max_entries=10000)
+    for index in range(parse_cache_module._EVICT_INTERVAL - 1):
+        cache.set(f'key-{index}', {'index': index})
+    assert sweeps == []
+
+    cache.set('key-last', {'index': -1})
+    assert len(sweeps) == 1
+
+
+def test_key_ignores_whitespace_but_not_prompt_or_model():
+    key = parse_cache_key('A  B\nC', 'gpt-4o-mini', 'v1')
+    assert key == parse_cache_key(' A B C ', 'gpt-4o-mini', 'v1')
+    assert key != parse_cache_key('A B C', 'gpt-4o-mini', 'v2')
+    assert key != parse_cache_key('A B C', 'gpt-4o', 'v1')
+
+
+def test_service_serves_repeated_receipt_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    client = _fake_client(
+        {
+            'date_time': '2025-04-04 18:46:00',
+            'operation_type': 'payment',
+            'amount': 60000,
+            'currency': 'UZS',
+            'card_number': '*6714',
+            'description': 'PAYME P2P, UZ',
+            'balance': None,
+            'operator': 'PAYME',
+        }
+    )
+    service = AIParsingService(
+        client=client,
+        cache=ParseResultCache(tmp_path / 'cache.db'),
+        local_confidence_threshold=2.0,
+    )
+
+    first = service.parse_receipt(RECEIPT)
+    first['batch_index'] = 0
+    second = service.parse_receipt(RECEIPT + '\n')
+
+    assert client.chat.completions.calls == 1
+    assert second['amount'] == 60000
+    assert second['cache_hit'] is True
+    assert second['raw_text'] == RECEIPT + '\n'
+    assert 'batch_index' not in second
+
+    service.prompt_version = 'changed'
+    service.parse_receipt(RECEIPT)
+    assert client.chat.completions.calls == 2
+
+
+def test_service_does_not_cache_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    client = _fake_client({'error': 'Не является финансовым чеком'})
+    service = AIParsingService(
+        client=client,
+        cache=ParseResultCache(tmp_path / 'cache.db'),
+        local_confidence_threshold=2.0,
+    )
+
+    for _ in range(2):
+        assert 'error' in service.parse_receipt('hello')
+    assert client.chat.completions.calls == 2
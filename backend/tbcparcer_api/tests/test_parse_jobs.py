@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.parse_job import JOB_FAILED, JOB_RUNNING, ParseJob
+from src.models.transaction import Transaction
+from src.models.user import User, db
+from src.services import operator_dictionary as dictionary_module
+from src.services.job_queue import ParseJobQueue, get_parse_job_queue
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+RECEIPT = 'Оплата\nДата: 04.04.2025 18:46\nСумма: 60 000 UZS\nКарта: *6714'
+OTHER_RECEIPT = 'Пополнение\nДата: 05.04.2025 09:10\nСумма: 150 000 UZS\nКарта: *6714'
+
+
+@pytest.fixture()
+def app(database_uri, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+    app = create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_uri('jobs.db'),
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+
+def test_async_parse_and_save_returns_job_and_completes(app):
+    client = app.test_client()
+
+    response = client.post(
+        '/api/ai/parse-and-save',
+        json={'text': RECEIPT, 'telegram_id': 1001, 'async': True},
+    )
+    assert response.status_code == 202
+    job = response.get_json()['job']
+    assert job['status'] == 'queued'
+
+    with app.app_context():
+        assert get_parse_job_queue(app).run_pending() == 1
+
+    status = client.get(job['status_url']).get_json()['job']
+    assert status['status'] == 'succeeded'
+    assert status['parsed_data']['amount'] == 60000.0
+    with app.app_context():
+        transaction = db.session.get(Transaction, status['transaction_id'])
+        assert transaction.raw_text == RECEIPT
+
+
+def test_bulk_jobs_report_each_outcome(app):
+    client = app.test_client()
+
+    response = client.post(
+        '/api/ai/jobs',
+        json={'telegram_id': 1002, 'receipts': [RECEIPT, OTHER_RECEIPT, RECEIPT, 'не чек']},
+    )
+    assert response.status_code == 202
+    job_ids = [job['id'] for job in response.get_json()['jobs']]
+
+    pending = client.get('/api/ai/jobs', query_string={'ids': ','.join(job_ids), 'telegram_id': 1002}).get_json()
+    assert pending['summary'] == {'queued': 4}
+    assert pending['finished'] is False
+
+    with app.app_context():
+        get_parse_job_queue(app).run_pending()
+
+    payload = client.get(
+        '/api/ai/jobs', query_string={'ids': ','.join(job_ids + ['unknown']), 'telegram_id': 1002}
+    ).get_json()
+    assert [job['status'] for job in payload['jobs']] == ['succeeded', 'succeeded', 'duplicate', 'failed']
+    assert payload['jobs'][2]['transaction_id'] == payload['jobs'][0]['transaction_id']
+    assert payload['missing'] == ['unknown']
+    assert payload['finished'] is True
+
+    assert client.get('/api/ai/jobs/unknown', query_string={'telegram_id': 1002}).status_code == 404
+
+
+def test_jobs_are_visible_only_to_their_owner(app):
+    client = app.test_client()
+    job = client.post('/api/ai/jobs', json={'telegram_id': 1005, 'receipts': [RECEIPT]}).get_json()['jobs'][0]
+
+    assert client.get(job['status_url']).status_code == 200
+    assert client.get(f"/api/ai/jobs/{job['id']}").status_code == 400
+    assert client.get(f"/api/ai/jobs/{job['id']}", query_string={'telegram_id': 1006}).status_code == 404
+
+    foreign = client.get('/api/ai/jobs', query_string={'ids': job['id'], 'telegram_id': 1006}).get_json()
+    assert foreign['jobs'] == [] and foreign['missing'] == [job['id']]
+
+
+def test_finished_jobs_are_purged_after_retention(app):
+    with app.app_context():
+        user = User.get_or_create_user(1007)
+        queue = ParseJobQueue(app, workers=0, retention_days=7)
+        old, recent, queued = queue.submit(user, [RECEIPT, OTHER_RECEIPT, 'ещё не обработан'])
+        old.finish(JOB_FAILED, error='old')
+        old.finished_at = datetime.utcnow() - timedelta(days=8)
+        recent.finish(JOB_FAILED, error='recent')
+        db.session.commit()
+        kept = {recent.id, queued.id}
+
+        assert queue.purge_finished() == 1
+        assert {job.id for job in ParseJob.query.all()} == kept
+        assert ParseJobQueue(app, workers=0, retention_days=0).purge_finished() == 0
+
+
+def test_expired_lease_is_reclaimed(app):
+    with app.app_context():
+        user = User.get_or_create_user(1003)
+        queue = get_parse_job_queue(app)
+        job = queue.submit(user, [RECEIPT])[0]
+        job.status = JOB_RUNNING
+        job.attempts = 1
+        job.started_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+        assert queue.run_pending() == 1
+        db.session.expire_all()
+        job = db.session.get(ParseJob, job.id)
+        assert job.status == 'succeeded'
+        assert job.attempts == 2
+
+
+def test_worker_threads_process_submitted_jobs(app):
+    queue = ParseJobQueue(app, workers=2, poll_interval=0.05)
+    with app.app_context():
+        user = User.get_or_create_user(1004)
+        job_ids = [job.id for job in queue.submit(user, [RECEIPT, OTHER_RECEIPT])]
+
+    queue.ensure_running()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with app.app_context():
+                jobs = ParseJob.query.filter(ParseJob.id.in_(job_ids)).all()
+                if all(job.is_finished for job in jobs):
+                    break
+            time.sleep(0.05)
+    finally:
+        queue.stop(timeout=2)
+
+    assert sorted(job.status for job in jobs) == ['succeeded', 'succeeded']
+    assert queue.status()['processed'] == 2
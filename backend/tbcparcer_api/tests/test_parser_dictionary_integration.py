@@ -11,6 +11,7 @@ if str(BACKEND_ROOT) not in sys.path:
 
 from src.services import operator_dictionary as dictionary_module
 from src.services.ai_parser import AIParsingService, LocalReceiptParser
+from src.services.operator_matcher import OperatorNameIndex
 
 TEST_DICTIONARY = {
     "version": 1,
@@ -67,9 +68,36 @@ def test_local_parser_uses_dictionary_metadata():
     assert result['operator_tags'] == ['wallet', 'telecom']
     assert result['operator_application_tags'] == ['wallet', 'p2p']
     assert result['operator_application_platforms'] == ['ios', 'android']
+    assert result['operator_match_score'] == 1.0
     assert 'operator_raw' not in result
 
 
+def test_local_parser_resolves_misspelled_operator_fuzzily():
+    parser = LocalReceiptParser()
+
+    result = parser.parse("""UPAI P2P, UZ\nСумма: 120 000 UZS""")
+
+    assert result['operator'] == 'UPAY P2P, UZ'
+    assert result['operator_raw'] == 'UPAI P2P, UZ'
+    assert result['operator_name'] == 'Humans'
+    assert 0.6 <= result['operator_match_score'] < 1.0
+
+
+def test_unrelated_operator_text_is_not_matched_fuzzily():
+    parser = LocalReceiptParser()
+    service = AIParsingService()
+
+    result = parser.parse("""Оплата за коммунальные услуги\nСумма: 120 000 UZS""")
+    assert 'operator_match_score' not in result
+
+    # Near-miss spellings are resolved by the local parser only, never on model output.
+    for operator in ('Коммунальные услуги', 'UPAI P2P, UZ'):
+        enhanced = service.enhance_with_operator_info({'operator': operator}, operators_list=[])
+        assert enhanced['operator'] == operator
+        assert 'operator_match_score' not in enhanced
+        assert 'operator_application' not in enhanced
+
+
 def test_enhance_with_operator_info_preserves_application():
     service = AIParsingService()
     parsed = {'operator': 'UPAY P2P, UZ'}
@@ -86,3 +114,29 @@ def test_enhance_with_operator_info_preserves_application():
     assert enhanced['operator_tags'] == ['wallet', 'telecom']
     assert enhanced['operator_application_tags'] == ['wallet', 'p2p']
     assert enhanced['operator_application_platforms'] == ['ios', 'android']
+
+
+def test_enhance_with_operator_info_matches_operator_by_normalized_name():
+    service = AIParsingService()
+    operators = [
+        {'id': 1, 'name': 'ACME', 'description': 'Parent'},
+        {'id': 2, 'name': 'ACME SHOP', 'description': ''},
+        {'id': 3, 'name': 'acme shop tashkent', 'description': 'Branch'},
+    ]
+
+    enhanced = service.enhance_with_operator_info({'operator': 'ACME SHOP TASHKENT'}, operators)
+
+    assert enhanced['operator_id'] == 3
+    assert enhanced['operator_description'] == 'Branch'
+
+
+def test_operator_name_index_falls_back_to_substring_match():
+    dictionary = dictionary_module.get_operator_dictionary()
+    index = OperatorNameIndex(
+        [(1, 'CLICK', None), (2, 'UPAY P2P', 'Humans')],
+        dictionary,
+    )
+
+    assert index.find('UPAY P2P UZ')['id'] == 2
+    assert index.find('CLICK UZCARD TO HUMO')['id'] == 1
+    assert index.find('PAYME') is None
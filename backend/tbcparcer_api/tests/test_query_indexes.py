@@ -0,0 +1,144 @@
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, inspect, text
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.migrations import run_startup_migrations
+from src.models.operator import USER_NAME_INDEX
+from src.models.transaction import (
+    ACTIVE_BY_DATE_INDEX,
+    OPERATOR_INDEX,
+    TRASH_BY_CREATED_INDEX,
+    Transaction,
+)
+from src.models.user import User, db
+
+pytestmark = pytest.mark.sqlite_only
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+TELEGRAM_ID = 7373
+DECLARED_INDEXES = {
+    'transactions': {ACTIVE_BY_DATE_INDEX, TRASH_BY_CREATED_INDEX, OPERATOR_INDEX},
+    'operators': {USER_NAME_INDEX},
+}
+
+
+@pytest.fixture()
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+
+    app = create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'indexes.db'}",
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+    with app.app_context():
+        user = User.get_or_create_user(TELEGRAM_ID, 'planner')
+        for index in range(4):
+            db.session.add(
+                Transaction(
+                    user_id=user.id,
+                    date_time=datetime(2025, 4, 1, 9 + index),
+                    operation_type='payment',
+                    amount=1000,
+                    currency='UZS',
+                    raw_text=f'Оплата {index}',
+                    is_deleted=index == 0,
+                )
+            )
+        db.session.commit()
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def _query_plans(app, request):
+    """EXPLAIN QUERY PLAN of every SELECT on transactions/operators issued by ``request``."""
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and (
+            'FROM transactions' in statement or 'FROM operators' in statement
+        ):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    try:
+        response = request(app.test_client())
+    finally:
+        event.remove(engine, 'before_cursor_execute', _record)
+    assert response.status_code == 200
+
+    plans = []
+    with app.app_context():
+        connection = db.engine.raw_connection()
+        try:
+            for statement, parameters in statements:
+                rows = connection.cursor().execute(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+                plans.append(' | '.join(row[-1] for row in rows))
+        finally:
+            connection.close()
+    assert plans
+    return plans
+
+
+@pytest.mark.parametrize(
+    'query_string',
+    [{'page': 1, 'per_page': 2}, {'cursor': '', 'per_page': 2}],
+)
+def test_transaction_list_searches_composite_index(app, query_string):
+    plans = _query_plans(
+        app,
+        lambda client: client.get('/api/transactions', query_string={'telegram_id': TELEGRAM_ID, **query_string}),
+    )
+    listing = [plan for plan in plans if 'transactions' in plan]
+
+    assert listing and all(ACTIVE_BY_DATE_INDEX in plan for plan in listing)
+    assert not any('TEMP B-TREE' in plan for plan in listing)
+
+
+def test_trash_list_uses_partial_index(app):
+    plans = _query_plans(app, lambda client: client.get('/api/trash/transactions'))
+
+    trash = [plan for plan in plans if 'transactions' in plan]
+    assert any(TRASH_BY_CREATED_INDEX in plan for plan in trash)
+    assert not any('TEMP B-TREE' in plan for plan in trash)
+
+
+def test_operator_listing_uses_user_index(app):
+    plans = _query_plans(app, lambda client: client.get('/api/operators', query_string={'telegram_id': TELEGRAM_ID}))
+
+    assert all(USER_NAME_INDEX in plan for plan in plans if 'operators' in plan)
+
+
+def test_startup_migration_creates_missing_indexes(app):
+    with app.app_context():
+        for table, names in DECLARED_INDEXES.items():
+            for name in names:
+                db.session.execute(text(f'DROP INDEX {name}'))
+        db.session.commit()
+
+        run_startup_migrations()
+        run_startup_migrations()
+
+        inspector = inspect(db.engine)
+        for table, names in DECLARED_INDEXES.items():
+            assert names <= {index['name'] for index in inspector.get_indexes(table)}
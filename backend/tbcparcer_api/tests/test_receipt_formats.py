@@ -0,0 +1,146 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.services import operator_dictionary as dictionary_module
+from src.services import receipt_formats
+from src.services.ai_parser import LocalReceiptParser
+from src.services.receipt_formats import ExtractedReceipt, ReceiptFormat, classify_receipt
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+# Samples from docs/requirements_analysis.md
+HUMO_RECEIPT = (
+    "💸 Оплата\n➖ 6.000.000,00 UZS\n📍 NBU P2P HUMO UZCARD>\n"
+    "💳 HUMOCARD *6714\n🕓 18:46 04.04.2025\n💰 935.000,40 UZS"
+)
+BANK_TEXT_RECEIPT = (
+    'Pokupka: OOO "AGAT SYSTEM", tashkent, g tashkent Ul Gavhar 151 02.04.25 08:37 '
+    'karta ***0907. summa:44000.00 UZS, balans:2607792.14 UZS'
+)
+CARDXABAR_RECEIPT = (
+    '🔴 Pokupka\n➖ 44 000.00 UZS\n💳 ***0907\n'
+    '📍 OOO "AGAT SYSTEM", tashkent, g tashkent  Ul  Gavhar 151 \n'
+    '🕓 02.04.25 08:37\n💵 2 607 792.14 UZS'
+)
+NBU_RECEIPT = "💸 Конверсия\n➖ 37.00 USD\n💳 479091**6905\n🕓 14.04.25 10:29\n💵 0.00 USD"
+
+
+@pytest.fixture(autouse=True)
+def dictionary(monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    dictionary_module._DICTIONARY_INSTANCE = None
+    yield
+    dictionary_module._DICTIONARY_INSTANCE = None
+
+
+@pytest.mark.parametrize(
+    'receipt, receipt_format, expected',
+    [
+        (
+            HUMO_RECEIPT,
+            'humo',
+            {
+                'operation_type': 'payment',
+                'amount': 6000000.0,
+                'currency': 'UZS',
+                'balance': 935000.4,
+                'card_number': '*6714',
+                'date_time': '2025-04-04T18:46:00',
+                'description': 'NBU P2P HUMO UZCARD>',
+            },
+        ),
+        (
+            BANK_TEXT_RECEIPT,
+            'bank_text',
+            {
+                'operation_type': 'payment',
+                'amount': 44000.0,
+                'currency': 'UZS',
+                'balance': 2607792.14,
+                'card_number': '*0907',
+                'date_time': '2025-04-02T08:37:00',
+                'description': 'OOO "AGAT SYSTEM", tashkent, g tashkent Ul Gavhar 151',
+            },
+        ),
+        (
+            CARDXABAR_RECEIPT,
+            'cardxabar',
+            {
+                'operation_type': 'payment',
+                'amount': 44000.0,
+                'currency': 'UZS',
+                'balance': 2607792.14,
+                'card_number': '*0907',
+                'date_time': '2025-04-02T08:37:00',
+            },
+        ),
+        (
+            NBU_RECEIPT,
+            'nbu',
+            {
+                'operation_type': 'conversion',
+                'amount': 37.0,
+                'currency': 'USD',
+                'balance': 0.0,
+                'card_number': '*6905',
+                'date_time': '2025-04-14T10:29:00',
+            },
+        ),
+    ],
+)
+def test_known_layouts_use_their_extractor(receipt, receipt_format, expected):
+    result = LocalReceiptParser().parse(receipt)
+
+    assert result['receipt_format'] == receipt_format
+    for field, value in expected.items():
+        assert result[field] == value, field
+    assert result['confidence'] >= 0.9
+
+
+def test_unknown_or_incomplete_layouts_fall_back_to_generic_parser():
+    lines = ['Оплата', 'Дата: 04.04.2025 18:46', 'Сумма: 60 000 UZS']
+    assert classify_receipt(lines) is None
+    assert LocalReceiptParser().parse('\n'.join(lines))['receipt_format'] == 'generic'
+
+    # Recognised header, but the amount slot is missing.
+    incomplete = LocalReceiptParser().parse('💸 Оплата\n🕓 18:46 04.04.2025\n💰 935.000,40 UZS')
+    assert incomplete['receipt_format'] == 'generic'
+
+
+def test_registered_format_takes_precedence(monkeypatch):
+    monkeypatch.setattr(receipt_formats, '_RECEIPT_FORMATS', list(receipt_formats._RECEIPT_FORMATS))
+
+    class _TestFormat(ReceiptFormat):
+        name = 'test'
+
+        def matches(self, header, text):
+            return header == 'TEST'
+
+        def extract(self, lines):
+            extracted = ExtractedReceipt(lines=list(lines), receipt_format=self.name)
+            extracted.put('operation_type', 'refill')
+            extracted.put('amount', float(lines[1]))
+            extracted.put('date_time', '2025-01-01T00:00:00')
+            return extracted
+
+    receipt_formats.register_receipt_format(_TestFormat())
+
+    result = LocalReceiptParser().parse('TEST\n125')
+    assert result['receipt_format'] == 'test'
+    assert result['amount'] == 125.0
+    assert result['operation_type'] == 'refill'
+
+
+def test_incomplete_format_cannot_be_registered():
+    class _NoExtractor(ReceiptFormat):
+        def matches(self, header, text):
+            return True
+
+    with pytest.raises(TypeError):
+        receipt_formats.register_receipt_format(_NoExtractor())
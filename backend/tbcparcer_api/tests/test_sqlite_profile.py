@@ -0,0 +1,76 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.sqlite_profile import resolve_sqlite_pragmas
+from src.models.user import db
+
+pytestmark = pytest.mark.sqlite_only
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+
+@pytest.fixture()
+def make_app(tmp_path, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+    apps = []
+
+    def _make(**config):
+        app = create_app(
+            {
+                'TESTING': True,
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / f'profile{len(apps)}.db'}",
+                'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+                **config,
+            }
+        )
+        apps.append(app)
+        return app
+
+    yield _make
+
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+
+def _pragma(app, name):
+    with app.app_context():
+        return db.session.execute(text(f'PRAGMA {name}')).scalar()
+
+
+def test_tuned_profile_is_applied_to_connections(make_app):
+    app = make_app()
+
+    assert _pragma(app, 'journal_mode') == 'wal'
+    assert _pragma(app, 'synchronous') == 1  # NORMAL
+    assert _pragma(app, 'foreign_keys') == 1
+    assert _pragma(app, 'busy_timeout') == 5000
+    assert _pragma(app, 'cache_size') == -20000
+    assert app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'] == 10
+
+
+def test_profile_overrides_and_off_switch(make_app):
+    tuned = make_app(SQLITE_PRAGMAS={'busy_timeout': 250, 'foreign_keys': None})
+    assert _pragma(tuned, 'busy_timeout') == 250
+    assert _pragma(tuned, 'foreign_keys') == 0
+
+    stock = make_app(SQLITE_PROFILE='off')
+    assert _pragma(stock, 'journal_mode') == 'delete'
+    assert 'pool_size' not in (stock.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_sqlite_pragmas('turbo')
@@ -0,0 +1,146 @@
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.migrations import DUPLICATE_DIGEST_PREFIX, _backfill_raw_text_digests
+from src.models.transaction import (
+    RAW_TEXT_DIGEST_INDEX,
+    Transaction,
+    compute_raw_text_digest,
+)
+from src.models.user import User, db
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+MANUAL_PAYLOAD = {
+    'telegram_id': 901,
+    'date_time': '2025-04-04T10:15:00',
+    'operation_type': 'payment',
+    'amount': 15000,
+    'currency': 'UZS',
+    'description': 'Coffee',
+    'raw_text': 'Pokupka: Coffee\n15 000 UZS',
+}
+
+
+def _create_app(database_uri):
+    return create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_uri,
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+
+@pytest.fixture()
+def app(database_uri, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+
+    app = _create_app(database_uri('dedup.db'))
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def test_digest_ignores_whitespace_differences():
+    assert compute_raw_text_digest('Pokupka:  Coffee\n15 000 UZS ') == compute_raw_text_digest(
+        'Pokupka: Coffee 15 000 UZS'
+    )
+    assert compute_raw_text_digest('15 000 UZS') != compute_raw_text_digest('15 001 UZS')
+
+
+def test_manual_duplicate_is_rejected_by_unique_index(app):
+    client = app.test_client()
+
+    first = client.post('/api/transactions', json=MANUAL_PAYLOAD)
+    assert first.status_code == 201
+
+    second = client.post(
+        '/api/transactions',
+        json={**MANUAL_PAYLOAD, 'raw_text': 'Pokupka:   Coffee 15 000 UZS'},
+    )
+    assert second.status_code == 409
+    details = second.get_json()['details']
+    assert details['transaction']['id'] == first.get_json()['transaction']['id']
+
+
+def test_insert_unique_returns_existing_row_on_conflict(app):
+    with app.app_context():
+        user_id = User.get_or_create_user(902).id
+
+        def _build():
+            return Transaction(
+                user_id=user_id,
+                date_time=datetime(2025, 4, 4, 10, 15),
+                operation_type='payment',
+                amount=100,
+                currency='UZS',
+                raw_text='same receipt',
+            )
+
+        assert Transaction.insert_unique(_build()) is None
+        existing = Transaction.insert_unique(_build())
+
+        assert existing is not None
+        assert Transaction.query.filter_by(user_id=user_id).count() == 1
+
+
+@pytest.mark.sqlite_only
+def test_startup_migration_backfills_legacy_table(tmp_path, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    database_path = tmp_path / 'legacy.db'
+
+    connection = sqlite3.connect(database_path)
+    connection.executescript(
+        """
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY, telegram_id BIGINT NOT NULL UNIQUE,
+            username VARCHAR(255), created_at DATETIME
+        );
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, date_time DATETIME NOT NULL,
+            operation_type VARCHAR(50) NOT NULL, amount NUMERIC(15, 2) NOT NULL,
+            currency VARCHAR(10) NOT NULL, card_number VARCHAR(20), description TEXT,
+            balance NUMERIC(15, 2), operator_id INTEGER, raw_text TEXT NOT NULL,
+            is_deleted BOOLEAN NOT NULL, created_at DATETIME
+        );
+        INSERT INTO users (id, telegram_id) VALUES (1, 903);
+        INSERT INTO transactions (id, user_id, date_time, operation_type, amount, currency, raw_text, is_deleted)
+        VALUES
+            (1, 1, '2025-04-04 10:15:00', 'payment', 100, 'UZS', 'receipt A', 0),
+            (2, 1, '2025-04-04 10:16:00', 'payment', 200, 'UZS', 'receipt B', 0),
+            (3, 1, '2025-04-04 10:15:00', 'payment', 100, 'UZS', 'receipt  A', 0);
+        """
+    )
+    connection.commit()
+    connection.close()
+
+    for _ in range(2):  # second start must be a no-op
+        app = _create_app(f'sqlite:///{database_path}')
+
+    with app.app_context():
+        indexes = {index['name']: index for index in inspect(db.engine).get_indexes('transactions')}
+        assert indexes[RAW_TEXT_DIGEST_INDEX]['unique']
+
+        digests = dict(db.session.query(Transaction.id, Transaction.raw_text_digest).all())
+        assert digests[1] == compute_raw_text_digest('receipt A')
+        assert digests[2] == compute_raw_text_digest('receipt B')
+        assert digests[3] == f'{DUPLICATE_DIGEST_PREFIX}3'
+        assert _backfill_raw_text_digests() == (0, 0)
+
+        db.session.remove()
@@ -0,0 +1,107 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.transaction import Transaction
+from src.models.user import User, db
+from src.utils.pagination import decode_cursor, encode_cursor
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+TELEGRAM_ID = 5151
+
+
+@pytest.fixture()
+def app(database_uri, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+
+    app = create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_uri('pagination.db'),
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+    with app.app_context():
+        user = User.get_or_create_user(TELEGRAM_ID, 'pager')
+        start = datetime(2025, 4, 1, 9, 0)
+        for index in range(7):
+            # Pairs of receipts share a timestamp, so ties are broken by id.
+            db.session.add(
+                Transaction(
+                    user_id=user.id,
+                    date_time=start + timedelta(hours=index // 2),
+                    operation_type='payment',
+                    amount=1000 + index,
+                    currency='UZS',
+                    raw_text=f'Оплата {index}',
+                    is_deleted=index == 6,
+                )
+            )
+        db.session.commit()
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def _expected_order(app):
+    with app.app_context():
+        rows = Transaction.query.filter_by(is_deleted=False).all()
+        return [row.id for row in sorted(rows, key=lambda row: (row.date_time, row.id), reverse=True)]
+
+
+def test_cursor_pages_walk_full_history_without_overlap(app):
+    client = app.test_client()
+    seen, cursor = [], ''
+    while True:
+        response = client.get(
+            '/api/transactions', query_string={'telegram_id': TELEGRAM_ID, 'per_page': 2, 'cursor': cursor}
+        )
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert 'total' not in payload
+        seen.extend(item['id'] for item in payload['transactions'])
+        if not payload['has_more']:
+            assert payload['next_cursor'] is None
+            break
+        cursor = payload['next_cursor']
+
+    assert seen == _expected_order(app)
+
+
+def test_cursor_mode_counts_only_on_request_and_rejects_garbage(app):
+    client = app.test_client()
+
+    counted = client.get(
+        '/api/transactions', query_string={'telegram_id': TELEGRAM_ID, 'cursor': '', 'include_total': '1'}
+    ).get_json()
+    assert counted['total'] == 6 and counted['has_more'] is False
+
+    malformed = client.get('/api/transactions', query_string={'telegram_id': TELEGRAM_ID, 'cursor': 'not-a-cursor'})
+    assert malformed.status_code == 400
+
+
+def test_page_mode_keeps_its_contract(app):
+    payload = app.test_client().get(
+        '/api/transactions', query_string={'telegram_id': TELEGRAM_ID, 'per_page': 4, 'page': 2}
+    ).get_json()
+
+    assert payload['total'] == 6 and payload['pages'] == 2 and payload['current_page'] == 2
+    assert [item['id'] for item in payload['transactions']] == _expected_order(app)[4:]
+
+
+def test_cursor_round_trip():
+    moment = datetime(2025, 4, 4, 18, 46, 5)
+    assert decode_cursor(encode_cursor(moment, 42)) == (moment, 42)
@@ -0,0 +1,118 @@
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.operator import Operator
+from src.models.transaction import Transaction
+from src.models.user import User, db
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+TELEGRAM_ID = 6262
+ROWS = 12
+
+
+@pytest.fixture()
+def app(database_uri, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+
+    app = create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_uri('serialization.db'),
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+    with app.app_context():
+        user = User.get_or_create_user(TELEGRAM_ID, 'serializer')
+        operators = Operator.query.filter_by(user_id=None).order_by(Operator.id).limit(ROWS).all()
+        for index in range(ROWS):
+            db.session.add(
+                Transaction(
+                    user_id=user.id,
+                    date_time=datetime(2025, 4, 1) + timedelta(hours=index),
+                    operation_type='payment',
+                    amount=1000 + index,
+                    balance=50000,
+                    currency='UZS',
+                    # Every row has its own operator; the last one has none.
+                    operator_id=operators[index].id if index < ROWS - 1 else None,
+                    raw_text=f'Оплата {index}',
+                    application='Payme',
+                )
+            )
+        db.session.commit()
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@contextmanager
+def _count_selects(app):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', _record)
+
+
+@pytest.mark.parametrize(
+    'query_string',
+    [{'per_page': 50}, {'per_page': 50, 'cursor': ''}],
+)
+def test_listing_does_not_load_operators_per_row(app, query_string):
+    client = app.test_client()
+    with _count_selects(app) as statements:
+        response = client.get('/api/transactions', query_string={'telegram_id': TELEGRAM_ID, **query_string})
+
+    assert response.status_code == 200
+    payload = response.get_json()['transactions']
+    assert len(payload) == ROWS
+    assert sum(1 for item in payload if item['operator_name']) == ROWS - 1
+    # user lookup + page (+ COUNT in page mode), independent of the row count
+    assert len(statements) <= 3
+
+
+def test_projection_matches_orm_serializer(app):
+    with app.app_context():
+        user = User.get_by_telegram_id(TELEGRAM_ID)
+        expected = [transaction.to_dict() for transaction in Transaction.get_user_transactions(user.id)]
+        assert list(Transaction.get_user_transaction_dicts(user.id)) == expected
+        assert list(Transaction.get_user_transaction_dicts(user.id, limit=3)) == expected[:3]
+
+
+def test_csv_export_streams_rows(app):
+    client = app.test_client()
+
+    response = client.post('/api/export/csv', json={'telegram_id': TELEGRAM_ID})
+
+    assert response.status_code == 200 and response.is_streamed
+    assert response.headers['Content-Disposition'].startswith('attachment; filename=TBCparcer_transactions_')
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0].startswith('Дата и время,') and len(lines) == ROWS + 1
+
+    with app.app_context():
+        User.get_or_create_user(TELEGRAM_ID + 1, 'empty')
+    assert client.post('/api/export/csv', json={'telegram_id': TELEGRAM_ID + 1}).status_code == 404
@@ -0,0 +1,112 @@
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect, text
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from src.app_factory import create_app
+from src.models.formatting import CellColor
+from src.models.migrations import run_startup_migrations
+from src.models.parse_job import JOB_SUCCEEDED, ParseJob
+from src.models.transaction import Transaction
+from src.models.user import User, db
+
+DICTIONARY_PATH = BACKEND_ROOT.parents[1] / 'data' / 'operators_dict.json'
+
+
+@pytest.fixture()
+def app(database_uri, monkeypatch):
+    monkeypatch.setenv('OPERATORS_DICTIONARY_PATH', str(DICTIONARY_PATH))
+    os.environ.pop('OPENAI_API_KEY', None)
+
+    # Default SQLite profile: foreign keys are enforced.
+    app = create_app(
+        {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': database_uri('trash.db'),
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        }
+    )
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def _trashed_transaction_with_job(index):
+    """Удалённая в корзину транзакция, на которую ссылаются задача разбора и цвет ячейки."""
+
+    user = User.get_or_create_user(8181, 'trash')
+    transaction = Transaction(
+        user_id=user.id,
+        date_time=datetime(2025, 4, 4, 10, index),
+        operation_type='payment',
+        amount=1000 + index,
+        raw_text=f'Оплата {index}',
+        is_deleted=True,
+    )
+    db.session.add(transaction)
+    db.session.flush()
+    job = ParseJob(user_id=user.id, receipt_text=transaction.raw_text)
+    job.finish(JOB_SUCCEEDED, transaction_id=transaction.id)
+    db.session.add_all([job, CellColor(user_id=user.id, transaction_id=transaction.id, column_name='amount')])
+    db.session.commit()
+    return transaction.id, job.id
+
+
+def _transaction_fk_options():
+    foreign_keys = inspect(db.engine).get_foreign_keys('parse_jobs')
+    return next(fk['options'] for fk in foreign_keys if fk['constrained_columns'] == ['transaction_id'])
+
+
+def test_permanent_delete_and_empty_trash_keep_finished_jobs(app):
+    with app.app_context():
+        first_id, first_job = _trashed_transaction_with_job(1)
+        second_id, second_job = _trashed_transaction_with_job(2)
+
+    client = app.test_client()
+    assert client.delete(f'/api/transactions/{first_id}/permanent-delete').status_code == 200
+    assert client.delete('/api/trash/empty').status_code == 200
+
+    with app.app_context():
+        assert db.session.get(Transaction, first_id) is None
+        assert db.session.get(Transaction, second_id) is None
+        assert CellColor.query.count() == 0
+        for job_id in (first_job, second_job):
+            job = db.session.get(ParseJob, job_id)
+            assert job.status == JOB_SUCCEEDED and job.transaction_id is None
+
+
+@pytest.mark.sqlite_only
+def test_startup_migration_rebuilds_legacy_parse_job_foreign_key(app):
+    with app.app_context():
+        transaction_id, job_id = _trashed_transaction_with_job(3)
+        # Recreate parse_jobs the way older releases declared it: no ON DELETE action.
+        connection = db.session.connection()
+        create_sql = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'parse_jobs'")
+        ).scalar()
+        connection.execute(text('ALTER TABLE parse_jobs RENAME TO parse_jobs_current'))
+        connection.execute(text(create_sql.replace(' ON DELETE SET NULL', '')))
+        connection.execute(text('INSERT INTO parse_jobs SELECT * FROM parse_jobs_current'))
+        connection.execute(text('DROP TABLE parse_jobs_current'))
+        db.session.commit()
+        assert _transaction_fk_options() == {}
+
+        run_startup_migrations()
+        run_startup_migrations()
+
+        assert _transaction_fk_options() == {'ondelete': 'SET NULL'}
+        indexes = {index['name'] for index in inspect(db.engine).get_indexes('parse_jobs')}
+        assert 'ix_parse_jobs_status_created_at' in indexes
+        assert db.session.get(ParseJob, job_id).transaction_id == transaction_id
+
+    assert app.test_client().delete('/api/trash/empty').status_code == 200